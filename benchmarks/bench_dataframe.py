@@ -0,0 +1,235 @@
+"""Mesures de performance de `DataFrameModel` / `DataFrameView`, sans affichage.
+
+Exécution :
+
+    python -m benchmarks.bench_dataframe run --sizes 10000 100000 1000000 --output resultats.json
+    python -m benchmarks.bench_dataframe run --large --output resultats.json
+    python -m benchmarks.bench_dataframe compare reference.json resultats.json --tolerance 0.25
+
+Chaque cas est mesuré sur une table de types mixtes de la taille demandée
+(meilleur temps sur `--repeat` essais, pic mémoire Python via `tracemalloc`).
+`compare` signale les cas plus lents ou plus gourmands que la référence au-delà
+de la tolérance et se termine avec le code 1 s'il y en a.
+
+`--large` ajoute aux tailles une table de 10 millions de lignes (`LARGE_SIZE`),
+où se voient les coûts proportionnels à la table (copies, concaténations) :
+prévoir plusieurs Go de mémoire et plusieurs minutes par cas.
+
+La plateforme Qt `offscreen` est demandée par défaut ; une compilation Qt4 pour
+X11 nécessite en revanche un affichage virtuel (ex: `xvfb-run`).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt4.QtCore import Qt  # noqa: E402
+from PyQt4.QtGui import QApplication  # noqa: E402
+from minui4.widgets.clipboard import format_tsv, parse_tsv  # noqa: E402
+from minui4.widgets.dataframe_view import DataFrameModel, DataFrameView  # noqa: E402
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+LARGE_SIZE = 10000000  # Ajoutée par `--large`
+VIEWPORT_ROWS = 40  # Lignes visibles simulées
+SCROLL_PAGES = 200  # Pages lues lors du défilement simulé
+EDIT_COUNT = 1000  # Cellules modifiées / lignes insérées, supprimées ou collées
+
+
+def make_frame(nrows, seed=0):
+    """Table de `nrows` lignes aux types mixtes (entiers, réels, texte, dates, booléens, catégories)."""
+    random = np.random.RandomState(seed)
+    return pd.DataFrame({
+        'Id': np.arange(nrows),
+        'Valeur': random.randn(nrows),
+        'Nom': pd.Series(random.randint(0, 10000, nrows)).map('nom_{}'.format).astype(object),
+        'Date': pd.Timestamp('2020-01-01') + pd.to_timedelta(random.randint(0, 10 ** 8, nrows), unit='s'),
+        'Actif': random.rand(nrows) < 0.5,
+        'Catégorie': pd.Categorical.from_codes(random.randint(0, 4, nrows), ['a', 'b', 'c', 'd']),
+    })
+
+
+def bench_data_scroll(dataframe):
+    model = DataFrameModel(dataframe.copy())
+    ncols = model.columnCount()
+    starts = np.linspace(0, max(model.rowCount() - VIEWPORT_ROWS, 0), SCROLL_PAGES).astype(int)
+
+    def run():
+        for start in starts:
+            for row in range(start, min(start + VIEWPORT_ROWS, model.rowCount())):
+                for col in range(ncols):
+                    model.data(model.index(row, col), Qt.DisplayRole)
+    return run
+
+
+def bench_set_data(dataframe):
+    model = DataFrameModel(dataframe.copy())
+    random = np.random.RandomState(1)
+    rows = random.randint(0, model.rowCount(), EDIT_COUNT)
+    cells = [(row, 0, '42') if i % 2 else (row, 1, '3.5') for i, row in enumerate(rows)]
+
+    def run():
+        for row, col, value in cells:
+            model.setData(model.index(row, col), value, Qt.EditRole)
+    return run
+
+
+def bench_insert_rows(dataframe):
+    model = DataFrameModel(dataframe.copy())
+
+    def run():
+        model.insertRows(model.rowCount() // 2, EDIT_COUNT)
+        model.insertRows(model.rowCount(), EDIT_COUNT)
+        model.rowCount()
+    return run
+
+
+def bench_remove_rows(dataframe):
+    model = DataFrameModel(dataframe.copy())
+    random = np.random.RandomState(2)
+    rows = random.choice(model.rowCount(), min(EDIT_COUNT, model.rowCount()), replace=False)
+
+    def run():
+        model.remove_rows(rows)
+    return run
+
+
+def bench_paste(dataframe):
+    model = DataFrameModel(dataframe.copy())
+    text = format_tsv(dataframe.iloc[:EDIT_COUNT, :3])
+
+    def run():
+        model.set_block(model.rowCount() // 2, 0, parse_tsv(text))
+    return run
+
+
+def bench_view_construction(dataframe):
+    def run():
+        view = DataFrameView(dataframe)
+        if view._detection_thread is not None:
+            view._detection_thread.wait()
+        view.deleteLater()
+    return run
+
+
+CASES = {
+    'data_scroll': bench_data_scroll,
+    'set_data': bench_set_data,
+    'insert_rows': bench_insert_rows,
+    'remove_rows': bench_remove_rows,
+    'paste': bench_paste,
+    'view_construction': bench_view_construction,
+}
+
+
+def measure(setup, dataframe, repeat):
+    """Meilleur temps (secondes) et pic mémoire (octets) d'un cas ; la préparation n'est pas mesurée."""
+    seconds, peak = [], []
+    for _ in range(repeat):
+        run = setup(dataframe)
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+        peak.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {'seconds': min(seconds), 'peak_bytes': min(peak)}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, cases=None, repeat=3, log=sys.stderr):
+    """Mesure les cas `cases` (tous par défaut) pour chaque taille de table."""
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    results = {}
+    for nrows in sizes:
+        dataframe = make_frame(nrows)
+        for name in cases or CASES:
+            key = '%s[%d]' % (name, nrows)
+            results[key] = measure(CASES[name], dataframe, repeat)
+            log.write("%-30s %10.4f s %12d o\n" % (key, results[key]['seconds'], results[key]['peak_bytes']))
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current, tolerance=0.25, min_seconds=0.001):
+    """Liste des régressions (cas, mesure, référence, valeur, rapport) au-delà de `tolerance`.
+
+    Les temps inférieurs à `min_seconds` dans les deux mesures sont ignorés
+    (trop bruités pour être comparés).
+    """
+    regressions = []
+    for key, reference in sorted(baseline['results'].items()):
+        measured = current['results'].get(key)
+        if measured is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            before, after = reference[metric], measured[metric]
+            if metric == 'seconds' and max(before, after) < min_seconds:
+                continue
+            ratio = after / before if before else float('inf') if after else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append((key, metric, before, after, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help="Exécute les mesures")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--large', action='store_true',
+                            help="Ajoute une table de %d lignes aux tailles mesurées" % LARGE_SIZE)
+    run_parser.add_argument('--cases', nargs='+', choices=sorted(CASES))
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', help="Fichier JSON des résultats (sortie standard par défaut)")
+
+    compare_parser = commands.add_parser('compare', help="Compare des résultats à une référence")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.25)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        sizes = args.sizes + [LARGE_SIZE] if args.large and LARGE_SIZE not in args.sizes else args.sizes
+        report = run_benchmarks(sizes, args.cases, args.repeat)
+        text = json.dumps(report, indent=2, sort_keys=True)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text + '\n')
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.tolerance)
+    for key, metric, before, after, ratio in regressions:
+        print("RÉGRESSION %-30s %-10s %.4g -> %.4g (x%.2f)" % (key, metric, before, after, ratio))
+    if not regressions:
+        print("Aucune régression (tolérance %d %%)." % (args.tolerance * 100))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Mesures de démarrage : temps d'import et délai avant le premier affichage de `DataFrameView`.
+
+Exécution :
+
+    python -m benchmarks.bench_startup run --widgets 1 10 50 --output demarrage.json
+    python -m benchmarks.bench_dataframe compare reference.json demarrage.json --tolerance 0.25
+
+L'import est mesuré dans un interpréteur neuf, pour `minui4.widgets.dataframe_view`
+et pour sa référence : les modules qu'importait la version d'origine de
+`dataframe_view` (numpy, pandas, PyQt4, délégués), plancher que le module ne
+peut pas descendre. `import_overhead[dataframe_view]` est l'écart entre les deux
+(modules de la table et des fonctions chargées au démarrage) ; les modules des
+fonctions annexes (chargement, export, synthèse, regroupement, recherche,
+profilage) ne sont importés qu'à leur premier usage.
+Le premier affichage est le délai entre la création de `N` widgets et le
+premier événement Paint reçu par la table de chacun, avec remplissage
+immédiat puis différé (`DataFrameView(..., deferred=True)`). Les résultats ont
+le format de `bench_dataframe` (meilleur temps, pic mémoire Python).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt4.QtCore import QEvent, QObject  # noqa: E402
+from PyQt4.QtGui import QApplication  # noqa: E402
+from benchmarks.bench_dataframe import make_frame  # noqa: E402
+from minui4.widgets.dataframe_view import DataFrameView  # noqa: E402
+
+DEFAULT_WIDGETS = [1, 10, 50]
+DEFAULT_ROWS = 10000
+# Clé -> modules importés ensemble ; 'baseline' reprend les imports de la version d'origine de `dataframe_view`
+IMPORTS = {
+    'baseline': ['numpy', 'pandas', 'PyQt4.QtCore', 'PyQt4.QtGui', 'minui4.widgets.delegates'],
+    'dataframe_view': ['minui4.widgets.dataframe_view'],
+}
+PAINT_TIMEOUT = 60  # Secondes d'attente maximale du premier affichage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Exécuté dans un interpréteur neuf : durée de l'import, ou pic mémoire avec `tracemalloc`
+IMPORT_SCRIPT = """
+import importlib, sys, time, tracemalloc
+if sys.argv[2] == 'memory':
+    tracemalloc.start()
+start = time.perf_counter()
+for module in sys.argv[1].split(','):
+    importlib.import_module(module)
+seconds = time.perf_counter() - start
+print(tracemalloc.get_traced_memory()[1] if sys.argv[2] == 'memory' else seconds)
+"""
+
+
+def measure_import(modules, repeat=3):
+    """Meilleur temps d'import de la liste `modules` dans un interpréteur neuf et pic mémoire (mesuré à part)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + [p for p in [os.environ.get('PYTHONPATH')] if p]))
+
+    def run(mode):
+        output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT, ','.join(modules), mode], env=env)
+        return float(output.decode().split()[-1])
+
+    return {'seconds': min(run('time') for _ in range(repeat)), 'peak_bytes': int(run('memory'))}
+
+
+class PaintWatcher(QObject):
+    """Retient les widgets ayant reçu un événement Paint."""
+
+    def __init__(self):
+        super(PaintWatcher, self).__init__()
+        self.painted = set()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            self.painted.add(obj)
+        return False
+
+
+def first_paint(dataframe, count, deferred=False):
+    """Crée et affiche `count` widgets ; retourne (délai avant le dernier premier affichage, widgets)."""
+    app = QApplication.instance()
+    watcher = PaintWatcher()
+    start = time.perf_counter()
+    views = []
+    for _ in range(count):
+        view = DataFrameView(dataframe, deferred=deferred)
+        view.table_view.viewport().installEventFilter(watcher)
+        view.show()
+        views.append(view)
+    while len(watcher.painted) < count and time.perf_counter() - start < PAINT_TIMEOUT:
+        app.processEvents()
+    return time.perf_counter() - start, views
+
+
+def measure_first_paint(dataframe, count, deferred, repeat):
+    """Meilleur délai avant affichage de `count` widgets et pic mémoire ; les widgets sont détruits après."""
+    app = QApplication.instance()
+    seconds, peak = [], []
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        elapsed, views = first_paint(dataframe, count, deferred)
+        peak.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        seconds.append(elapsed)
+        for view in views:
+            view.close()
+            view.deleteLater()
+        app.processEvents()
+    return {'seconds': min(seconds), 'peak_bytes': min(peak)}
+
+
+def run_benchmarks(widgets=DEFAULT_WIDGETS, nrows=DEFAULT_ROWS, repeat=3, imports=IMPORTS, log=sys.stderr):
+    """Mesure l'import des modules `imports` puis le premier affichage de chaque nombre de widgets.
+
+    Si `imports` contient 'baseline', chaque autre import est aussi rapporté
+    en écart à cette référence (`import_overhead[...]`).
+    """
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    results = {}
+
+    def record(key, result):
+        results[key] = result
+        log.write("%-30s %10.4f s %12d o\n" % (key, result['seconds'], result['peak_bytes']))
+
+    for name, modules in imports.items():
+        record('import[%s]' % name, measure_import(modules, repeat))
+    baseline = results.get('import[baseline]')
+    for name in imports:
+        if baseline is not None and name != 'baseline':
+            measured = results['import[%s]' % name]
+            record('import_overhead[%s]' % name, {key: measured[key] - baseline[key] for key in baseline})
+    dataframe = make_frame(nrows)
+    for count in widgets:
+        record('first_paint[%d]' % count, measure_first_paint(dataframe, count, False, repeat))
+        record('first_paint_deferred[%d]' % count, measure_first_paint(dataframe, count, True, repeat))
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rows': nrows,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help="Exécute les mesures")
+    run_parser.add_argument('--widgets', type=int, nargs='+', default=DEFAULT_WIDGETS)
+    run_parser.add_argument('--rows', type=int, default=DEFAULT_ROWS)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', help="Fichier JSON des résultats (sortie standard par défaut)")
+
+    args = parser.parse_args(argv)
+    report = run_benchmarks(args.widgets, args.rows, args.repeat)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Widgets de minui4.
+
+Les classes publiques sont importées à leur premier accès
+(`minui4.widgets.DataFrameView`) : importer le paquet ne charge ni numpy,
+ni pandas, ni les classes graphiques de PyQt4.
+"""
+import importlib
+
+# Nom exporté -> module du paquet qui le définit
+_exports = {
+    'DataFrameView': 'dataframe_view',
+    'DataFrameModel': 'dataframe_view',
+    'InvalidValuesError': 'dataframe_view',
+    'PagedDataFrameModel': 'paged_model',
+    'GroupedDataFrameModel': 'group_model',
+    'SummaryModel': 'summary',
+    'FrameStore': 'frame_store',
+    'ChunkedLoader': 'loaders',
+    'ChunkedExporter': 'exporters',
+    'DisplayCache': 'display_cache',
+    'ColumnTypeDetector': 'type_detection',
+    'ColumnConverter': 'converters',
+    'ConverterRegistry': 'converters',
+    'FormatRule': 'formatting',
+    'Profiler': 'profiling',
+}
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value  # Accès suivants sans passer par `__getattr__`
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+
+def is_text_dtype(dtype):
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def category_candidates(dataframe, max_categories=1000, max_ratio=0.5):
+    """Positions des colonnes de texte peu variées, à encoder en catégories.
+
+    Une colonne est retenue si elle compte au plus `max_categories` valeurs
+    distinctes et si ce nombre ne dépasse pas `max_ratio` fois son nombre de
+    lignes (sinon le dictionnaire ne ferait rien gagner).
+    """
+    columns = []
+    for col, dtype in enumerate(dataframe.dtypes):
+        if not is_text_dtype(dtype) or not len(dataframe):
+            continue
+        distinct = dataframe.iloc[:, col].nunique()
+        if distinct <= max_categories and distinct <= max_ratio * len(dataframe):
+            columns.append(col)
+    return columns
+
+
+def memory_savings(series):
+    """(octets en texte, octets encodés) d'une colonne catégorielle.
+
+    Les deux tailles sont mesurées par `memory_usage(deep=True)`, la première
+    sur la colonne décodée dans le type de ses catégories (`str` ou `object`) :
+    le résultat suit le stockage réel du texte (Python ou Arrow).
+    """
+    decoded = series.astype(series.cat.categories.dtype)
+    return int(decoded.memory_usage(index=False, deep=True)), int(series.memory_usage(index=False, deep=True))
+
+
+class CategoryCodes(object):
+    """Codes entiers et libellés des colonnes catégorielles, lus sans construire de valeur par cellule.
+
+    Le libellé de chaque catégorie est calculé une seule fois ; l'affichage
+    d'une cellule se résume à lire son code puis le libellé correspondant.
+    Observateur de la table : une colonne modifiée est relue à la demande.
+    """
+
+    def __init__(self):
+        self._columns = {}  # position -> (codes, libellés, valeurs), ou None si la colonne n'est pas catégorielle
+
+    def get(self, dataframe, col):
+        """(codes, libellés, valeurs) de la colonne `col`, ou `None` ; le code -1 désigne la dernière entrée (NaN)."""
+        entry = self._columns.get(col, False)
+        if entry is False or (entry is not None and len(entry[0]) != len(dataframe)):
+            entry = self._columns[col] = self._read(dataframe, col)
+        return entry
+
+    def choices(self, dataframe, col):
+        """Libellés des catégories de la colonne `col` (lus dans le type, sans parcourir la colonne)."""
+        entry = self.get(dataframe, col)
+        return None if entry is None else entry[1][:-1]
+
+    @staticmethod
+    def _read(dataframe, col):
+        dtype = dataframe.dtypes.iloc[col]
+        if not isinstance(dtype, pd.CategoricalDtype):
+            return None
+        values = list(dtype.categories) + [np.nan]
+        return dataframe.iloc[:, col].cat.codes.to_numpy(), [str(value) for value in values], values
+
+    def invalidate(self, col=None):
+        if col is None:
+            self._columns.clear()
+        else:
+            self._columns.pop(col, None)
+
+    def cells_changed(self, dataframe, col, frame_rows):
+        self.invalidate(col)
+
+    def rows_inserted(self, dataframe, frame_row, count):
+        self.invalidate()
+
+    def rows_appended(self, frame_row, count):
+        self.invalidate()
+
+    def rows_removed(self, keep):
+        self.invalidate()
+
+    def head_removed(self, count):
+        self.invalidate()
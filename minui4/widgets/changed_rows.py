@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class ChangedRows(object):
+    """Lignes de la table modifiées ou ajoutées depuis le chargement, tenues à jour par le modèle.
+
+    Les lignes lues en fin de table (chargement, flux) ne sont pas marquées. Une
+    ligne reste marquée si sa modification est annulée, et les lignes
+    réinsérées par une annulation sont marquées : l'export des lignes modifiées
+    peut contenir des lignes en trop, jamais en manquer.
+    """
+
+    def __init__(self):
+        self._mask = np.zeros(0, dtype=bool)
+
+    def reset(self):
+        self._mask = np.zeros(0, dtype=bool)
+
+    def rows(self, length):
+        """Lignes marquées parmi les `length` lignes de la table."""
+        return np.flatnonzero(self._mask[:length])
+
+    def _pad(self, length):
+        if len(self._mask) < length:
+            self._mask = np.concatenate([self._mask, np.zeros(length - len(self._mask), dtype=bool)])
+
+    def cells_changed(self, dataframe, col, frame_rows):
+        self._pad(len(dataframe))
+        self._mask[frame_rows] = True
+
+    def rows_inserted(self, dataframe, frame_row, count):
+        self._pad(frame_row)
+        self._mask = np.insert(self._mask, frame_row, np.ones(count, dtype=bool))
+
+    def rows_appended(self, frame_row, count):
+        self._pad(frame_row)
+        self._mask = np.concatenate([self._mask[:frame_row], np.ones(count, dtype=bool)])
+
+    def rows_restored(self, frame_positions, length):
+        restored = np.zeros(length, dtype=bool)
+        restored[frame_positions] = True
+        self._pad(length - len(frame_positions))
+        mask = np.ones(length, dtype=bool)
+        mask[~restored] = self._mask[:length - len(frame_positions)]
+        self._mask = mask
+
+    def rows_removed(self, frame_keep):
+        self._mask = self._mask[frame_keep[:len(self._mask)]]
+
+    def head_removed(self, count):
+        self._mask = self._mask[count:]
@@ -0,0 +1,17 @@
+from .display_cache import format_values
+
+
+def format_tsv(dataframe):
+    """Formate un bloc de cellules en texte TSV (une ligne par ligne, tabulations entre colonnes)."""
+    columns = [format_values(dataframe.iloc[:, col]) for col in range(dataframe.shape[1])]
+    return '\n'.join('\t'.join(cells) for cells in zip(*columns))
+
+
+def parse_tsv(text):
+    """Découpe un texte TSV (ex: copié depuis un tableur) en lignes de cellules de même longueur."""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n')
+    if lines.endswith('\n'):
+        lines = lines[:-1]
+    rows = [line.split('\t') for line in lines.split('\n')]
+    width = max(len(cells) for cells in rows)
+    return [cells + [''] * (width - len(cells)) for cells in rows]
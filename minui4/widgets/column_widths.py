@@ -0,0 +1,77 @@
+import numpy as np
+
+from .display_cache import format_values
+
+
+class ColumnWidthEstimator(object):
+    """Estime la largeur (en caractères) du contenu des colonnes sur un échantillon borné.
+
+    L'échantillon réunit le début et la fin de la table, des lignes tirées au
+    hasard et les lignes visibles ; les longueurs sont calculées en une seule
+    opération vectorisée par colonne. Les estimations sont conservées et ne
+    font qu'augmenter lors des modifications et des ajouts de lignes.
+    """
+
+    def __init__(self, sample_size=1000, edge_rows=100, max_chars=100, random_state=0):
+        self.sample_size = sample_size
+        self.edge_rows = edge_rows
+        self.max_chars = max_chars
+        self._random = np.random.RandomState(random_state)
+        self._chars = {}  # position de colonne -> largeur estimée
+
+    def sample_rows(self, nrows, visible=None):
+        """Positions des lignes mesurées : début, fin, tirage aléatoire et lignes visibles."""
+        if nrows <= self.sample_size:
+            rows = np.arange(nrows)
+        else:
+            edge = min(self.edge_rows, self.sample_size // 4)
+            rows = np.concatenate([
+                np.arange(edge),
+                np.arange(nrows - edge, nrows),
+                self._random.randint(0, nrows, self.sample_size - 2 * edge),
+            ])
+        if visible is not None:
+            rows = np.concatenate([rows, np.asarray(visible, dtype=np.int64)])
+        return np.unique(rows)
+
+    def measure(self, values):
+        """Longueur maximale (bornée à `max_chars`) du texte affiché pour une série."""
+        if not len(values):
+            return 0
+        return int(min(np.char.str_len(format_values(values)).max(), self.max_chars))
+
+    def estimate(self, dataframe, col, visible=None):
+        """Largeur de la colonne `col` (en-tête compris) ; `visible` : lignes affichées de la table."""
+        if col not in self._chars:
+            rows = self.sample_rows(len(dataframe), visible)
+            header = len(str(dataframe.columns[col]))
+            self._chars[col] = max(header, self.measure(dataframe.iloc[rows, col]))
+        elif visible is not None and len(visible):
+            self._grow(col, self.measure(dataframe.iloc[np.asarray(visible), col]))
+        return self._chars[col]
+
+    def rows_changed(self, dataframe, col, frame_rows):
+        """Prend en compte les cellules modifiées (au plus `sample_size` d'entre elles)."""
+        if col not in self._chars:
+            return
+        if len(frame_rows) > self.sample_size:
+            frame_rows = self._random.choice(frame_rows, self.sample_size, replace=False)
+        self._grow(col, self.measure(dataframe.iloc[frame_rows, col]))
+
+    def rows_appended(self, rows):
+        """Prend en compte un bloc de lignes (DataFrame) ajouté en fin de table."""
+        if not self._chars or not len(rows):
+            return
+        sample = self.sample_rows(len(rows))
+        for col in list(self._chars):
+            self._grow(col, self.measure(rows.iloc[sample, col]))
+
+    def invalidate(self, col=None):
+        """Oublie l'estimation d'une colonne, ou de toutes si `col` vaut `None`."""
+        if col is None:
+            self._chars.clear()
+        else:
+            self._chars.pop(col, None)
+
+    def _grow(self, col, chars):
+        self._chars[col] = max(self._chars[col], chars)
@@ -0,0 +1,281 @@
+import numpy as np
+import pandas as pd
+
+TRUE_VALUES = ["true", "1", "yes"]
+
+
+def _texts(values):
+    """Série de textes (sans valeur manquante) et masque des saisies vides."""
+    texts = pd.Series(values, dtype=object).fillna('').astype(str)
+    empty = (texts.str.strip() == '').to_numpy()
+    return texts, empty
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and value.strip() == '')
+
+
+def nullable_dtype(dtype):
+    """Type nullable équivalent d'un type numpy entier ou booléen (ex: int64 -> Int64, bool -> boolean)."""
+    return pd.api.types.pandas_dtype('boolean' if dtype.kind == 'b' else dtype.name.capitalize())
+
+
+class ColumnConverter(object):
+    """Convertit les saisies d'une colonne vers son type.
+
+    `parse_array(valeurs) -> (tableau, masque des invalides)` est l'entrée
+    vectorisée ; `parse_scalar(valeur)` (optionnelle) évite de passer par un
+    tableau pour une seule cellule et lève `ValueError`/`TypeError` si la valeur
+    est invalide. `policy` indique le sort des valeurs invalides : 'reject'
+    (refusées) ou 'na' (remplacées par une valeur manquante).
+    """
+
+    def __init__(self, dtype, parse_array, parse_scalar=None, policy='reject'):
+        self.dtype = dtype
+        self.parse_array = parse_array
+        self.parse_scalar = parse_scalar
+        self.policy = policy
+
+    def convert(self, value):
+        """Convertit une valeur : retourne (valeur convertie, valide)."""
+        if self.parse_scalar is not None:
+            try:
+                return self.parse_scalar(value), True
+            except (TypeError, ValueError):
+                invalid = True
+        else:
+            values, invalid = self.parse_array([value])
+            if not invalid[0]:
+                return values[0], True
+        if self.policy == 'na':
+            return self.na_value(), True
+        return None, False
+
+    def convert_array(self, values):
+        """Convertit un tableau : retourne (valeurs converties, masque des valeurs refusées)."""
+        converted, invalid = self.parse_array(values)
+        if self.policy == 'na' and invalid.any():
+            converted = pd.Series(converted, dtype=object).where(~invalid).to_numpy()  # Entiers exacts
+            invalid = np.zeros(len(invalid), dtype=bool)
+        return converted, invalid
+
+    def na_value(self):
+        """Valeur manquante du type de la colonne."""
+        if isinstance(self.dtype, np.dtype) and self.dtype.kind in 'iub':
+            return pd.NA  # Pas de valeur manquante native : la colonne passera au type nullable à l'écriture
+        return pd.Series([None], dtype=object).astype(self.dtype).iloc[0]
+
+
+def _int_parsers(dtype, empty_value):
+    bounds = np.iinfo(getattr(dtype, 'numpy_dtype', dtype))
+
+    def parse_array(values):
+        # Les entiers écrits en chiffres sont lus exactement ; seuls les autres textes
+        # (ex: "2.0", "1e3") passent par les réels, pour vérifier qu'ils sont entiers
+        texts, empty = _texts(values)
+        texts = texts.str.strip()
+        digits = texts.str.fullmatch(r'[+-]?\d+').to_numpy(dtype=bool)
+        numbers = np.zeros(len(texts), dtype=np.int64)
+        invalid = np.zeros(len(texts), dtype=bool)
+        if digits.any():
+            integers = pd.to_numeric(texts[digits], errors='coerce')
+            if integers.dtype.kind != 'i':  # Au-delà de int64 : lecture exacte, valeurs trop grandes refusées
+                integers = [int(text) for text in texts[digits]]
+                outside = np.array([not -2 ** 63 <= number < 2 ** 63 for number in integers])
+                integers = np.array([0 if out else number for number, out in zip(integers, outside)], dtype=np.int64)
+                invalid[digits] = outside
+            numbers[digits] = integers
+        others = ~digits & ~empty
+        if others.any():
+            floats = pd.to_numeric(texts[others], errors='coerce').to_numpy(dtype=float)
+            integral = ~np.isnan(floats) & (floats % 1 == 0) & (np.abs(floats) < 2 ** 63)
+            numbers[others] = np.where(integral, floats, 0).astype(np.int64)
+            invalid[others] = ~integral
+        invalid |= (numbers < bounds.min) | (numbers > bounds.max)
+        numbers[invalid] = 0
+        if empty_value is pd.NA:
+            array = pd.array(numbers, dtype=dtype)
+            array[empty] = pd.NA
+            return array, invalid
+        return numbers.astype(dtype), invalid
+
+    def parse_scalar(value):
+        if _is_empty(value):
+            return empty_value
+        if isinstance(value, (int, np.integer)):
+            value = int(value)
+        else:
+            text = str(value).strip()
+            try:
+                value = int(text)
+            except ValueError:
+                number = float(text)
+                if not number.is_integer():
+                    raise ValueError("Entier attendu : %r" % (value,))
+                value = int(number)
+        if not bounds.min <= value <= bounds.max:
+            raise ValueError("Entier hors limites : %r" % (value,))
+        return value
+
+    return parse_array, parse_scalar
+
+
+def _float_parsers(dtype):
+    def parse_array(values):
+        texts, empty = _texts(values)
+        numbers = pd.to_numeric(texts.where(~empty, 'nan'), errors='coerce').to_numpy(dtype=float)
+        invalid = np.isnan(numbers) & ~empty
+        if isinstance(dtype, np.dtype):
+            return numbers.astype(dtype), invalid
+        return pd.array(numbers, dtype=dtype), invalid
+
+    def parse_scalar(value):
+        return np.nan if _is_empty(value) else float(value)
+
+    return parse_array, parse_scalar
+
+
+def _bool_parsers(dtype):
+    nullable = not isinstance(dtype, np.dtype)
+
+    def parse_array(values):
+        texts, empty = _texts(values)
+        flags = texts.str.lower().isin(TRUE_VALUES).to_numpy()
+        if nullable:
+            return pd.array(np.where(empty, None, flags), dtype=dtype), np.zeros(len(flags), dtype=bool)
+        return flags, np.zeros(len(flags), dtype=bool)
+
+    def parse_scalar(value):
+        if isinstance(value, (bool, np.bool_)):
+            return bool(value)
+        if nullable and _is_empty(value):
+            return pd.NA
+        return str(value).lower() in TRUE_VALUES
+
+    return parse_array, parse_scalar
+
+
+def _datetime_parsers(dtype):
+    def parse_array(values):
+        texts, empty = _texts(values)
+        dates = pd.to_datetime(texts.where(~empty), errors='coerce')
+        return dates.to_numpy(dtype=dtype), dates.isna().to_numpy() & ~empty
+
+    def parse_scalar(value):
+        return pd.NaT if _is_empty(value) else pd.Timestamp(value)
+
+    return parse_array, parse_scalar
+
+
+def _datetime_tz_parsers(dtype):
+    def localize(dates):
+        return dates.dt.tz_localize(dtype.tz) if dates.dt.tz is None else dates.dt.tz_convert(dtype.tz)
+
+    def parse_array(values):
+        texts, empty = _texts(values)
+        dates = localize(pd.to_datetime(texts.where(~empty), errors='coerce'))
+        return dates.array, dates.isna().to_numpy() & ~empty
+
+    def parse_scalar(value):
+        if _is_empty(value):
+            return pd.NaT
+        timestamp = pd.Timestamp(value)
+        return timestamp.tz_localize(dtype.tz) if timestamp.tz is None else timestamp.tz_convert(dtype.tz)
+
+    return parse_array, parse_scalar
+
+
+def _timedelta_parsers(dtype):
+    def parse_array(values):
+        texts, empty = _texts(values)
+        durations = pd.to_timedelta(texts.where(~empty), errors='coerce')
+        return durations.to_numpy(dtype=dtype), durations.isna().to_numpy() & ~empty
+
+    def parse_scalar(value):
+        return pd.NaT if _is_empty(value) else pd.Timedelta(value)
+
+    return parse_array, parse_scalar
+
+
+def _category_parsers(dtype):
+    """Valeurs converties au type des catégories ; une valeur inconnue est acceptée et
+    étendra les catégories de la colonne à l'écriture (voir `FrameStore.add_categories`)."""
+    values_dtype = dtype.categories.dtype
+    if values_dtype == object or isinstance(values_dtype, pd.StringDtype):
+        parse_values, parse_value = _text_parsers(values_dtype)
+    else:
+        converter = default_registry.converter_for(values_dtype)
+        parse_values, parse_value = converter.parse_array, converter.parse_scalar
+
+    def parse_array(values):
+        texts, empty = _texts(values)
+        converted, invalid = parse_values(texts)
+        return pd.Series(converted, dtype=object).where(~empty).to_numpy(), invalid & ~empty
+
+    def parse_scalar(value):
+        return np.nan if _is_empty(value) else parse_value(value)
+
+    return parse_array, parse_scalar
+
+
+def _text_parsers(dtype):
+    def parse_array(values):
+        return pd.Series(values, dtype=object).to_numpy(), np.zeros(len(values), dtype=bool)
+
+    def parse_scalar(value):
+        return value  # Texte par défaut
+
+    return parse_array, parse_scalar
+
+
+def _kind(kinds):
+    return lambda dtype: isinstance(dtype, np.dtype) and dtype.kind in kinds
+
+
+def _extension_kind(kinds):
+    return lambda dtype: isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in kinds
+
+
+class ConverterRegistry(object):
+    """Associe un type de colonne à ses fonctions de conversion.
+
+    `register(critère, fabrique)` : le critère est un type (`isinstance`), une
+    fonction `critère(dtype) -> bool` ou une valeur comparée au dtype (ex:
+    'int64'). La fabrique reçoit le dtype et retourne `(parse_array,
+    parse_scalar)`. Les enregistrements les plus récents sont prioritaires.
+    """
+
+    def __init__(self):
+        self._entries = []
+
+    def register(self, match, factory):
+        self._entries.insert(0, (match, factory))
+
+    def converter_for(self, dtype, policy='reject'):
+        for match, factory in self._entries:
+            if isinstance(match, type):
+                matched = isinstance(dtype, match)
+            elif callable(match):
+                matched = match(dtype)
+            else:
+                matched = dtype == match
+            if matched:
+                parse_array, parse_scalar = factory(dtype)
+                return ColumnConverter(dtype, parse_array, parse_scalar, policy)
+        parse_array, parse_scalar = _text_parsers(dtype)
+        return ColumnConverter(dtype, parse_array, parse_scalar, policy)
+
+
+default_registry = ConverterRegistry()
+default_registry.register(_kind('O'), _text_parsers)
+default_registry.register(pd.StringDtype, _text_parsers)
+default_registry.register(pd.CategoricalDtype, _category_parsers)
+default_registry.register(pd.BooleanDtype, _bool_parsers)
+default_registry.register(pd.DatetimeTZDtype, _datetime_tz_parsers)
+default_registry.register(_extension_kind('f'), _float_parsers)
+default_registry.register(_extension_kind('iu'), lambda dtype: _int_parsers(dtype, pd.NA))
+default_registry.register(_kind('m'), _timedelta_parsers)
+default_registry.register(_kind('M'), _datetime_parsers)
+default_registry.register(_kind('b'), _bool_parsers)
+default_registry.register(_kind('fc'), _float_parsers)
+default_registry.register(_kind('iu'), lambda dtype: _int_parsers(dtype, 0))
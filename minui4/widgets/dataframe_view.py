@@ -1,43 +1,160 @@
+from collections import deque
+from contextlib import contextmanager
+
 import numpy as np
 import pandas as pd
-from PyQt4.QtCore import Qt, QAbstractTableModel, QModelIndex
-from PyQt4.QtGui import QApplication, QTableView, QVBoxLayout, QWidget, QPushButton, QHBoxLayout, QInputDialog, QMessageBox
-from .delegates import DateDelegate, TimeDelegate, DateTimeDelegate
+from PyQt4.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt4.QtGui import (QApplication, QTableView, QVBoxLayout, QWidget, QPushButton, QHBoxLayout, QInputDialog,
+                         QMessageBox, QLineEdit, QProgressBar, QUndoStack, QKeySequence, QAction)
+from .delegates import DateDelegate, TimeDelegate, DateTimeDelegate, CategoryDelegate, FloatDelegate
+from .type_detection import ColumnTypeDetector, TypeDetectionThread
+from .sort_filter import RowOrder
+from .clipboard import format_tsv, parse_tsv
+from .undo import UndoHistory, CellDelta, InsertDelta, RemoveDelta
+from .changed_rows import ChangedRows
+from .converters import default_registry
+from .column_widths import ColumnWidthEstimator
+from .roles import RawValueRole, SortKeyRole, ChoicesRole, edit_value, python_value
+from .formatting import ConditionalFormats, FormatRule, STYLE_ROLES
+from .frame_store import FrameStore
+from .categories import CategoryCodes, category_candidates, memory_savings
 
 
 class DataFrameView(QWidget):
 
-    def __init__(self, dataframe=None, parent=None):
+    # Délégué associé à chaque type détecté par le `ColumnTypeDetector`
+    delegate_classes = {
+        'datetime': DateTimeDelegate,
+        'date': DateDelegate,
+        'time': TimeDelegate,
+        'category': CategoryDelegate,
+        'float': FloatDelegate,
+    }
+
+    # Au-delà de ce nombre de lignes, la détection est faite dans un thread
+    background_detection_rows = 100000
+
+    # Nombre de lignes chargées par `load` à partir duquel les types sont détectés
+    load_detection_rows = 1000
+
+    # `load` encode en catégories les colonnes de texte peu variées du premier bloc (voir `encode_categories`)
+    load_categories = False
+
+    # Au-delà de ce nombre de colonnes (table large), types et largeurs ne sont traités
+    # que pour les colonnes qui deviennent visibles
+    wide_columns = 200
+
+    # Largeur des colonnes : ajustée automatiquement au contenu estimé, marge et maximum en pixels
+    auto_resize_columns = True
+    column_padding = 16
+    max_column_width = 400
+
+    def __init__(self, dataframe=None, parent=None, display_cache=None, type_detector=None, model=None,
+                 deferred=False):
+        """`deferred` : le widget s'affiche d'abord vide ; `dataframe` n'est installé (types, largeurs)
+        qu'au tour suivant de la boucle d'événements, pour ouvrir rapidement de nombreux widgets."""
         super(DataFrameView, self).__init__(parent)
         self.table_view = QTableView(self)
-        self.table_model = DataFrameModel(dataframe if dataframe is not None else pd.DataFrame(), self)
+        self._pending_frame = None  # Table installée au tour suivant de la boucle d'événements (`deferred`)
+        if model is None:
+            if deferred and dataframe is not None:
+                self._pending_frame, dataframe = dataframe, None
+            model = DataFrameModel(dataframe, self, display_cache=display_cache)
+        self.table_model = model  # DataFrameModel ou PagedDataFrameModel
         self.table_view.setModel(self.table_model)
 
+        # Tri par clic sur l'en-tête (aucun tri initial)
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+
+        self._auto_scroll = False
+        self._profiler = None
+        self.summary_view = None
+        self.tree_view = None  # Vue regroupée (voir `set_group_by`)
+
+        # Champ de filtre
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText("Filtrer...")
+        if not hasattr(self.table_model, 'set_filter'):
+            self.filter_edit.hide()  # Modèle sans filtrage (ex: PagedDataFrameModel)
+
+        # Recherche au fil de la frappe ; Entrée / F3 : cellule suivante, Maj+F3 : précédente
+        self._search = None
+        self.find_edit = QLineEdit(self)
+        self.find_edit.setPlaceholderText("Rechercher...")
+        if not hasattr(self.table_model, 'search'):
+            self.find_edit.hide()
+        self.find_next_action = QAction("Suivant", self)
+        self.find_previous_action = QAction("Précédent", self)
+        self.find_next_action.setShortcut(QKeySequence.FindNext)
+        self.find_previous_action.setShortcut(QKeySequence.FindPrevious)
+        for action in (self.find_next_action, self.find_previous_action):
+            action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+            self.addAction(action)
+
         # Définir les délégués pour la gestion des types
-        for col, dtype in dataframe.dtypes.items():
-            col_idx = dataframe.columns.get_loc(col)
-            if dtype == 'datetime64[ns]':
-                self.table_view.setItemDelegateForColumn(col_idx, DateTimeDelegate(self))
-            elif dtype == 'object' and dataframe[col].astype(str).str.match(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$').all():
-                self.table_view.setItemDelegateForColumn(col_idx, DateTimeDelegate(self))
-            elif dtype == 'object' and dataframe[col].astype(str).str.match(r'^\d{4}-\d{2}-\d{2}$').all():
-                self.table_view.setItemDelegateForColumn(col_idx, DateDelegate(self))
-            elif dtype == 'object' and dataframe[col].astype(str).str.match(r'^\d{2}:\d{2}:\d{2}$').all():
-                self.table_view.setItemDelegateForColumn(col_idx, TimeDelegate(self))
+        self.type_detector = type_detector if type_detector is not None else ColumnTypeDetector()
+        self._detection_thread = None
+        self._delegates = {}  # type détecté -> délégué partagé par les colonnes de ce type
+        self._detected_columns = set()  # Table large : colonnes dont le type a été détecté
+        self._sized_columns = set()  # Table large : colonnes dont la largeur a été ajustée
+        self.detect_column_types()
+
+        # Table large : colonnes traitées quand elles apparaissent (défilement, redimensionnement, déplacement)
+        self.table_view.horizontalScrollBar().valueChanged.connect(self._on_columns_scrolled)
+        self.table_view.horizontalScrollBar().rangeChanged.connect(self._on_columns_scrolled)
+        self.table_view.horizontalHeader().sectionMoved.connect(self._on_columns_scrolled)
+        self.table_model.modelReset.connect(self._sized_columns.clear)
+
+        # Cache d'affichage : lignes autour du viewport formatées à l'avance au défilement
+        self.table_view.verticalScrollBar().valueChanged.connect(self._on_rows_scrolled)
+        self.table_view.verticalScrollBar().rangeChanged.connect(self._on_rows_scrolled)
+
+        # Annuler / rétablir avec les raccourcis habituels
+        self.undo_stack = QUndoStack(self)
+        if hasattr(self.table_model, 'set_undo_stack'):
+            self.table_model.set_undo_stack(self.undo_stack)
+        self.undo_action = self.undo_stack.createUndoAction(self, "Annuler")
+        self.redo_action = self.undo_stack.createRedoAction(self, "Rétablir")
+        self.undo_action.setShortcut(QKeySequence.Undo)
+        self.redo_action.setShortcut(QKeySequence.Redo)
+        for action in (self.undo_action, self.redo_action):
+            action.setShortcutContext(Qt.WidgetWithChildrenShortcut)
+            self.addAction(action)
+
+        # Progression du chargement en arrière-plan
+        self._loader = None
+        self._load_detected = False
+        self._exporter = None
+        self.category_savings = {}  # nom de colonne -> (octets en texte, octets encodés), voir `load_categories`
+        self.progress_bar = QProgressBar(self)
+        self.cancel_button = QPushButton("Annuler")
+        self.progress_bar.hide()
+        self.cancel_button.hide()
 
         # Boutons pour l'édition des données
         self.add_button = QPushButton("Ajouter ligne")
         self.delete_button = QPushButton("Supprimer ligne")
         self.edit_button = QPushButton("Modifier cellule")
+        if not hasattr(self.table_model, 'append_rows'):
+            self.add_button.hide()  # Modèle sans ajout de lignes (ex: PagedDataFrameModel)
+        if not hasattr(self.table_model, 'remove_row_ranges'):
+            self.delete_button.hide()  # Modèle sans suppression de lignes (ex: PagedDataFrameModel)
 
         # Layout pour les boutons
         button_layout = QHBoxLayout()
+        button_layout.addWidget(self.progress_bar)
+        button_layout.addWidget(self.cancel_button)
         button_layout.addWidget(self.add_button)
         button_layout.addWidget(self.delete_button)
         button_layout.addWidget(self.edit_button)
 
         # Layout principal
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.filter_edit)
+        search_layout.addWidget(self.find_edit)
         layout = QVBoxLayout(self)
+        layout.addLayout(search_layout)
         layout.addWidget(self.table_view)
         layout.addLayout(button_layout)
         self.setLayout(layout)
@@ -46,30 +163,474 @@ class DataFrameView(QWidget):
         self.add_button.clicked.connect(self.add_row)
         self.delete_button.clicked.connect(self.delete_row)
         self.edit_button.clicked.connect(self.edit_cell)
+        self.filter_edit.textChanged.connect(self.set_filter)
+        self.find_edit.textChanged.connect(self.find)
+        self.find_edit.returnPressed.connect(self.find_next)
+        self.find_next_action.triggered.connect(self.find_next)
+        self.find_previous_action.triggered.connect(self.find_previous)
+        self.cancel_button.clicked.connect(self.cancel_load)
+        self.cancel_button.clicked.connect(self.cancel_export)
+
+        if self._pending_frame is not None:
+            QTimer.singleShot(0, self._fill_pending_frame)
+        elif self.auto_resize_columns:
+            self.resize_columns_to_contents()
+
+    def _fill_pending_frame(self):
+        dataframe, self._pending_frame = self._pending_frame, None
+        if dataframe is None:
+            return  # Remplacée entre-temps (ex: `load`)
+        self.table_model.set_dataframe(dataframe)
+        self.detect_column_types()
+        if self.auto_resize_columns:
+            self.resize_columns_to_contents()
 
     def model(self):
         return self.table_model  # Permet aux tests d'accéder au modèle
 
+    def detect_column_types(self):
+        """Détecte le type des colonnes (visibles seulement pour une table large) puis installe les délégués."""
+        dataframe = self.table_model.sample_frame()
+        if self.is_wide():
+            self._detected_columns.clear()
+            self._detect_columns(self.visible_columns())
+            return
+        if len(dataframe) < self.background_detection_rows:
+            self._install_delegates(self.type_detector.detect_all(dataframe))
+            return
+
+        self._detection_thread = TypeDetectionThread(self.type_detector, dataframe, self)
+        self._detection_thread.detected.connect(self._install_delegates)
+        self._detection_thread.start()
+
+    def load(self, path, format=None, chunk_rows=50000, **read_options):
+        """Charge un fichier CSV/TSV/Parquet/Excel en arrière-plan.
+
+        Le premier bloc est affiché dès sa lecture, les suivants sont ajoutés au
+        fur et à mesure ; les types sont détectés une fois `load_detection_rows`
+        lignes disponibles. Retourne le `ChunkedLoader` utilisé.
+        """
+        from .loaders import ChunkedLoader  # Modules des fonctions annexes importés au premier usage
+
+        self.cancel_load()
+        self._pending_frame = None
+        self._loader = ChunkedLoader(path, format, chunk_rows, self, **read_options)
+        self._load_detected = False
+        self._loader.chunkLoaded.connect(self._on_chunk_loaded)
+        self._loader.progress.connect(self.progress_bar.setValue)
+        self._loader.failed.connect(self._on_load_failed)
+        self._loader.finished.connect(self._on_load_finished)
+
+        self.table_model.set_dataframe(pd.DataFrame())
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_button.show()
+        self._loader.start()
+        return self._loader
+
+    def cancel_load(self):
+        """Interrompt le chargement en cours ; les lignes déjà lues restent affichées."""
+        if self._loader is not None and self._loader.isRunning():
+            self._loader.cancel()
+            self._loader.wait()
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+
+    def _on_chunk_loaded(self, chunk):
+        if self.sender() is not self._loader or self._loader.is_cancelled():
+            return  # Bloc d'un chargement annulé ou remplacé
+        if self.table_model.columnCount() == 0:
+            self.table_model.set_dataframe(chunk.reset_index(drop=True))
+            if self.load_categories:
+                self.table_model.encode_categories()  # Les blocs suivants étendent les catégories
+            if self.auto_resize_columns:
+                self.resize_columns_to_contents()
+        else:
+            self.table_model.append_rows(chunk)
+        if not self._load_detected and self.table_model.rowCount() >= self.load_detection_rows:
+            self._detect_loaded_types()
+
+    def _on_load_finished(self):
+        if self.sender() is not self._loader:
+            return
+        if not self._load_detected:
+            self._detect_loaded_types()
+        if self.load_categories:
+            self.category_savings = self.table_model.category_memory()
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+
+    def _on_load_failed(self, message):
+        QMessageBox.warning(self, "Erreur de chargement", message)
+
+    def export(self, path, format=None, scope='all', changed_only=False, chunk_rows=50000, **write_options):
+        """Exporte la table en CSV/TSV/Parquet/Feather en arrière-plan ; retourne le `ChunkedExporter` utilisé.
+
+        `scope` : 'all' (toute la table, dans son ordre), 'view' (lignes de la
+        vue, triées et filtrées, et colonnes affichées, dans leur ordre) ou
+        'selection' (lignes et colonnes sélectionnées, dans l'ordre de la vue). Avec `changed_only`, seules les
+        lignes modifiées ou ajoutées depuis le chargement sont écrites. Les
+        données exportées sont copiées au lancement : les modifications
+        ultérieures n'y figurent pas. Retourne `None` si le modèle ne permet
+        pas l'export (ex: `PagedDataFrameModel`, réécrit par `flush`).
+        """
+        from .exporters import ChunkedExporter
+
+        model = self.table_model
+        if not hasattr(model, 'snapshot'):
+            return None
+        columns = None
+        if scope == 'all':
+            rows = None
+        elif scope == 'view':
+            rows = model.view_frame_rows()
+            columns = self.column_order()
+        elif scope == 'selection':
+            ranges = self.selected_row_ranges()
+            view_rows = np.concatenate([np.arange(first, last + 1) for first, last in ranges] or [[]])
+            rows = model.view_frame_rows()[view_rows.astype(np.int64)]
+            columns = self.selected_columns()
+        else:
+            raise ValueError("Étendue d'export inconnue : %r" % (scope,))
+        if changed_only:
+            changed = model.changed_rows()
+            rows = changed if rows is None else rows[np.isin(rows, changed)]
+
+        self.cancel_export()
+        self._exporter = ChunkedExporter(model.snapshot(rows, columns), path, format, chunk_rows, self,
+                                         **write_options)
+        self._exporter.progress.connect(self.progress_bar.setValue)
+        self._exporter.failed.connect(self._on_export_failed)
+        self._exporter.finished.connect(self._on_export_finished)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_button.show()
+        self._exporter.start()
+        return self._exporter
+
+    def cancel_export(self):
+        """Interrompt l'export en cours ; le fichier partiel est supprimé."""
+        if self._exporter is not None and self._exporter.isRunning():
+            self._exporter.cancel()
+            self._exporter.wait()
+            self.progress_bar.hide()
+            self.cancel_button.hide()
+
+    def _on_export_finished(self):
+        if self.sender() is not self._exporter:
+            return
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+
+    def _on_export_failed(self, message):
+        QMessageBox.warning(self, "Erreur d'export", message)
+
+    def _detect_loaded_types(self):
+        self._load_detected = True
+        self.type_detector.invalidate()
+        for col in range(self.table_model.columnCount()):
+            self.table_view.setItemDelegateForColumn(col, None)
+        self.detect_column_types()
+
+    def encode_categories(self, columns=None, max_categories=1000, max_ratio=0.5):
+        """Encode en catégories des colonnes de texte (voir `DataFrameModel.encode_categories`) et les édite
+        par une liste déroulante ; retourne {nom de colonne: (octets avant, octets après)}."""
+        savings = self.table_model.encode_categories(columns, max_categories, max_ratio)
+        self.category_savings.update(savings)
+        for name in savings:
+            self.type_detector.invalidate(name)
+        self.detect_column_types()
+        return savings
+
+    def is_wide(self):
+        """Vrai si la table compte plus de `wide_columns` colonnes (traitement colonne par colonne à l'affichage)."""
+        return self.table_model.columnCount() > self.wide_columns
+
+    def visible_columns(self):
+        """Colonnes (positions du modèle) affichées dans la vue, dans l'ordre d'affichage, sans les colonnes masquées."""
+        header = self.table_view.horizontalHeader()
+        count = header.count()
+        if not count:
+            return []
+        first = max(header.visualIndexAt(0), 0)
+        last = header.visualIndexAt(self.table_view.viewport().width() - 1)
+        if last < 0:
+            last = count - 1
+        columns = (header.logicalIndex(visual) for visual in range(first, last + 1))
+        return [col for col in columns if not header.isSectionHidden(col)]
+
+    def _on_columns_scrolled(self, *args):
+        if not self.is_wide():
+            return
+        columns = self.visible_columns()
+        self._detect_columns([col for col in columns if col not in self._detected_columns])
+        if self.auto_resize_columns:
+            self.resize_columns_to_contents([col for col in columns if col not in self._sized_columns])
+
+    def _on_rows_scrolled(self, *args):
+        model = self.table_model
+        if not hasattr(model, 'prefetch_display') or model.display_cache() is None:
+            return
+        first = max(self.table_view.rowAt(0), 0)
+        last = self.table_view.rowAt(self.table_view.viewport().height())
+        if last < 0:
+            last = model.rowCount() - 1
+        page = last - first + 1  # Une page avant et après : le prochain défilement est déjà formaté
+        model.prefetch_display(first - page, last + page, self.visible_columns() if self.is_wide() else None)
+
+    def _detect_columns(self, columns):
+        """Détecte le type des colonnes `columns` (positions) et installe leurs délégués."""
+        if not columns:
+            return
+        dataframe = self.table_model.sample_frame()
+        kinds = {col: self.type_detector.detect(dataframe, dataframe.columns[col]) for col in columns}
+        self._detected_columns.update(columns)
+        self._install_delegates({col: kind for col, kind in kinds.items() if kind is not None})
+
+    def column_order(self):
+        """Colonnes (positions du modèle) dans l'ordre d'affichage, sans les colonnes masquées."""
+        header = self.table_view.horizontalHeader()
+        columns = (header.logicalIndex(visual) for visual in range(header.count()))
+        return [col for col in columns if not header.isSectionHidden(col)]
+
+    def set_column_order(self, columns):
+        """Affiche les colonnes `columns` (positions du modèle) dans cet ordre et masque les autres.
+
+        Seule la correspondance des colonnes de l'en-tête (position affichée ->
+        position du modèle) change : la table n'est ni copiée ni réordonnée.
+        """
+        header = self.table_view.horizontalHeader()
+        for visual, col in enumerate(columns):
+            header.moveSection(header.visualIndex(col), visual)
+        shown = set(columns)
+        for col in range(header.count()):
+            header.setSectionHidden(col, col not in shown)
+        self._on_columns_scrolled()
+
+    def set_columns_hidden(self, columns, hidden=True):
+        """Masque (ou réaffiche) les colonnes `columns` (positions du modèle)."""
+        for col in columns:
+            self.table_view.setColumnHidden(col, hidden)
+        self._on_columns_scrolled()
+
+    def resize_columns_to_contents(self, columns=None):
+        """Ajuste la largeur des colonnes à leur contenu estimé sur un échantillon de lignes.
+
+        Contrairement à `QTableView.resizeColumnsToContents`, aucune donnée n'est
+        lue ligne par ligne : les largeurs viennent du cache du modèle.
+        `columns` : positions à ajuster ; par défaut toutes, ou les colonnes
+        visibles pour une table large.
+        """
+        model = self.table_model
+        if not hasattr(model, 'column_width'):
+            self.table_view.resizeColumnsToContents()
+            return
+        if columns is None:
+            columns = self.visible_columns() if self.is_wide() else range(model.columnCount())
+
+        first = max(self.table_view.rowAt(0), 0)
+        last = self.table_view.rowAt(self.table_view.viewport().height())
+        if last < 0:
+            last = model.rowCount() - 1
+        char_width = self.table_view.fontMetrics().averageCharWidth()
+        header = self.table_view.horizontalHeader()
+        self._sized_columns.update(columns)  # Avant le redimensionnement, qui peut révéler d'autres colonnes
+        for col in columns:
+            width = model.column_width(col, (first, min(last, first + 100)))
+            header.resizeSection(col, min(width * char_width + self.column_padding, self.max_column_width))
+
+    def add_format_rule(self, condition, columns=None, **style):
+        """Ajoute une règle de mise en forme conditionnelle (voir `FormatRule`) ; retourne la règle."""
+        rule = FormatRule(condition, columns, **style)
+        self.table_model.add_format_rule(rule)
+        return rule
+
+    def show_summary(self, aggregates=None):
+        """Affiche sous la table des lignes de synthèse (voir `SummaryModel`), alignées sur ses colonnes.
+
+        `aggregates` : agrégats affichés, `summary.AGGREGATES` par défaut.
+        """
+        from .summary import AGGREGATES, SummaryModel
+
+        if aggregates is None:
+            aggregates = AGGREGATES
+        self.hide_summary()
+        self.summary_view = QTableView(self)
+        self.summary_view.setModel(SummaryModel(self.table_model, aggregates, self.summary_view))
+        self.summary_view.horizontalHeader().hide()
+        self.summary_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.summary_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.summary_view.verticalHeader().setFixedWidth(self.table_view.verticalHeader().sizeHint().width())
+        self.table_view.verticalHeader().setFixedWidth(self.table_view.verticalHeader().sizeHint().width())
+        rows_height = sum(self.summary_view.rowHeight(row) for row in range(len(aggregates)))
+        self.summary_view.setFixedHeight(rows_height + 2 * self.summary_view.frameWidth())
+
+        header = self.table_view.horizontalHeader()
+        for col in range(self.table_model.columnCount()):
+            self.summary_view.setColumnWidth(col, header.sectionSize(col))
+        header.sectionResized.connect(self._resize_summary_column)
+        self.table_view.horizontalScrollBar().valueChanged.connect(
+            self.summary_view.horizontalScrollBar().setValue)
+
+        layout = self.layout()
+        layout.insertWidget(layout.indexOf(self.table_view) + 1, self.summary_view)
+        return self.summary_view
+
+    def hide_summary(self):
+        if self.summary_view is None:
+            return
+        self.table_view.horizontalHeader().sectionResized.disconnect(self._resize_summary_column)
+        self.summary_view.model().close()
+        self.summary_view.deleteLater()
+        self.summary_view = None
+
+    def set_group_by(self, columns, aggregates=None):
+        """Affiche les lignes regroupées par `columns` (arbre dépliable, voir `GroupedDataFrameModel`).
+
+        `None` (ou une liste vide) revient à la table.
+        """
+        if self.tree_view is not None:
+            self.tree_view.model().close()
+            self.tree_view.deleteLater()
+            self.tree_view = None
+        if not columns:
+            self.table_view.show()
+            return None
+        from PyQt4.QtGui import QTreeView
+        from .group_model import GroupedDataFrameModel
+
+        self.tree_view = QTreeView(self)
+        self.tree_view.setModel(GroupedDataFrameModel(self.table_model, columns, aggregates, self.tree_view))
+        self.tree_view.setUniformRowHeights(True)
+        layout = self.layout()
+        layout.insertWidget(layout.indexOf(self.table_view) + 1, self.tree_view)
+        self.table_view.hide()
+        return self.tree_view
+
+    def _resize_summary_column(self, col, old_size, new_size):
+        self.summary_view.setColumnWidth(col, new_size)
+
+    def start_profiling(self, interval=None, callback=None):
+        """Mesure les appels au modèle et aux délégués ; retourne le `Profiler` (voir `profiler.stats`).
+
+        Avec `interval` (ms), `callback(stats)` (ou le journal) reçoit un rapport périodique.
+        """
+        from .profiling import Profiler
+
+        self.stop_profiling()
+        self._profiler = Profiler(self.table_model, self.table_view, interval=interval, callback=callback,
+                                  parent=self)
+        self._profiler.start()
+        return self._profiler
+
+    def stop_profiling(self):
+        if self._profiler is not None:
+            self._profiler.stop()
+            self._profiler = None
+
+    def _install_delegates(self, kinds):
+        for col_idx, kind in kinds.items():
+            delegate = self._delegate(kind)
+            if delegate is not None:
+                self.table_view.setItemDelegateForColumn(col_idx, delegate)
+
+    def _delegate(self, kind):
+        """Délégué du type `kind`, créé au premier besoin puis partagé par les colonnes de ce type."""
+        delegate = self._delegates.get(kind)
+        if delegate is None and kind in self.delegate_classes:
+            delegate = self._delegates[kind] = self.delegate_classes[kind](self)
+        return delegate
+
+    def start_streaming(self, interval=100, max_rows=None, auto_scroll=True):
+        """Active le mode flux du modèle ; avec `auto_scroll`, la vue suit les dernières lignes."""
+        if not hasattr(self.table_model, 'start_streaming'):
+            return  # Modèle sans mode flux (ex: PagedDataFrameModel)
+        self.table_model.start_streaming(interval, max_rows)
+        self.set_auto_scroll(auto_scroll)
+
+    def set_auto_scroll(self, enabled):
+        if enabled and not self._auto_scroll:
+            self.table_model.rowsInserted.connect(self._scroll_to_tail)
+        elif not enabled and self._auto_scroll:
+            self.table_model.rowsInserted.disconnect(self._scroll_to_tail)
+        self._auto_scroll = enabled
+
+    def _scroll_to_tail(self, parent, first, last):
+        self.table_view.scrollToBottom()
+
+    def set_filter(self, text):
+        """Affiche uniquement les lignes contenant `text`."""
+        self.table_model.set_filter(text)
+
+    def find(self, text, mode='text'):
+        """Recherche `text` dans les cellules ('text', 'regex' ou 'number') et va à la première trouvée."""
+        if self._search is None:
+            self._search = self.table_model.search()
+            self._search.finished.connect(self._on_search_finished)
+        self._search.find(text, mode)  # Le résultat complet est signalé par `finished`
+
+    def _on_search_finished(self, count):
+        if count:
+            index = self.table_view.currentIndex()
+            row, col = (index.row(), index.column() - 1) if index.isValid() else (0, -1)
+            self._go_to_cell(self._search.next_match(row, col))
+
+    def find_next(self):
+        self._find_from_current('next_match')
+
+    def find_previous(self):
+        self._find_from_current('previous_match')
+
+    def _find_from_current(self, method):
+        if self._search is None:
+            return
+        index = self.table_view.currentIndex()
+        row, col = (index.row(), index.column()) if index.isValid() else (0, -1)
+        self._go_to_cell(getattr(self._search, method)(row, col))
+
+    def _go_to_cell(self, cell):
+        if cell is not None:
+            index = self.table_model.index(*cell)
+            self.table_view.setCurrentIndex(index)
+            self.table_view.scrollTo(index)
+
     def add_row(self):
         """Ajoute une ligne vide."""
+        if not hasattr(self.table_model, 'append_rows'):
+            return
         self.table_model.insertRows(self.table_model.rowCount(), 1)
 
-    def delete_row(self):
-        """Supprime la ligne sélectionnée."""
-        index = self.table_view.currentIndex()
-        if index.isValid():
-            self.table_model.removeRows(index.row(), 1)
+    def selected_row_ranges(self):
+        """Retourne les plages de lignes sélectionnées (ou la ligne courante à défaut)."""
+        selection = self.table_view.selectionModel().selection()
+        ranges = merge_ranges((selected.top(), selected.bottom()) for selected in selection)
+        if not ranges:
+            index = self.table_view.currentIndex()
+            if index.isValid():
+                ranges = [(index.row(), index.row())]
+        return ranges
+
+    def selected_columns(self):
+        """Colonnes touchées par la sélection, dans l'ordre d'affichage ; celles de la vue à défaut de sélection."""
+        selection = self.table_view.selectionModel().selection()
+        header = self.table_view.horizontalHeader()
+        columns = sorted(set(col for selected in selection for col in range(selected.left(), selected.right() + 1)),
+                         key=header.visualIndex)
+        return columns or self.column_order()
 
     def delete_row(self):
-        """Supprime la ligne sélectionnée après confirmation."""
-        index = self.table_view.currentIndex()
-        if index.isValid():
+        """Supprime les lignes sélectionnées après confirmation."""
+        if not hasattr(self.table_model, 'remove_row_ranges'):
+            return
+        ranges = self.selected_row_ranges()
+        if ranges:
+            count = sum(last - first + 1 for first, last in ranges)
             reply = QMessageBox.question(self, 'Confirmer', 
-                                         "Êtes-vous sûr de vouloir supprimer cette ligne ?",
+                                         "Êtes-vous sûr de vouloir supprimer %d ligne(s) ?" % count,
                                          QMessageBox.Yes | QMessageBox.No, 
                                          QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.table_model.removeRows(index.row(), 1)
+                self.table_model.remove_row_ranges(ranges)
         else:
             QMessageBox.warning(self, 'Erreur', 'Aucune ligne sélectionnée pour suppression.')
 
@@ -83,92 +644,616 @@ class DataFrameView(QWidget):
                 self.table_model.setData(index, new_value, Qt.EditRole)
 
 
+    def selected_rectangle(self):
+        """Retourne le rectangle (haut, gauche, bas, droite) englobant la sélection, ou `None`."""
+        selection = self.table_view.selectionModel().selection()
+        if selection.isEmpty():
+            index = self.table_view.currentIndex()
+            if not index.isValid():
+                return None
+            return index.row(), index.column(), index.row(), index.column()
+        return (min(selected.top() for selected in selection),
+                min(selected.left() for selected in selection),
+                max(selected.bottom() for selected in selection),
+                max(selected.right() for selected in selection))
+
     def copy_selection(self):
-        """Copie la valeur de la cellule sélectionnée dans le presse-papiers."""
-        index = self.table_view.currentIndex()
-        if index.isValid():
-            value = self.model().data(index, Qt.DisplayRole)
-            QApplication.clipboard().setText(value)
+        """Copie les cellules sélectionnées dans le presse-papiers (TSV)."""
+        rectangle = self.selected_rectangle()
+        if rectangle is not None:
+            QApplication.clipboard().setText(format_tsv(self.model().get_block(*rectangle)))
 
     def cut_selection(self):
-        """Coupe la valeur de la cellule sélectionnée (copie puis supprime)."""
-        index = self.table_view.currentIndex()
-        if index.isValid():
-            value = self.model().data(index, Qt.DisplayRole)
-            QApplication.clipboard().setText(value)
-            self.model().setData(index, "", Qt.EditRole)
+        """Coupe les cellules sélectionnées (copie puis vide)."""
+        rectangle = self.selected_rectangle()
+        if rectangle is not None:
+            top, left, bottom, right = rectangle
+            self.copy_selection()
+            empty = [[""] * (right - left + 1)] * (bottom - top + 1)
+            self.model().set_block(top, left, empty)
 
     def paste_selection(self):
-        """Colle la valeur du presse-papiers dans la cellule sélectionnée en respectant le type de la colonne."""
+        """Colle le bloc du presse-papiers à partir de la cellule courante en respectant le type des colonnes."""
         index = self.table_view.currentIndex()
         if not index.isValid():
             return
         
         try:
             clipboard_value = QApplication.clipboard().text()
-            self.model().setData(index, clipboard_value, Qt.EditRole)
+            self.model().set_block(index.row(), index.column(), parse_tsv(clipboard_value))
         
-        except ValueError:
-            msg = "Impossible de coller '%s' dans la colonne %s." % (clipboard_value, index.column())
+        except InvalidValuesError as error:
+            cells = ", ".join("'%s' (%d, %d)" % (value, row, col) for row, col, value in error.cells[:20])
+            msg = "Impossible de coller %d valeur(s) : %s." % (len(error.cells), cells)
             QMessageBox.warning(self, "Erreur de collage", msg)
             
 
+class InvalidValuesError(ValueError):
+    """Valeurs impossibles à convertir ; `cells` liste les (ligne, colonne, valeur) fautives."""
+
+    def __init__(self, cells):
+        super(InvalidValuesError, self).__init__("%d valeur(s) invalide(s)" % len(cells))
+        self.cells = cells
+
+
+def empty_values(dtype, count):
+    """Retourne `count` valeurs vides conservant le type `dtype` (0, False, NaN, NaT, NA ou "")."""
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in 'iu':
+            return np.zeros(count, dtype=dtype)
+        if dtype.kind == 'b':
+            return np.zeros(count, dtype=bool)
+        if dtype.kind in 'fc':
+            return np.full(count, np.nan, dtype=dtype)
+        if dtype.kind in 'mM':
+            return np.full(count, np.datetime64('NaT') if dtype.kind == 'M' else np.timedelta64('NaT'), dtype=dtype)
+        return np.full(count, "", dtype=object)  # Texte
+    if isinstance(dtype, pd.StringDtype):
+        return pd.array([""] * count, dtype=dtype)
+    return pd.array([None] * count, dtype=dtype)  # Types d'extension : NA
+
+
+def empty_rows(dataframe, count):
+    """Construit un bloc de `count` lignes vides ayant les mêmes colonnes et types que `dataframe`."""
+    block = pd.DataFrame({i: empty_values(dtype, count) for i, dtype in enumerate(dataframe.dtypes)},
+                         index=range(count))
+    block.columns = dataframe.columns
+    return block
+
+
+def merge_ranges(ranges):
+    """Trie et fusionne des plages (début, fin incluses) adjacentes ou chevauchantes."""
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def row_ranges(rows):
+    """Regroupe des numéros de lignes en plages contiguës (début, fin incluses)."""
+    rows = np.unique(np.fromiter(rows, dtype=np.int64))
+    if not len(rows):
+        return []
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+    starts = rows[np.concatenate([[0], breaks])]
+    ends = rows[np.concatenate([breaks - 1, [len(rows) - 1]])]
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
 class DataFrameModel(QAbstractTableModel):
 
-    def __init__(self, dataframe=pd.DataFrame(), parent=None):
+    def __init__(self, dataframe=None, parent=None, display_cache=None):
         super().__init__(parent)
-        self._dataframe = dataframe
-        print(dataframe.dtypes)
+        # Table partagée avec les autres modèles attachés au même magasin (DataFrame utilisé sans copie)
+        self._store = dataframe if isinstance(dataframe, FrameStore) else FrameStore(dataframe)
+        self._removal_rows = None  # Pendant une suppression : lignes (de l'ancienne table) encore dans la vue
+        self._removing = None  # (masque des lignes conservées de la vue, plages supprimées) en cours
+        self._display_cache = display_cache
+        self._row_order = RowOrder()
+        self._update_depth = 0
+        self._history = None  # UndoHistory, voir `set_undo_stack`
+        self._dirty = {}  # colonne -> [(première, dernière ligne)] modifiées pendant la transaction
+        self._stream = deque()  # Blocs poussés (éventuellement depuis d'autres threads) en attente d'affichage
+        self._stream_timer = None
+        self.max_rows = None  # Nombre maximal de lignes conservées en mode flux
+        self.converter_registry = default_registry
+        self._invalid_policies = {}  # nom de colonne -> 'reject' ou 'na'
+        self._custom_converters = {}  # nom de colonne -> ColumnConverter fourni par l'utilisateur
+        self._converters = None  # Convertisseurs par position de colonne, construits à la demande
+        self._width_estimator = ColumnWidthEstimator()
+        self._formats = ConditionalFormats()
+        self._number_formats = {}  # position de colonne -> format (ex: '{:,.2f}')
+        self._search = None  # CellSearch, créée par `search`
+        self._changed_rows = ChangedRows()  # Lignes modifiées depuis le chargement (voir `changed_rows`)
+        self._categories = CategoryCodes()  # Codes et libellés des colonnes catégorielles
+        # Objets indexés par ligne de la table, prévenus des modifications, insertions et suppressions
+        self._frame_observers = [self._formats, self._changed_rows, self._categories]
+        self._header_labels = list(self._frame.columns)  # Libellés des colonnes, lus par `headerData`
+        self._store.attach(self)
+
+    @property
+    def _dataframe(self):
+        return self._store.dataframe
+
+    @property
+    def _frame(self):
+        return self._store._frame  # Colonnes et types de la table
+
+    def _frame_length(self):
+        return len(self._store)
+
+    def frame_store(self):
+        """Magasin de la table ; `DataFrameModel(model.frame_store())` crée un modèle partageant la table."""
+        return self._store
+
+    def _displayed_rows(self):
+        """Lignes de la table affichées par la vue, dans son ordre ; `None` : toutes, dans l'ordre de la table."""
+        return self._removal_rows if self._removal_rows is not None else self._row_order.rows
+
+    def _frame_rows(self, first, stop):
+        """Lignes de la table correspondant aux lignes `first` à `stop` (exclue) de la vue."""
+        rows = self._displayed_rows()
+        return slice(first, stop) if rows is None else rows[first:stop]
+
+    def _frame_row(self, row):
+        """Convertit une ligne de la vue en ligne de la table (tri et filtre)."""
+        rows = self._displayed_rows()
+        return row if rows is None else int(rows[row])
 
     def rowCount(self, parent=None):
-        return self._dataframe.shape[0]
+        rows = self._displayed_rows()
+        return self._frame_length() if rows is None else len(rows)
 
     def columnCount(self, parent=None):
-        return self._dataframe.shape[1]
+        return len(self._header_labels)
+
+    def set_display_cache(self, cache):
+        """Active (`DisplayCache`) ou désactive (`None`) le cache des valeurs affichées."""
+        self._display_cache = cache
+        if cache is not None:
+            cache.clear()
+
+    def display_cache(self):
+        return self._display_cache
+
+    def prefetch_display(self, first, last, columns=None):
+        """Formate à l'avance, dans le cache d'affichage, les lignes `first` à `last` de la vue."""
+        if self._display_cache is None:
+            return
+        first, last = max(first, 0), min(last, self.rowCount() - 1)
+        if first > last:
+            return
+        rows = self._frame_rows(first, last + 1)
+        if isinstance(rows, slice):
+            rows = np.arange(rows.start, rows.stop)
+        # Colonnes affichées par le cache seulement (pas de format numérique ni de catégories)
+        columns = [col for col in (range(self.columnCount()) if columns is None else columns)
+                   if col not in self._number_formats and self._categories.get(self._dataframe, col) is None]
+        self._display_cache.prefetch(self._dataframe, rows, columns)
+
+    def set_dataframe(self, dataframe):
+        """Remplace la table affichée, pour tous les modèles qui la partagent (le tri et le filtre sont annulés)."""
+        self._store.set_dataframe(dataframe)
+
+    def _store_resetting(self):
+        self.beginResetModel()
+
+    def _store_reset(self):
+        self._dirty = {}
+        self._converters = None
+        self._header_labels = list(self._frame.columns)
+        self._row_order = RowOrder()
+        self._width_estimator.invalidate()
+        self._changed_rows.reset()
+        self._notify_observers('invalidate')
+        self._clear_history()
+        if self._display_cache is not None:
+            self._display_cache.clear()
+        self.endResetModel()
+
+    def _store_dtypes_changed(self):
+        self._converters = None
+        self._categories.invalidate()
+
+    def _store_columns_converted(self, columns):
+        self._store_dtypes_changed()
+        for col in columns:
+            self._width_estimator.invalidate(col)
+            self._row_order.invalidate_column(col)
+
+    def encode_categories(self, columns=None, max_categories=1000, max_ratio=0.5):
+        """Encode en catégories (dictionnaire + codes entiers) des colonnes de texte.
+
+        `columns` : positions des colonnes ; par défaut, les colonnes de texte
+        peu variées (voir `category_candidates`). Les valeurs affichées ne
+        changent pas. Retourne {nom de colonne: (octets avant, octets après)}.
+        """
+        dataframe = self._dataframe
+        if columns is None:
+            columns = category_candidates(dataframe, max_categories, max_ratio)
+        before = {col: int(dataframe.iloc[:, col].memory_usage(index=False, deep=True)) for col in columns}
+        self._store.convert_columns({col: 'category' for col in columns})
+        dataframe = self._dataframe
+        return {dataframe.columns[col]: (before[col], int(dataframe.iloc[:, col].memory_usage(index=False, deep=True)))
+                for col in columns}
+
+    def category_memory(self):
+        """{nom de colonne: (octets en texte, octets encodés)} des colonnes catégorielles (voir `memory_savings`)."""
+        dataframe = self._dataframe
+        return {name: memory_savings(dataframe.iloc[:, col]) for col, (name, dtype) in enumerate(dataframe.dtypes.items())
+                if isinstance(dtype, pd.CategoricalDtype)}
+
+    def sample_frame(self):
+        """DataFrame utilisé pour détecter le type des colonnes."""
+        return self._dataframe
+
+    def set_undo_stack(self, stack, max_bytes=256 * 1024 * 1024):
+        """Enregistre les modifications dans `stack` (QUndoStack), dans la limite de `max_bytes` ; `None` désactive."""
+        self._history = UndoHistory(self, stack, max_bytes) if stack is not None else None
+
+    def undo_history(self):
+        return self._history
+
+    def _clear_history(self):
+        """Oublie l'historique, dont les positions de lignes ne sont plus valides."""
+        if self._history is not None:
+            self._history.clear()
+
+    def changed_rows(self):
+        """Lignes de la table modifiées ou ajoutées depuis le dernier `set_dataframe` (voir `ChangedRows`)."""
+        return self._changed_rows.rows(self._frame_length())
+
+    def view_frame_rows(self):
+        """Lignes de la table dans l'ordre de la vue (tri et filtre)."""
+        rows = self._row_order.rows
+        return np.arange(self._frame_length()) if rows is None else rows
+
+    def snapshot(self, frame_rows=None, columns=None):
+        """Cliché (`FrameSnapshot`) des lignes `frame_rows` et des colonnes `columns` (positions), toutes par défaut.
+
+        Le cliché ne suit pas les modifications ultérieures et peut être lu
+        depuis un autre thread (export en arrière-plan) ; seules les colonnes
+        modifiées entre-temps sont copiées.
+        """
+        return self._store.snapshot(frame_rows, columns)
+
+    def column_width(self, col, visible_rows=None):
+        """Largeur estimée (en caractères) de la colonne `col` ; `visible_rows` : (première, dernière) de la vue."""
+        frame_rows = None
+        if visible_rows is not None and self.rowCount():
+            first, last = visible_rows
+            frame_rows = self._frame_rows(first, last + 1)
+            if isinstance(frame_rows, slice):
+                frame_rows = np.arange(*frame_rows.indices(self._frame_length()))
+        return self._width_estimator.estimate(self._dataframe, col, frame_rows)
+
+    def add_format_rule(self, rule):
+        """Ajoute une règle de mise en forme conditionnelle (`FormatRule`)."""
+        self._formats.add_rule(rule)
+        self._all_cells_changed()
+
+    def clear_format_rules(self):
+        self._formats.clear()
+        self._all_cells_changed()
+
+    def set_number_format(self, column, number_format):
+        """Format d'affichage (ex: '{:,.2f}') de la colonne `column` (nom) ; `None` revient au texte brut."""
+        col = self._frame.columns.get_loc(column)
+        if number_format is None:
+            self._number_formats.pop(col, None)
+        else:
+            self._number_formats[col] = number_format
+        self._all_cells_changed()
+
+    def search(self):
+        """Recherche incrémentale (`CellSearch`) associée au modèle, créée au premier appel."""
+        if self._search is None:
+            from .search import CellSearch
+
+            self._search = CellSearch(self, parent=self)
+            self._search.finished.connect(lambda count: self._all_cells_changed())
+            self.add_frame_observer(self._search)
+        return self._search
+
+    def add_frame_observer(self, observer):
+        """Prévient `observer` des modifications de la table (lignes de la table, avant et après changement).
+
+        Méthodes appelées si présentes : `invalidate()`, `cells_changing` /
+        `cells_changed(dataframe, colonne, lignes)`, `rows_inserted(dataframe,
+        ligne, nombre)`, `rows_removing(dataframe, masque conservé)` /
+        `rows_removed(masque conservé)`, `head_removing(dataframe, nombre)` /
+        `head_removed(nombre)`, `rows_restored(positions, nombre de lignes)`
+        (annulation d'une suppression, suivie de `invalidate()`). Les lignes
+        vides ajoutées en fin sont signalées par `rows_appended(ligne, nombre)`,
+        les blocs lus en fin de table par `rows_loaded(ligne, nombre)`, sans la table.
+        """
+        self._frame_observers.append(observer)
+
+    def remove_frame_observer(self, observer):
+        self._frame_observers.remove(observer)
+
+    def _notify_observers(self, name, *args):
+        for observer in self._frame_observers:
+            method = getattr(observer, name, None)
+            if method is not None:
+                method(*args)
+
+    def _all_cells_changed(self):
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def set_invalid_policy(self, column, policy):
+        """Sort des saisies invalides de la colonne `column` (nom) : 'reject' (refusées) ou 'na' (valeur manquante)."""
+        if policy not in ('reject', 'na'):
+            raise ValueError("Politique inconnue : %r" % (policy,))
+        self._invalid_policies[column] = policy
+        self._converters = None
+
+    def set_converter(self, column, converter):
+        """Impose un `ColumnConverter` à la colonne `column` (nom) ; `None` revient au registre."""
+        if converter is None:
+            self._custom_converters.pop(column, None)
+        else:
+            self._custom_converters[column] = converter
+        self._converters = None
+
+    def _converter(self, col):
+        """Convertisseur de la colonne `col`, construit une fois pour toutes les colonnes."""
+        if self._converters is None:
+            dataframe = self._dataframe
+            self._converters = [
+                self._custom_converters.get(name) or
+                self.converter_registry.converter_for(dtype, self._invalid_policies.get(name, 'reject'))
+                for name, dtype in zip(dataframe.columns, dataframe.dtypes)
+            ]
+        return self._converters[col]
+
+    def _restore_rows(self, frame_positions, block):
+        """Réinsère en une fois des lignes supprimées à leurs positions d'origine dans la table."""
+        ranges = row_ranges(frame_positions) if self._row_order.rows is None else None  # Plages de la vue
+        self._store.restore_rows(frame_positions, block, self, ranges)
+
+    def _store_rows_restoring(self, frame_positions, total, ranges):
+        # Une seule plage contiguë sans tri dans ce modèle : insertion simple ; sinon réinitialisation
+        self._restoring_simple = ranges is not None and len(ranges) == 1 and self._row_order.rows is None
+        if self._restoring_simple:
+            self.beginInsertRows(QModelIndex(), ranges[0][0], ranges[0][1])
+        else:
+            self.beginResetModel()
+        self._notify_observers('rows_restored', frame_positions, total)
+
+    def _store_rows_restored(self, frame_positions, origin):
+        if not origin:
+            self._clear_history()
+        self._row_order.invalidate()
+        self._row_order.compute(self._dataframe)
+        self._notify_observers('invalidate')
+        if self._display_cache is not None:
+            self._display_cache.invalidate_rows(int(frame_positions[0]))
+        if self._restoring_simple:
+            self.endInsertRows()
+        else:
+            self.endResetModel()
+
+    # Rôles servis par `data` ; les autres sont écartés avant tout accès à la table
+    served_roles = frozenset([Qt.DisplayRole, Qt.EditRole, RawValueRole, SortKeyRole, ChoicesRole]) | frozenset(STYLE_ROLES)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
-            return 
-        
-        value = self._dataframe.iloc[index.row(), index.column()]        
-        if role == Qt.DisplayRole or role == Qt.EditRole:
-            return str(value)
-        return
+        """Texte affiché (DisplayRole), valeur typée (EditRole), brute (RawValueRole), clé de tri (SortKeyRole)
+        ou libellés des catégories de la colonne (ChoicesRole, `None` si elle n'est pas catégorielle)."""
+        if role not in self.served_roles or not index.isValid():
+            return
+        if role == ChoicesRole:
+            return self._categories.choices(self._dataframe, index.column())
+
+        row = self._frame_row(index.row())
+        if role == Qt.DisplayRole:
+            number_format = self._number_formats.get(index.column())
+            if number_format is not None:
+                return number_format.format(self._dataframe.iloc[row, index.column()])
+            # Colonne catégorielle : code de la cellule puis libellé de sa catégorie
+            categories = self._categories.get(self._dataframe, index.column())
+            if categories is not None:
+                return categories[1][categories[0][row]]
+            if self._display_cache is not None:
+                return self._display_cache.get(self._dataframe, row, index.column())
+            return str(self._dataframe.iloc[row, index.column()])
+        if role in STYLE_ROLES:
+            if (role == Qt.BackgroundRole and self._search is not None and self._search.text and
+                    self._search.is_match(self._dataframe, index.column(), row)):
+                return self._search.highlight
+            if not self._formats.rules:
+                return
+            return self._formats.style(self._dataframe, index.column(), row, role)
+        if role == SortKeyRole:
+            return int(self._row_order.column_codes(self._dataframe, index.column())[row])
+        categories = self._categories.get(self._dataframe, index.column())
+        if categories is not None:
+            value = categories[2][categories[0][row]]
+        else:
+            value = self._dataframe.iloc[row, index.column()]
+        return value if role == RawValueRole else edit_value(value)
 
     def setData(self, index, value, role=Qt.EditRole):
         if not index.isValid() or role != Qt.EditRole:
             return False
-        
-        # Obtenir le type de la colonne
-        column_name = self._dataframe.columns[index.column()]
-        column_dtype = self._dataframe[column_name].dtype
-
-        # Convertir la valeur collée en fonction du type attendu
-        if column_dtype == "int64":
-            if value is None or value == '':
-                converted_value = 0
-            else:
-                converted_value = int(value)
-        elif column_dtype == "float64":
-            converted_value = float(value)
-        elif column_dtype == "bool":
-            converted_value = value.lower() in ["true", "1", "yes"]
-        elif column_dtype == "datetime64[ns]":
-            converted_value = pd.to_datetime(value)
-        elif column_dtype == "timedelta64[ns]":
-            converted_value = pd.to_timedelta(value)
-        # elif column_dtype == "category":
-        #     converted_value = value if value in self._dataframe[column_name].cat.categories else None
+        return self.set_frame_value(self._frame_row(index.row()), index.column(), value)
+
+    def set_frame_value(self, frame_row, col, value):
+        """Écrit une valeur saisie à la ligne `frame_row` de la table, indépendamment du tri et du filtre."""
+        # Convertir la valeur saisie (texte ou valeur native) en fonction du type de la colonne ; refusée si invalide
+        converted_value, valid = self._converter(col).convert(python_value(value))
+        if not valid:
+            return False
+
+        # Mise à jour du DataFrame (et notification de la vue)
+        self._write_frame_cells(col, np.array([frame_row]), [converted_value])
+        return True
+
+    def _write_frame_cells(self, column, frame_rows, values):
+        """Écrit `values` dans la colonne `column` aux lignes `frame_rows` de la table (tableau ou slice).
+
+        L'écriture est une seule affectation ; le delta est enregistré pour
+        l'annulation et les cellules modifiées sont signalées à la vue.
+        """
+        dataframe = self._dataframe
+        if isinstance(frame_rows, slice):
+            frame_rows = np.arange(*frame_rows.indices(len(dataframe)))
+        recording = self._history is not None and not self._history.replaying
+        if recording:
+            old_values = dataframe.iloc[frame_rows, column].to_numpy(copy=True)
+        self._store.write_cells(column, frame_rows, values)
+        if recording:
+            new_values = dataframe.iloc[frame_rows, column].to_numpy(copy=True)
+            self._history.record(CellDelta(column, frame_rows, old_values, new_values))
+
+    def _store_cells_changing(self, dataframe, column, frame_rows):
+        self._notify_observers('cells_changing', dataframe, column, frame_rows)
+
+    def _store_cells_changed(self, dataframe, column, frame_rows, retyped):
+        if retyped:
+            self._converters = None  # Type de la colonne modifié (ex: NaN dans une colonne d'entiers)
+            self._width_estimator.invalidate(column)
+        self._width_estimator.rows_changed(dataframe, column, frame_rows)
+        self._notify_observers('cells_changed', dataframe, column, frame_rows)
+        self._row_order.invalidate_column(column)
+        if self._display_cache is not None:
+            self._display_cache.invalidate_cells(frame_rows, column)
+        self.begin_update()
+        for first, last in row_ranges(self._view_rows(frame_rows)):
+            self._cells_changed(first, column, last, column)
+        self.end_update()
+
+    def _view_rows(self, frame_rows):
+        """Lignes de la vue affichant les lignes `frame_rows` de la table."""
+        rows = self._row_order.rows
+        return frame_rows if rows is None else np.flatnonzero(np.isin(rows, frame_rows))
+
+    # Nombre maximal de signaux dataChanged émis à la fin d'une transaction
+    max_changed_signals = 64
+
+    def begin_update(self):
+        """Démarre une transaction : les signaux dataChanged sont différés jusqu'à `end_update`
+        et les modifications forment une seule commande d'annulation."""
+        self._update_depth += 1
+        if self._history is not None:
+            self._history.begin_group()
+
+    def end_update(self):
+        """Termine une transaction et émet les signaux dataChanged regroupés."""
+        self._update_depth -= 1
+        if self._history is not None:
+            self._history.end_group()
+        if self._update_depth == 0:
+            self._flush_changes()
+
+    @contextmanager
+    def update(self):
+        """Transaction sous forme de gestionnaire de contexte (`with model.update(): ...`)."""
+        self.begin_update()
+        try:
+            yield self
+        finally:
+            self.end_update()
+
+    def _cells_changed(self, top, left, bottom, right):
+        if self._update_depth == 0:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+            return
+        for col in range(left, right + 1):
+            self._dirty.setdefault(col, []).append((top, bottom))
+
+    def _flush_changes(self):
+        """Émet un minimum de dataChanged : plages de lignes fusionnées par colonne, puis
+        colonnes adjacentes ayant les mêmes plages regroupées en rectangles."""
+        if not self._dirty:
+            return
+        rectangles = []
+        open_rectangles = {}  # (première, dernière ligne) -> rectangle prolongeable à droite
+        for col in sorted(self._dirty):
+            extended = {}
+            for first, last in merge_ranges(self._dirty[col]):
+                rect = open_rectangles.get((first, last))
+                if rect is not None and rect[3] == col - 1:
+                    rect[3] = col
+                else:
+                    rect = [first, last, col, col]
+                    rectangles.append(rect)
+                extended[(first, last)] = rect
+            open_rectangles = extended
+        self._dirty = {}
+
+        if len(rectangles) > self.max_changed_signals:
+            rectangles = [[min(rect[0] for rect in rectangles), max(rect[1] for rect in rectangles),
+                           min(rect[2] for rect in rectangles), max(rect[3] for rect in rectangles)]]
+        for first, last, left, right in rectangles:
+            self.dataChanged.emit(self.index(first, left), self.index(last, right))
+
+    def set_column_values(self, column, values, rows=None):
+        """Écrit un tableau de valeurs dans une colonne (toutes les lignes, ou les lignes `rows` de la vue).
+
+        Les valeurs qui n'ont pas le type de la colonne sont converties en une
+        opération vectorisée ; `InvalidValuesError` liste les valeurs refusées.
+        """
+        if rows is None:
+            frame_rows = self._frame_rows(0, self.rowCount())
         else:
-            converted_value = value  # Texte par défaut
+            rows = np.asarray(rows)
+            frame_rows = rows if self._row_order.rows is None else self._row_order.rows[rows]
+        values = pd.Series(values) if not hasattr(values, 'dtype') else values
+        if values.dtype != self._frame.dtypes.iloc[column]:
+            converted, bad = self._converter(column).convert_array(values)
+            if bad.any():
+                view_rows = np.arange(len(bad)) if rows is None else rows
+                raise InvalidValuesError([(int(view_rows[i]), column, np.asarray(values)[i]) for i in np.flatnonzero(bad)])
+            values = converted
+        self._write_frame_cells(column, frame_rows, values)
+        return True
 
-        if converted_value is None:
-            converted_value = np.nan
-            # raise ValueError("Valeur collée invalide pour cette colonne.")
-            
-        # Mise à jour du DataFrame
-        self._dataframe.at[index.row(), column_name] = converted_value
-        self.dataChanged.emit(index, index)  # Notifie la vue du changement
+    def get_block(self, top, left, bottom, right):
+        """Retourne les valeurs du rectangle de cellules (bornes incluses), dans l'ordre de la vue."""
+        return self._dataframe.iloc[self._frame_rows(top, bottom + 1), left:right + 1]
+
+    def set_block(self, row, column, values):
+        """Écrit un bloc rectangulaire de textes à partir de la cellule (`row`, `column`).
+
+        Chaque colonne est convertie par son convertisseur en une seule
+        opération vectorisée (sauf si elle a déjà le type de la colonne cible)
+        puis écrite en une affectation.
+        `values` est une liste de lignes ou un DataFrame. Si des valeurs sont
+        invalides, rien n'est écrit et `InvalidValuesError` liste toutes les
+        cellules fautives. La table est agrandie si le bloc dépasse la dernière
+        ligne ; les colonnes au-delà de la dernière sont ignorées.
+        """
+        block = values if isinstance(values, pd.DataFrame) else pd.DataFrame(values)
+        nrows, ncols = block.shape[0], min(block.shape[1], self.columnCount() - column)
+        if nrows == 0 or ncols <= 0:
+            return False
+
+        dtypes = self._frame.dtypes
+        converted, invalid = [], []
+        for j in range(ncols):
+            dtype = dtypes.iloc[column + j]
+            if block.dtypes.iloc[j] == dtype:  # Déjà au bon type : aucune conversion
+                converted.append(block.iloc[:, j].to_numpy())
+                continue
+            column_values, bad = self._converter(column + j).convert_array(block.iloc[:, j])
+            converted.append(column_values)
+            invalid.extend((row + i, column + j, block.iat[i, j]) for i in np.flatnonzero(bad))
+        if invalid:
+            raise InvalidValuesError(invalid)
+
+        with self.update():
+            extra = row + nrows - self.rowCount()
+            if extra > 0:
+                self.insertRows(self.rowCount(), extra)
+
+            frame_rows = self._frame_rows(row, row + nrows)
+            for j, column_values in enumerate(converted):
+                self._write_frame_cells(column + j, frame_rows, column_values)
         return True
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
@@ -176,9 +1261,9 @@ class DataFrameModel(QAbstractTableModel):
             return
         
         if orientation == Qt.Horizontal:
-            return self._dataframe.columns[section]
+            return self._header_labels[section]
         elif orientation == Qt.Vertical:
-            return str(section)
+            return str(self._frame_row(section))  # Numéro de ligne d'origine
         return
 
     def flags(self, index):
@@ -188,24 +1273,249 @@ class DataFrameModel(QAbstractTableModel):
         return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
 
     def insertRows(self, row, count, parent=None):
-        """Insère `count` lignes à partir de `row`."""
-        self.beginInsertRows(parent or QModelIndex(), row, row + count - 1)
+        """Insère `count` lignes vides à partir de `row`, en un seul bloc."""
+        if count <= 0 or row < 0 or row > self.rowCount():
+            return False
+
+        # Avec un tri ou un filtre actif, les lignes sont ajoutées en fin de table
+        # et seule la permutation les place à la position `row` de la vue
+        frame_row = row if self._row_order.rows is None else self._frame_length()
+        self._store.insert_rows(frame_row, empty_rows(self._frame, count), origin=self, view_row=row)
+        if self._history is not None:
+            self._history.record(InsertDelta(frame_row, count), "Ajout de lignes")
+        return True
+
+    def _insert_frame_rows(self, frame_row, count):
+        """Insère `count` lignes vides à la ligne `frame_row` de la table (même ligne de la vue sans tri
+        ni filtre, fin de la vue sinon)."""
+        view_row = frame_row if self._row_order.rows is None else len(self._row_order.rows)
+        self._store.insert_rows(frame_row, empty_rows(self._frame, count), origin=self, view_row=view_row)
 
-        for _ in range(count):
-            new_row = {col: "" for col in self._dataframe.columns}
-            self._dataframe = pd.concat([self._dataframe.iloc[:row], pd.DataFrame([new_row]), self._dataframe.iloc[row:]]).reset_index(drop=True)
+    def _store_rows_inserting(self, frame_row, count, view_row):
+        if view_row is None:  # Insertion venant d'un autre modèle : même position, ou fin de la vue triée
+            view_row = frame_row if self._row_order.rows is None else len(self._row_order.rows)
+        self._inserting_row = view_row
+        self._flush_changes()  # Les plages modifiées sont exprimées avant décalage des lignes
+        self.beginInsertRows(QModelIndex(), view_row, view_row + count - 1)
 
+    def _store_rows_inserted(self, frame_row, block, at_end, loaded, origin):
+        count = len(block)
+        if loaded:
+            self._width_estimator.rows_appended(block)
+            self._notify_observers('rows_loaded', frame_row, count)
+        elif at_end:
+            self._notify_observers('rows_appended', frame_row, count)
+        else:
+            self._notify_observers('rows_inserted', self._dataframe, frame_row, count)
+            if not origin:
+                self._clear_history()
+        self._row_order.rows_inserted(self._inserting_row, frame_row, count)
+        if self._display_cache is not None:
+            self._display_cache.invalidate_rows(frame_row)
         self.endInsertRows()
-        return True
 
     def removeRows(self, row, count, parent=None):
         """Supprime `count` lignes à partir de `row`."""
-        if row < 0 or row + count > self.rowCount():
+        if count <= 0 or row < 0 or row + count > self.rowCount():
             return False
-        
-        self.beginRemoveRows(parent or QModelIndex(), row, row + count - 1)
-        self._dataframe.drop(self._dataframe.index[row:row+count], inplace=True)
-        self._dataframe.reset_index(drop=True, inplace=True)
-        self.endRemoveRows()
+        return self.remove_row_ranges([(row, row + count - 1)], parent)
+
+    def remove_rows(self, rows, parent=None):
+        """Supprime un ensemble quelconque de lignes (ex: la sélection)."""
+        return self.remove_row_ranges(row_ranges(rows), parent)
+
+    def remove_row_ranges(self, ranges, parent=None):
+        """Supprime des plages de lignes (début, fin incluses) en une seule passe.
+
+        Les plages adjacentes ou qui se chevauchent sont fusionnées, puis une paire
+        beginRemoveRows/endRemoveRows est émise par plage, de la dernière à la
+        première, et la table n'est reconstruite qu'une fois avec un masque booléen.
+        """
+        ranges = merge_ranges(ranges)
+        if not ranges:
+            return False
+        if ranges[0][0] < 0 or ranges[-1][1] >= self.rowCount():
+            return False
+
+        view_keep = np.ones(self.rowCount(), dtype=bool)
+        for first, last in ranges:
+            view_keep[first:last + 1] = False
+        if self._row_order.rows is None:
+            keep = view_keep
+        else:
+            keep = np.ones(self._frame_length(), dtype=bool)
+            keep[self._row_order.rows[~view_keep]] = False
+        self._remove_kept(keep, view_keep)
+        return True
+
+    def _remove_frame_rows(self, frame_positions):
+        """Supprime les lignes `frame_positions` de la table, qu'elles soient affichées ou non (filtre)."""
+        keep = np.ones(self._frame_length(), dtype=bool)
+        keep[frame_positions] = False
+        rows = self._row_order.rows
+        self._remove_kept(keep, keep.copy() if rows is None else keep[rows])
+
+    def _remove_kept(self, keep, view_keep):
+        """Supprime les lignes absentes de `keep` (masque de la table ; `view_keep` : masque de la vue)."""
+        self._flush_changes()  # Les plages modifiées sont exprimées avant décalage des lignes
+        if self._history is not None and not self._history.replaying:
+            removed = np.flatnonzero(~keep)
+            self._history.record(RemoveDelta(removed, self._dataframe.iloc[removed]), "Suppression de lignes")
+        self._store.remove_rows(keep, origin=self, view_keep=view_keep)
+
+    def _store_rows_removing(self, dataframe, keep, view_keep):
+        """Signale à la vue les plages supprimées, de la dernière à la première ; la première reste ouverte.
+
+        La table n'est filtrée qu'après ces signaux, en une passe : entre-temps,
+        la vue lit l'ancienne table à travers `_removal_rows`, dont chaque plage
+        signalée est retirée avant `endRemoveRows`.
+        """
+        rows = self._row_order.rows
+        if view_keep is None:  # Suppression venant d'un autre modèle
+            view_keep = keep.copy() if rows is None else keep[rows]
+        ranges = row_ranges(np.flatnonzero(~view_keep))
+        self._removing = (view_keep, ranges)
+        self._flush_changes()
+        if len(ranges) > 1:
+            self._removal_rows = np.arange(len(dataframe)) if rows is None else rows.copy()
+        for first, last in reversed(ranges[1:]):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._removal_rows = np.delete(self._removal_rows, np.s_[first:last + 1])
+            self.endRemoveRows()
+        if ranges:
+            self.beginRemoveRows(QModelIndex(), ranges[0][0], ranges[0][1])
+        self._notify_observers('rows_removing', dataframe, keep)
+
+    def _store_rows_removed(self, keep, origin):
+        view_keep, ranges = self._removing
+        self._removing = None
+        self._removal_rows = None
+        if not origin:
+            self._clear_history()
+        self._row_order.rows_removed(view_keep, keep)
+        self._notify_observers('rows_removed', keep)
+        if self._display_cache is not None:
+            self._display_cache.invalidate_rows(int(np.argmin(keep)))
+        if ranges:
+            self.endRemoveRows()
+
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Trie les lignes selon une colonne (clic sur l'en-tête) ; `column < 0` annule le tri."""
+        keys = [] if column < 0 else [(column, order == Qt.AscendingOrder)]
+        self.sort_by(keys)
+
+    def sort_by(self, keys):
+        """Trie les lignes selon plusieurs clés [(colonne, croissant), ...], la première étant principale."""
+        self.layoutAboutToBeChanged.emit()
+        old_rows = [self._frame_row(index.row()) for index in self.persistentIndexList()]
+        self._row_order.sort_keys = list(keys)
+        self._row_order.compute(self._dataframe)
+        self._update_persistent_indexes(old_rows)
+        self.layoutChanged.emit()
+
+    def set_filter(self, text, columns=None):
+        """Filtre les lignes dont une des colonnes (toutes par défaut) contient `text`."""
+        self.beginResetModel()
+        self._row_order.filter_text = text
+        self._row_order.filter_columns = columns
+        self._row_order.compute(self._dataframe)
+        self.endResetModel()
+
+    def _update_persistent_indexes(self, old_rows):
+        old_indexes = self.persistentIndexList()
+        rows = self._row_order.rows
+        if rows is None:
+            new_rows = old_rows
+        else:
+            view_rows = np.full(self._frame_length(), -1, dtype=np.int64)
+            view_rows[rows] = np.arange(len(rows))
+            new_rows = view_rows[old_rows].tolist() if old_rows else []
+        new_indexes = [self.index(row, index.column()) if row >= 0 else QModelIndex()
+                       for row, index in zip(new_rows, old_indexes)]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+    def append_rows(self, rows):
+        """Ajoute en fin de table un bloc de lignes (DataFrame) en une seule insertion."""
+        rows = self._conform(rows)
+        count = len(rows)
+        if count == 0:
+            return False
+
+        self._store.insert_rows(self._frame_length(), rows, loaded=True, origin=self, view_row=self.rowCount())
         return True
 
+    def _conform(self, rows):
+        """Aligne un bloc sur les colonnes et, si possible, sur les types de la table."""
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame.from_records(rows, columns=self._frame.columns)
+        rows = rows.reindex(columns=self._frame.columns)
+        for position, (col, dtype) in enumerate(self._frame.dtypes.items()):
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = self._store.add_categories(position, rows[col])  # Sinon les valeurs nouvelles seraient perdues
+            if rows[col].dtype != dtype:
+                try:
+                    rows[col] = rows[col].astype(dtype)
+                except (TypeError, ValueError):
+                    pass  # La concaténation choisira un type commun
+        rows.index = pd.RangeIndex(len(rows))
+        return rows
+
+    def start_streaming(self, interval=100, max_rows=None):
+        """Active le mode flux : les blocs poussés par `push` sont affichés toutes les `interval` ms.
+
+        Avec `max_rows`, seules les `max_rows` lignes les plus récentes sont conservées.
+        """
+        self.max_rows = max_rows
+        if self._stream_timer is None:
+            self._stream_timer = QTimer(self)
+            self._stream_timer.timeout.connect(self.flush_stream)
+        self._stream_timer.start(interval)
+
+    def stop_streaming(self):
+        """Arrête le mode flux après avoir affiché les blocs en attente."""
+        if self._stream_timer is not None:
+            self._stream_timer.stop()
+        self.flush_stream()
+
+    def push(self, rows):
+        """Met en attente un bloc de lignes (DataFrame ou enregistrements) ; utilisable depuis n'importe quel thread."""
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame.from_records(rows, columns=self._frame.columns)
+        self._stream.append(rows)
+
+    def flush_stream(self):
+        """Affiche en une insertion tous les blocs en attente, puis évince les lignes les plus anciennes."""
+        chunks = []
+        while self._stream:
+            chunks.append(self._stream.popleft())
+        if not chunks:
+            return
+
+        rows = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        if self.max_rows is not None and len(rows) > self.max_rows:
+            rows = rows.iloc[-self.max_rows:]
+        self.append_rows(rows)
+        if self.max_rows is not None and self._frame_length() > self.max_rows:
+            self._evict_head(self._frame_length() - self.max_rows)
+
+    def _evict_head(self, count):
+        """Supprime les `count` premières lignes de la table par découpage (sans masque ni copie ligne à ligne)."""
+        self._store.remove_head(count)
+
+    def _store_head_removing(self, dataframe, count):
+        self._clear_history()  # Les positions enregistrées ne sont plus valides
+        if self._row_order.rows is not None:  # Vue triée ou filtrée : suppression par masque
+            keep = np.arange(len(dataframe)) >= count
+            return self._store_rows_removing(dataframe, keep, None)
+        self._flush_changes()
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        self._notify_observers('head_removing', dataframe, count)
+
+    def _store_head_removed(self, count):
+        if self._removing is not None:
+            return self._store_rows_removed(np.arange(self._frame_length() + count) >= count, False)
+        self._notify_observers('head_removed', count)
+        if self._display_cache is not None:
+            self._display_cache.invalidate_rows(0)
+        self.endRemoveRows()
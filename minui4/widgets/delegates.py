@@ -1,10 +1,15 @@
 from PyQt4.QtCore import Qt, QDate, QTime, QDateTime
-from PyQt4.QtGui import QStyledItemDelegate, QDateEdit, QTimeEdit, QDateTimeEdit
+from PyQt4.QtGui import QStyledItemDelegate, QDateEdit, QTimeEdit, QDateTimeEdit, QComboBox, QLineEdit
 
+from .roles import ChoicesRole
+
+
+# Les délégués échangent des valeurs natives (QDate, QTime, QDateTime) avec le modèle
+# via `EditRole`. Une colonne de texte reçoit en retour du texte au même format.
 
 class DateDelegate(QStyledItemDelegate):
     """Délégué pour éditer des dates."""
-    
+
     def createEditor(self, parent, option, index):
         editor = QDateEdit(parent)
         editor.setCalendarPopup(True)  # Permet d'ouvrir un calendrier pour sélectionner une date
@@ -12,36 +17,48 @@ class DateDelegate(QStyledItemDelegate):
         return editor
 
     def setEditorData(self, editor, index):
-        date_str = index.model().data(index, Qt.DisplayRole)
-        if date_str:
-            editor.setDate(QDate.fromString(date_str, "yyyy-MM-dd"))
+        value = index.model().data(index, Qt.EditRole)
+        if isinstance(value, QDateTime):
+            value = value.date()
+        elif isinstance(value, str):
+            value = QDate.fromString(value, "yyyy-MM-dd")
+        if value is not None:
+            editor.setDate(value)
 
     def setModelData(self, editor, model, index):
-        print('called', index, editor.date())
-        model.setData(index, editor.date().toString("yyyy-MM-dd"), Qt.EditRole)
-        print(model._dataframe)
+        if isinstance(model.data(index, Qt.EditRole), str):
+            model.setData(index, editor.date().toString("yyyy-MM-dd"), Qt.EditRole)
+        else:
+            model.setData(index, editor.date(), Qt.EditRole)
 
 
 class TimeDelegate(QStyledItemDelegate):
     """Délégué pour éditer des heures."""
-    
+
     def createEditor(self, parent, option, index):
         editor = QTimeEdit(parent)
         editor.setDisplayFormat("HH:mm:ss")
         return editor
 
     def setEditorData(self, editor, index):
-        time_str = index.model().data(index, Qt.DisplayRole)
-        if time_str:
-            editor.setTime(QTime.fromString(time_str, "HH:mm:ss"))
+        value = index.model().data(index, Qt.EditRole)
+        if isinstance(value, QDateTime):
+            value = value.time()
+        elif isinstance(value, str):
+            value = QTime.fromString(value, "HH:mm:ss")
+        if value is not None:
+            editor.setTime(value)
 
     def setModelData(self, editor, model, index):
-        model.setData(index, editor.time().toString("HH:mm:ss"), Qt.EditRole)
+        if isinstance(model.data(index, Qt.EditRole), str):
+            model.setData(index, editor.time().toString("HH:mm:ss"), Qt.EditRole)
+        else:
+            model.setData(index, editor.time(), Qt.EditRole)
 
 
 class DateTimeDelegate(QStyledItemDelegate):
     """Délégué pour éditer des datetime."""
-    
+
     def createEditor(self, parent, option, index):
         editor = QDateTimeEdit(parent)
         editor.setCalendarPopup(True)
@@ -49,12 +66,56 @@ class DateTimeDelegate(QStyledItemDelegate):
         return editor
 
     def setEditorData(self, editor, index):
-        datetime_str = index.model().data(index, Qt.DisplayRole)
-        if datetime_str:
-            editor.setDateTime(QDateTime.fromString(datetime_str, "yyyy-MM-dd HH:mm:ss"))
+        value = index.model().data(index, Qt.EditRole)
+        if isinstance(value, str):
+            value = QDateTime.fromString(value, "yyyy-MM-dd HH:mm:ss")
+        if value is not None:
+            editor.setDateTime(value)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(model.data(index, Qt.EditRole), str):
+            model.setData(index, editor.dateTime().toString("yyyy-MM-dd HH:mm:ss"), Qt.EditRole)
+        else:
+            model.setData(index, editor.dateTime(), Qt.EditRole)
+
+
+class FloatDelegate(QStyledItemDelegate):
+    """Délégué pour éditer des nombres décimaux en texte, sans perte de précision.
+
+    L'éditeur par défaut de Qt (QDoubleSpinBox) arrondit à deux décimales :
+    la valeur est présentée sous sa forme la plus courte qui se relit à
+    l'identique (`repr`), et le texte saisi est converti par le modèle.
+    """
+
+    def createEditor(self, parent, option, index):
+        return QLineEdit(parent)
+
+    def setEditorData(self, editor, index):
+        value = index.model().data(index, Qt.EditRole)
+        editor.setText("" if value is None else repr(value))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.text(), Qt.EditRole)
+
+
+class CategoryDelegate(QStyledItemDelegate):
+    """Délégué pour éditer une colonne catégorielle : liste des catégories, saisie libre.
+
+    Les choix sont lus dans le type de la colonne (`ChoicesRole`, mis en cache
+    par le modèle) et jamais dans ses cellules ; une valeur saisie hors de la
+    liste ajoute une catégorie.
+    """
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.setEditable(True)
+        editor.setInsertPolicy(QComboBox.NoInsert)
+        editor.addItems(index.model().data(index, ChoicesRole) or [])
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.model().data(index, Qt.EditRole)
+        editor.setEditText("" if value is None else str(value))
 
     def setModelData(self, editor, model, index):
-        print('called', index, editor.date())
-        model.setData(index, editor.dateTime().toString("yyyy-MM-dd HH:mm:ss"), Qt.EditRole)
-        print(model._dataframe)
-        print(model._dataframe.dtypes)
+        model.setData(index, editor.currentText(), Qt.EditRole)
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+def format_values(values):
+    """Formate une série en tableau de chaînes, comme le ferait `str(value)`."""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype):
+        array = values.to_numpy()
+        if dtype.kind in 'biuf':
+            return array.astype(str)
+        if dtype.kind == 'M':
+            # Les Timestamp sans fraction de seconde s'affichent "YYYY-MM-DD HH:MM:SS"
+            seconds = array.astype('datetime64[s]')
+            missing = np.isnat(array)
+            if ((array == seconds) | missing).all():
+                strings = np.char.replace(np.datetime_as_string(seconds, unit='s'), 'T', ' ')
+                return np.where(missing, 'NaT', strings)
+    # Texte, objets et types d'extension : str() élément par élément
+    return values.map(str).to_numpy().astype(str)
+
+
+class DisplayCache(object):
+    """Cache des chaînes affichées, rempli par blocs de lignes et purgé en LRU.
+
+    Chaque entrée correspond à un bloc de `block_size` lignes d'une colonne,
+    formaté en une seule opération vectorisée. Les blocs les moins récemment
+    lus sont évincés dès que la mémoire occupée dépasse `max_bytes`.
+    """
+
+    def __init__(self, block_size=1024, max_bytes=64 * 1024 * 1024):
+        self.block_size = block_size
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._blocks = OrderedDict()  # (colonne, bloc) -> np.ndarray de chaînes
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def get(self, dataframe, row, col):
+        """Retourne le texte affiché pour la cellule (`row`, `col`)."""
+        block, offset = divmod(row, self.block_size)
+        key = (col, block)
+        strings = self._blocks.get(key)
+        if strings is None:
+            strings = self._fill(dataframe, col, block)
+        else:
+            self._blocks.move_to_end(key)
+        return str(strings[offset])
+
+    def prefetch(self, dataframe, rows, columns=None):
+        """Remplit les blocs contenant les lignes `rows` (lignes de la table, ex: celles du viewport)."""
+        if columns is None:
+            columns = range(dataframe.shape[1])
+        for block in np.unique(np.asarray(rows) // self.block_size):
+            for col in columns:
+                if (col, int(block)) not in self._blocks:
+                    self._fill(dataframe, col, int(block))
+
+    def invalidate_cells(self, rows, col):
+        """Invalide les blocs de la colonne `col` contenant les lignes `rows`."""
+        for block in np.unique(np.asarray(rows) // self.block_size):
+            self._discard((col, int(block)))
+
+    def invalidate_rows(self, row):
+        """Invalide tous les blocs à partir de `row` (lignes décalées par insertion ou suppression)."""
+        first_block = row // self.block_size
+        for key in [key for key in self._blocks if key[1] >= first_block]:
+            self._discard(key)
+
+    def clear(self):
+        self._blocks.clear()
+        self.nbytes = 0
+
+    def _fill(self, dataframe, col, block):
+        start = block * self.block_size
+        strings = format_values(dataframe.iloc[start:start + self.block_size, col])
+        self._blocks[(col, block)] = strings
+        self.nbytes += strings.nbytes
+        while self.nbytes > self.max_bytes and len(self._blocks) > 1:
+            _, evicted = self._blocks.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return strings
+
+    def _discard(self, key):
+        strings = self._blocks.pop(key, None)
+        if strings is not None:
+            self.nbytes -= strings.nbytes
@@ -0,0 +1,120 @@
+import os
+
+from PyQt4.QtCore import QThread, pyqtSignal
+
+from .frame_store import FrameSnapshot
+from .loaders import guess_format
+
+
+class ChunkedExporter(QThread):
+    """Écrit un DataFrame en CSV/TSV, Parquet ou Feather par blocs dans un thread de travail.
+
+    Les données sont un cliché (`FrameSnapshot`, voir `DataFrameModel.snapshot`)
+    ou un DataFrame propre à l'export : la table peut être modifiée pendant
+    l'écriture. Le fichier est écrit sous un nom temporaire puis renommé une
+    fois complet ; `cancel` interrompt l'écriture au prochain bloc et supprime
+    le fichier partiel.
+    """
+
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    exported = pyqtSignal(str)  # Chemin du fichier écrit
+
+    def __init__(self, dataframe, path, format=None, chunk_rows=50000, parent=None, **write_options):
+        super(ChunkedExporter, self).__init__(parent)
+        self.dataframe = dataframe
+        self.path = path
+        self.format = format or guess_format(path)
+        self.chunk_rows = chunk_rows
+        self.write_options = write_options
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        partial = self.path + '.part'
+        try:
+            steps = self.write_chunks(partial)
+            try:
+                for done in steps:
+                    if self._cancelled:
+                        break
+                    self.progress.emit(int(done * 100))
+            finally:
+                steps.close()  # Ferme le fichier même interrompu
+            if self._cancelled:
+                os.remove(partial)
+            else:
+                os.replace(partial, self.path)
+                self.exported.emit(self.path)
+        except Exception as error:  # Erreur d'écriture remontée au thread graphique
+            if os.path.exists(partial):
+                os.remove(partial)
+            self.failed.emit(str(error))
+
+    def write_chunks(self, path):
+        """Écrit le fichier bloc par bloc en produisant la fraction écrite après chaque bloc."""
+        if self.format in ('csv', 'tsv'):
+            return self._write_csv(path)
+        if self.format == 'parquet':
+            return self._write_parquet(path)
+        if self.format == 'feather':
+            return self._write_feather(path)
+        raise ValueError("Format d'export non géré : %s" % self.format)
+
+    def _chunks(self):
+        """Blocs de `chunk_rows` lignes (au moins un, éventuellement vide) et fraction écrite."""
+        total = len(self.dataframe)
+        for start in range(0, max(total, 1), self.chunk_rows):
+            stop = min(start + self.chunk_rows, total)
+            yield self._rows(start, stop), stop / total if total else 1.0
+
+    def _rows(self, start, stop):
+        if isinstance(self.dataframe, FrameSnapshot):
+            return self.dataframe.chunk(start, stop)  # Lecture sous le verrou du magasin
+        return self.dataframe.iloc[start:stop]
+
+    def _schema(self):
+        """Types Arrow communs à tous les blocs, déduits de la table (du premier bloc pour un cliché)."""
+        import pyarrow as pa
+
+        sample = self.dataframe
+        if isinstance(sample, FrameSnapshot):
+            sample = sample.chunk(0, self.chunk_rows)
+        return pa.Schema.from_pandas(sample, preserve_index=False)
+
+    def _write_csv(self, path):
+        options = dict(self.write_options)
+        options.setdefault('index', False)
+        if self.format == 'tsv':
+            options.setdefault('sep', '\t')
+        header = options.pop('header', True)
+        with open(path, 'w', newline='', encoding=options.pop('encoding', 'utf-8')) as f:
+            for chunk, done in self._chunks():
+                chunk.to_csv(f, header=header, **options)
+                header = False  # En-tête écrit avec le premier bloc seulement
+                yield done
+
+    def _write_parquet(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self._schema()
+        with pq.ParquetWriter(path, schema, **self.write_options) as writer:
+            for chunk, done in self._chunks():
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                yield done
+
+    def _write_feather(self, path):
+        import pyarrow as pa
+
+        schema = self._schema()
+        options = pa.ipc.IpcWriteOptions(**self.write_options)
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+            for chunk, done in self._chunks():
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                yield done
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from PyQt4.QtGui import QColor
+
+# Rôles de style gérés par la mise en forme conditionnelle -> argument de `FormatRule`
+STYLE_ROLES = {
+    Qt.BackgroundRole: 'background',
+    Qt.ForegroundRole: 'foreground',
+    Qt.FontRole: 'font',
+    Qt.TextAlignmentRole: 'alignment',
+}
+
+
+def greater_than(threshold):
+    return lambda values: pd.to_numeric(values, errors='coerce') > threshold
+
+
+def less_than(threshold):
+    return lambda values: pd.to_numeric(values, errors='coerce') < threshold
+
+
+def between(low, high):
+    return lambda values: pd.to_numeric(values, errors='coerce').between(low, high)
+
+
+def equal_to(value):
+    return lambda values: values == value
+
+
+def is_null():
+    return lambda values: values.isna()
+
+
+def contains(text):
+    return lambda values: values.astype(str).str.contains(text, case=False, regex=False, na=False)
+
+
+def always():
+    return lambda values: np.ones(len(values), dtype=bool)
+
+
+class FormatRule(object):
+    """Règle de mise en forme : colonnes visées, condition vectorisée et style des cellules retenues.
+
+    `condition(série) -> masque booléen` doit être évaluée élément par élément
+    (la valeur d'une cellule ne dépend que d'elle-même), ce qui permet de ne
+    réévaluer que les lignes modifiées. `columns` : noms des colonnes, `None`
+    pour toutes. Les couleurs sont des `QColor` ou des noms de couleur.
+    """
+
+    def __init__(self, condition, columns=None, background=None, foreground=None, font=None, alignment=None):
+        self.condition = condition
+        self.columns = columns
+        self.style = {}
+        for role, value in ((Qt.BackgroundRole, background), (Qt.ForegroundRole, foreground),
+                            (Qt.FontRole, font), (Qt.TextAlignmentRole, alignment)):
+            if value is not None:
+                self.style[role] = QColor(value) if isinstance(value, str) else value
+
+    def applies_to(self, name):
+        return self.columns is None or name in self.columns
+
+
+class ConditionalFormats(object):
+    """Codes de style par colonne, calculés par masques vectorisés et mis en cache.
+
+    Pour chaque colonne, un tableau donne, ligne par ligne de la table, l'indice
+    de la première règle vérifiée (-1 : aucune). `data()` se réduit donc à une
+    lecture dans ce tableau. Les modifications, insertions et suppressions ne
+    réévaluent que les lignes concernées ; les lignes ajoutées en fin de table
+    sont évaluées à la première lecture.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self._codes = {}  # position de colonne -> codes de style par ligne de la table
+
+    def add_rule(self, rule):
+        self.rules.append(rule)
+        self._codes.clear()
+
+    def clear(self):
+        self.rules = []
+        self._codes.clear()
+
+    def invalidate(self):
+        self._codes.clear()
+
+    def codes(self, dataframe, col):
+        """Codes de style de la colonne `col`, évalués au besoin (colonne entière ou lignes ajoutées)."""
+        codes = self._codes.get(col)
+        if codes is None:
+            codes = self._evaluate(dataframe, col, slice(None))
+        elif len(codes) < len(dataframe):
+            codes = np.concatenate([codes, self._evaluate(dataframe, col, slice(len(codes), None))])
+        self._codes[col] = codes
+        return codes
+
+    def style(self, dataframe, col, row, role):
+        """Valeur du rôle `role` pour la cellule (ligne de la table `row`, colonne `col`), ou `None`."""
+        code = self.codes(dataframe, col)[row]
+        if code < 0:
+            return None
+        return self.rules[code].style.get(role)
+
+    def cells_changed(self, dataframe, col, frame_rows):
+        codes = self._codes.get(col)
+        if codes is not None:
+            frame_rows = frame_rows[frame_rows < len(codes)]
+            codes[frame_rows] = self._evaluate(dataframe, col, frame_rows)
+
+    def rows_inserted(self, dataframe, frame_row, count):
+        """Évalue les lignes insérées au milieu de la table ; celles ajoutées en fin le seront à la lecture."""
+        rows = np.arange(frame_row, frame_row + count)
+        for col, codes in self._codes.items():
+            if frame_row < len(codes):
+                self._codes[col] = np.insert(codes, frame_row, self._evaluate(dataframe, col, rows))
+
+    def rows_removed(self, frame_keep):
+        """Retire les lignes supprimées (masque des lignes conservées de la table)."""
+        for col, codes in self._codes.items():
+            self._codes[col] = codes[frame_keep[:len(codes)]]
+
+    def head_removed(self, count):
+        for col, codes in self._codes.items():
+            self._codes[col] = codes[count:]
+
+    def _evaluate(self, dataframe, col, rows):
+        series = dataframe.iloc[rows, col]
+        codes = np.full(len(series), -1, dtype=np.int32)
+        name = dataframe.columns[col]
+        for i in reversed(range(len(self.rules))):  # La première règle vérifiée l'emporte
+            rule = self.rules[i]
+            if rule.applies_to(name):
+                codes[np.asarray(rule.condition(series), dtype=bool)] = i
+        return codes
@@ -0,0 +1,347 @@
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .converters import nullable_dtype
+
+
+def has_missing(values):
+    """Vrai si `values` contient une valeur manquante (jamais pour un tableau numpy d'entiers ou de booléens)."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iub':
+        return False
+    return bool(pd.isna(pd.Series(values, dtype=object)).any())
+
+
+def storage(array):
+    """Tableau numpy contenant les valeurs de `array` (tableau pandas), sans copie, ou `None` s'il n'y en a pas."""
+    if hasattr(array, 'asi8'):  # Dates et durées
+        return array.asi8
+    if isinstance(array, pd.Categorical):
+        return array.codes
+    if isinstance(array, pd.arrays.NumpyExtensionArray) and getattr(array.dtype, 'storage', 'python') == 'python':
+        return np.asarray(array)
+    return None
+
+
+def reserve(array, capacity):
+    """Copie de `array` (tableau pandas non vide) agrandie à `capacity` valeurs, de même type.
+
+    Les valeurs au-delà de `len(array)` (répétition de la première) sont
+    destinées à être écrasées par les lignes ajoutées.
+    """
+    positions = np.zeros(capacity, dtype=np.intp)
+    positions[:len(array)] = np.arange(len(array))
+    return array.take(positions)
+
+
+def column_values(view):
+    """Colonne construite sur `view` sans copie (un tableau numpy d'objets garde le type `object`)."""
+    if type(view) is pd.arrays.NumpyExtensionArray:
+        return pd.Series(view.to_numpy(), dtype=view.dtype.numpy_dtype, copy=False)
+    return view
+
+
+class FrameSnapshot(object):
+    """Cliché d'une partie de la table, copié colonne par colonne seulement quand c'est nécessaire.
+
+    Le cliché lit les valeurs dans la table elle-même. Juste avant qu'une
+    colonne soit modifiée sur place, le magasin copie dans le cliché les
+    valeurs de cette colonne (copie sur écriture) ; les colonnes jamais
+    modifiées ne sont jamais copiées. Les lectures (`chunk`, `to_frame`) sont
+    sûres depuis un autre thread.
+    """
+
+    def __init__(self, store, frame, rows=None, columns=None):
+        self._store = store
+        self._frame = frame  # Table au moment du cliché
+        self._rows = rows  # Lignes de la table retenues (tableau), toutes si None
+        self._positions = list(range(frame.shape[1])) if columns is None else list(columns)
+        self._copies = {}  # position de colonne -> valeurs copiées avant modification de la table
+        self.columns = frame.columns[self._positions]
+
+    def __len__(self):
+        return len(self._frame) if self._rows is None else len(self._rows)
+
+    @property
+    def shape(self):
+        return len(self), len(self._positions)
+
+    def copied_columns(self):
+        """Positions (dans la table) des colonnes déjà copiées."""
+        return sorted(self._copies)
+
+    def chunk(self, start, stop):
+        """Lignes `start` à `stop` (exclue) du cliché, dans un DataFrame indépendant de la table."""
+        rows = slice(start, stop) if self._rows is None else self._rows[start:stop]
+        with self._store._lock:  # Aucune écriture sur place pendant la lecture
+            data = {}
+            for i, col in enumerate(self._positions):
+                copy = self._copies.get(col)
+                if copy is not None:
+                    data[i] = copy.iloc[start:stop].reset_index(drop=True)
+                else:
+                    data[i] = self._frame.iloc[rows, col].copy().reset_index(drop=True)
+        chunk = pd.DataFrame(data, index=pd.RangeIndex(len(range(len(self))[start:stop])))
+        chunk.columns = self.columns
+        return chunk
+
+    def to_frame(self):
+        return self.chunk(0, len(self))
+
+    def _detach(self, col):
+        """Copie la colonne `col` avant sa modification dans la table (verrou du magasin tenu)."""
+        if col in self._copies or col not in self._positions:
+            return
+        rows = slice(None) if self._rows is None else self._rows
+        self._copies[col] = self._frame.iloc[rows, col].copy().reset_index(drop=True)
+
+
+class FrameStore(object):
+    """Table partagée, sans copie, par un ou plusieurs `DataFrameModel`.
+
+    Toutes les modifications passent par le magasin : il les applique une
+    seule fois puis les signale à chaque modèle attaché, qui met à jour sa
+    vue (signaux Qt), son tri, ses caches et ses observateurs.
+
+    Les colonnes de la table sont des vues sur des réserves de capacité
+    supérieure : les lignes ajoutées en fin sont écrites dans la place libre
+    (la capacité double quand elle est atteinte) et les premières lignes
+    supprimées sont simplement sautées. Ni l'ajout ni l'éviction en tête ne
+    recopient la table, sauf quand la réserve est pleine ou qu'une colonne
+    n'en est plus une vue (type modifié, copie par pandas) ; les blocs d'un
+    autre type que la table lui sont concaténés.
+    `snapshot` fournit des clichés en copie sur écriture pour les lectures
+    en arrière-plan (export, agrégats) pendant que l'édition continue.
+    """
+
+    # Capacité minimale des réserves de colonnes, en lignes
+    min_capacity = 1024
+
+    def __init__(self, dataframe=None):
+        self._frame = pd.DataFrame() if dataframe is None else dataframe
+        self._buffers = None  # Réserve de chaque colonne ; la table en est la vue `_start:_start + len`
+        self._views = None  # Vues passées à la table, pour vérifier qu'elle les utilise encore
+        self._start = 0
+        self._models = []  # Références faibles vers les modèles attachés
+        self._snapshots = weakref.WeakSet()  # Clichés partageant encore des colonnes avec la table
+        self._lock = threading.Lock()
+
+    @property
+    def dataframe(self):
+        return self._frame
+
+    def __len__(self):
+        return self._frame.shape[0]
+
+    def capacity(self):
+        """Nombre de lignes que la réserve peut contenir à partir de la première ligne de la table (0 sans réserve)."""
+        return 0 if not self._buffers else len(self._buffers[0]) - self._start
+
+    def _replace(self, dataframe, copied=True):
+        """Remplace la table (hors réserve) ; si c'est une copie, les clichés existants ne la partagent plus."""
+        self._frame = dataframe
+        self._buffers = self._views = None
+        self._start = 0
+        if copied:
+            self._snapshots = weakref.WeakSet()
+
+    def _reserved(self):
+        """Vrai si chaque colonne de la table est encore une vue sur sa réserve.
+
+        Une écriture peut avoir remplacé la colonne (changement de type) ou
+        l'avoir recopiée (pandas copie une colonne partagée avec une autre vue).
+        """
+        if not self._buffers:
+            return False
+        for col, view in enumerate(self._views):
+            array = self._frame.iloc[:, col].array
+            if array is view:
+                continue
+            values = storage(array)
+            if values is None or not np.may_share_memory(values, storage(self._buffers[col])):
+                return False
+        return True
+
+    def _view(self, start, stop):
+        """Table formée des lignes `start:stop` des réserves, sans copie."""
+        self._views = [buffer[start:stop] for buffer in self._buffers]
+        frame = pd.DataFrame({col: column_values(view) for col, view in enumerate(self._views)}, copy=False)
+        frame.columns = self._frame.columns
+        return frame
+
+    def _append(self, block):
+        """Ajoute `block` en fin de table, dans la réserve si ses colonnes et types sont ceux de la table.
+
+        Sinon (ou pour une table sans colonnes) le bloc est concaténé. Retourne
+        vrai si le type des colonnes a changé.
+        """
+        frame = self._frame
+        if not frame.shape[1] or not block.columns.equals(frame.columns) or not block.dtypes.equals(frame.dtypes):
+            self._replace(pd.concat([frame, block], ignore_index=True))
+            return not self._frame.dtypes.equals(frame.dtypes)
+        count, added = len(frame), len(block)
+        if not self._reserved() or self._start + count + added > len(self._buffers[0]):
+            # Nouvelle réserve (capacité doublée), où seules les lignes de la table sont recopiées
+            source = frame if count else block
+            capacity = max(2 * (count + added), self.min_capacity)
+            self._buffers = [reserve(source.iloc[:, col].array, capacity) for col in range(frame.shape[1])]
+            self._start = 0
+        stop = self._start + count + added
+        for col, buffer in enumerate(self._buffers):
+            buffer[stop - added:stop] = block.iloc[:, col].array
+        self._frame = self._view(self._start, stop)
+        return False
+
+    def models(self):
+        """Modèles attachés, dans l'ordre d'attachement."""
+        self._models = [ref for ref in self._models if ref() is not None]
+        return [ref() for ref in self._models]
+
+    def attach(self, model):
+        self._models.append(weakref.ref(model))
+
+    def detach(self, model):
+        self._models = [ref for ref in self._models if ref() is not None and ref() is not model]
+
+    def snapshot(self, frame_rows=None, columns=None):
+        """Cliché des lignes `frame_rows` et des colonnes `columns` (positions), toutes par défaut."""
+        snapshot = FrameSnapshot(self, self.dataframe, frame_rows, columns)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    # Modifications, signalées à chaque modèle attaché (avant et après)
+
+    def set_dataframe(self, dataframe):
+        models = self.models()
+        for model in models:
+            model._store_resetting()
+        self._replace(dataframe)
+        for model in models:
+            model._store_reset()
+
+    def write_cells(self, column, frame_rows, values):
+        """Écrit `values` dans la colonne `column` aux lignes `frame_rows` (tableau), en une affectation.
+
+        Une valeur manquante écrite dans une colonne d'entiers ou de booléens
+        numpy fait d'abord passer la colonne au type nullable (Int64, boolean).
+        """
+        dataframe = self.dataframe
+        dtype = dataframe.dtypes.iloc[column]
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iub' and has_missing(values):
+            self.convert_columns({column: nullable_dtype(dtype)})
+        models = self.models()
+        for model in models:
+            model._store_cells_changing(dataframe, column, frame_rows)
+        dtype = dataframe.dtypes.iloc[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            self.add_categories(column, values)  # Valeurs nouvelles : catégories étendues, pas de passage en `object`
+        with self._lock:
+            for snapshot in list(self._snapshots):
+                snapshot._detach(column)
+            dataframe.iloc[frame_rows, column] = values
+        retyped = dataframe.dtypes.iloc[column] != dtype  # Ex: réels dans une colonne d'entiers
+        for model in models:
+            model._store_cells_changed(dataframe, column, frame_rows, retyped)
+
+    def add_categories(self, column, values):
+        """Ajoute aux catégories de la colonne `column` les valeurs de `values` qu'elles ne contiennent pas.
+
+        Les nouvelles catégories sont ajoutées à la fin : les codes existants ne
+        changent pas. Retourne le type (éventuellement étendu) de la colonne.
+        """
+        dtype = self._frame.dtypes.iloc[column]
+        values = pd.Series(np.asarray(values, dtype=object)).dropna().unique()
+        new = values[~pd.Index(values).isin(dtype.categories)]
+        if not len(new):
+            return dtype
+        with self._lock:
+            for snapshot in list(self._snapshots):
+                snapshot._detach(column)
+            self._frame.isetitem(column, self._frame.iloc[:, column].cat.add_categories(new))
+        for model in self.models():
+            model._store_dtypes_changed()
+        return self._frame.dtypes.iloc[column]
+
+    def convert_columns(self, dtypes):
+        """Convertit des colonnes entières vers un type de même contenu (ex: texte -> catégories).
+
+        `dtypes` : {position de colonne: type}. Seul le stockage change, pas les
+        valeurs affichées ; les modèles oublient ce qui dépend du type.
+        """
+        dataframe = self.dataframe
+        with self._lock:
+            for column, dtype in dtypes.items():
+                for snapshot in list(self._snapshots):
+                    snapshot._detach(column)
+                dataframe.isetitem(column, dataframe.iloc[:, column].astype(dtype))
+        for model in self.models():
+            model._store_columns_converted(list(dtypes))
+
+    def insert_rows(self, frame_row, block, loaded=False, origin=None, view_row=None):
+        """Insère `block` à la ligne `frame_row` de la table.
+
+        `loaded` : lignes lues (chargement, flux) et non saisies. `view_row` :
+        position des lignes dans la vue du modèle `origin` ; les autres modèles
+        les placent à la même position de la table, ou en fin de vue s'ils ont
+        un tri ou un filtre.
+        """
+        count = len(block)
+        at_end = frame_row == len(self)
+        models = self.models()
+        for model in models:
+            model._store_rows_inserting(frame_row, count, view_row if model is origin else None)
+        if at_end:
+            if self._append(block):  # Ajout en fin : écrit dans la réserve, sans copie de la table
+                for model in models:
+                    model._store_dtypes_changed()
+        else:
+            dataframe = self.dataframe
+            self._replace(pd.concat([dataframe.iloc[:frame_row], block, dataframe.iloc[frame_row:]],
+                                    ignore_index=True))
+        for model in models:
+            model._store_rows_inserted(frame_row, block, at_end, loaded, model is origin)
+
+    def remove_rows(self, frame_keep, origin=None, view_keep=None):
+        """Supprime les lignes absentes de `frame_keep` (masque des lignes conservées) en une seule passe."""
+        dataframe = self.dataframe
+        models = self.models()
+        for model in models:
+            model._store_rows_removing(dataframe, frame_keep, view_keep if model is origin else None)
+        self._replace(dataframe.iloc[frame_keep].reset_index(drop=True))
+        for model in models:
+            model._store_rows_removed(frame_keep, model is origin)
+
+    def restore_rows(self, frame_positions, block, origin=None, ranges=None):
+        """Réinsère des lignes supprimées aux positions `frame_positions` de la table."""
+        dataframe = self.dataframe
+        total = len(dataframe) + len(block)
+        restored = np.zeros(total, dtype=bool)
+        restored[frame_positions] = True
+        order = np.empty(total, dtype=np.int64)
+        order[~restored] = np.arange(len(dataframe))
+        order[restored] = len(dataframe) + np.arange(len(block))
+
+        models = self.models()
+        for model in models:
+            model._store_rows_restoring(frame_positions, total, ranges if model is origin else None)
+        self._replace(pd.concat([dataframe, block], ignore_index=True).iloc[order].reset_index(drop=True))
+        for model in models:
+            model._store_rows_restored(frame_positions, model is origin)
+
+    def remove_head(self, count):
+        """Supprime les `count` premières lignes sans copie : début de la vue sur la réserve avancé, ou découpage."""
+        dataframe = self.dataframe
+        models = self.models()
+        for model in models:
+            model._store_head_removing(dataframe, count)
+        if self._reserved():
+            self._start += count
+            self._frame = self._view(self._start, self._start + len(dataframe) - count)
+        else:
+            dataframe = dataframe.iloc[count:]
+            dataframe.index = pd.RangeIndex(len(dataframe))
+            self._replace(dataframe, copied=False)  # Découpage : les colonnes restent partagées
+        for model in models:
+            model._store_head_removed(count)
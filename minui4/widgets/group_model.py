@@ -0,0 +1,221 @@
+import numpy as np
+from PyQt4.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+from .roles import edit_value
+
+
+class GroupNode(object):
+    """Groupe `group` du niveau `level` (-1 : racine) ; `children` est construit à l'ouverture du nœud."""
+
+    def __init__(self, level, group, rows, parent=None, row=0):
+        self.level = level
+        self.group = group
+        self.rows = rows  # Lignes de la table du groupe, croissantes
+        self.parent = parent
+        self.row = row  # Position parmi les groupes frères
+        self.children = None
+
+
+class GroupLevel(object):
+    """Un niveau de regroupement, issu d'un seul passage `groupby` vectorisé.
+
+    `codes` donne le numéro de groupe de chaque ligne de la table ; les lignes
+    de chaque groupe sont les tranches `order[starts[g]:starts[g + 1]]`.
+    `aggregates` contient une ligne par groupe, dans l'ordre des numéros.
+    """
+
+    def __init__(self, dataframe, keys, aggregate_funcs):
+        grouped = dataframe.groupby(keys, sort=True, dropna=False)
+        self.codes = grouped.ngroup().to_numpy()
+        self.order = np.argsort(self.codes, kind='stable')
+        self.starts = np.concatenate([[0], np.cumsum(np.bincount(self.codes, minlength=grouped.ngroups))])
+        self.aggregates = grouped.agg(aggregate_funcs) if aggregate_funcs else None
+        self.keys = grouped.size().index  # Valeurs des clés par groupe (tuples à partir de deux clés)
+
+    def label(self, group):
+        key = self.keys[group]
+        return key[-1] if isinstance(key, tuple) else key
+
+    def rows(self, group):
+        return self.order[self.starts[group]:self.starts[group + 1]]
+
+
+class GroupedDataFrameModel(QAbstractItemModel):
+    """Vue hiérarchique (groupes, puis lignes) d'un `DataFrameModel`, sans copie de la table.
+
+    La première colonne porte le libellé des groupes, les suivantes les
+    colonnes de la table (agrégats pour les groupes). Les enfants d'un groupe
+    ne sont construits qu'à son ouverture. Les modifications des lignes sont
+    écrites dans le modèle source, qui prévient ce modèle : seuls les agrégats
+    des groupes concernés sont recalculés (modifier une clé de regroupement
+    reconstruit les groupes).
+    """
+
+    def __init__(self, source, group_by, aggregates=None, parent=None):
+        super(GroupedDataFrameModel, self).__init__(parent)
+        self.source = source
+        self.group_by = list(group_by)  # Noms des colonnes de regroupement
+        self.aggregates = aggregates  # {nom de colonne: fonction}, somme des colonnes numériques par défaut
+        self.rebuild()
+        source.add_frame_observer(self)
+
+    def close(self):
+        """Détache le modèle du modèle source."""
+        self.source.remove_frame_observer(self)
+
+    def rebuild(self, *args):
+        """Recalcule les groupes (un `groupby` par niveau) ; les nœuds seront reconstruits à l'ouverture."""
+        self.beginResetModel()
+        dataframe = self.source._dataframe
+        if self.aggregates is None:
+            funcs = {name: 'sum' for name, dtype in dataframe.dtypes.items()
+                     if name not in self.group_by and getattr(dtype, 'kind', 'O') in 'iuf'}
+        else:
+            funcs = dict(self.aggregates)
+        self._funcs = funcs
+        self._levels = [GroupLevel(dataframe, self.group_by[:level + 1], funcs)
+                        for level in range(len(self.group_by))]
+        self._root = GroupNode(-1, 0, np.arange(len(dataframe)))
+        self.endResetModel()
+
+    def _children(self, node):
+        """Groupes enfants de `node`, construits au premier accès."""
+        if node.children is None:
+            level = self._levels[node.level + 1]
+            groups = np.unique(level.codes[node.rows])
+            node.children = [GroupNode(node.level + 1, int(group), level.rows(group), node, i)
+                             for i, group in enumerate(groups)]
+        return node.children
+
+    def _is_last_level(self, node):
+        return node.level == len(self._levels) - 1
+
+    def _item(self, index):
+        """(groupe, None) pour un nœud de groupe, (groupe parent, ligne de la table) pour une ligne."""
+        if not index.isValid():
+            return self._root, None
+        parent = index.internalPointer()
+        if self._is_last_level(parent):
+            return parent, int(parent.rows[index.row()])
+        return self._children(parent)[index.row()], None
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        node, frame_row = self._item(parent)
+        return self.createIndex(row, column, node)
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node.parent)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node, frame_row = self._item(parent)
+        return frame_row is None and len(node.rows) > 0  # Sans construire les enfants
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() > 0:
+            return 0
+        node, frame_row = self._item(parent)
+        if frame_row is not None:
+            return 0
+        if self._is_last_level(node):
+            return len(node.rows)
+        return len(self._children(node))
+
+    def columnCount(self, parent=QModelIndex()):
+        return self.source.columnCount() + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return
+        node, frame_row = self._item(index)
+        col = index.column() - 1
+        dataframe = self.source._dataframe
+        if frame_row is not None:
+            if col < 0:
+                return ""
+            value = dataframe.iat[frame_row, col]
+            return str(value) if role == Qt.DisplayRole else edit_value(value)
+
+        level = self._levels[node.level]
+        if col < 0:
+            return "%s (%d)" % (level.label(node.group), len(node.rows))
+        name = dataframe.columns[col]
+        if level.aggregates is None or name not in level.aggregates.columns:
+            return ""
+        return str(level.aggregates[name].iat[node.group])
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole or index.column() == 0:
+            return False
+        node, frame_row = self._item(index)
+        if frame_row is None:
+            return False
+        return self.source.set_frame_value(frame_row, index.column() - 1, value)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsEnabled
+        node, frame_row = self._item(index)
+        if frame_row is not None and index.column() > 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or orientation != Qt.Horizontal:
+            return
+        if section == 0:
+            return " / ".join(str(name) for name in self.group_by)
+        return self.source.headerData(section - 1, orientation, role)
+
+    # Notification du modèle source : une seule reconstruction par opération sur la table,
+    # après modification (les signaux de lignes de Qt arrivent une fois par plage)
+
+    def invalidate(self):
+        self.rebuild()
+
+    def rows_inserted(self, dataframe, frame_row, count):
+        self.rebuild()
+
+    def rows_appended(self, frame_row, count):
+        self.rebuild()
+
+    def rows_loaded(self, frame_row, count):
+        self.rebuild()
+
+    def rows_removed(self, keep):
+        self.rebuild()
+
+    def head_removed(self, count):
+        self.rebuild()
+
+    def cells_changed(self, dataframe, col, frame_rows):
+        name = dataframe.columns[col]
+        if name in self.group_by:
+            self.rebuild()  # Les lignes changent de groupe
+            return
+        changed = []  # Groupes touchés, par niveau
+        for level in self._levels:
+            groups = np.unique(level.codes[frame_rows])
+            if name in self._funcs:
+                column = level.aggregates.columns.get_loc(name)
+                for group in groups:
+                    level.aggregates.iat[group, column] = dataframe.iloc[level.rows(group), col].agg(self._funcs[name])
+            changed.append(set(groups.tolist()))
+        self._emit_changed(self._root, changed)
+
+    def _emit_changed(self, node, changed):
+        """Signale les groupes touchés déjà construits et leurs lignes (les autres seront lus à l'ouverture)."""
+        last = self.columnCount() - 1
+        if self._is_last_level(node):
+            self.dataChanged.emit(self.createIndex(0, 0, node), self.createIndex(len(node.rows) - 1, last, node))
+            return
+        for child in node.children or ():
+            if child.group in changed[child.level]:
+                self.dataChanged.emit(self.createIndex(child.row, 0, node), self.createIndex(child.row, last, node))
+                self._emit_changed(child, changed)
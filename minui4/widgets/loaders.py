@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+from PyQt4.QtCore import QThread, pyqtSignal
+
+
+def guess_format(path):
+    """Déduit le format d'un fichier de son extension."""
+    extension = os.path.splitext(path)[1].lower()
+    return {
+        '.csv': 'csv',
+        '.txt': 'csv',
+        '.tsv': 'tsv',
+        '.parquet': 'parquet',
+        '.pq': 'parquet',
+        '.feather': 'feather',
+        '.xls': 'excel',
+        '.xlsx': 'excel',
+    }.get(extension, 'csv')
+
+
+class ChunkedLoader(QThread):
+    """Lit un fichier CSV/TSV, Parquet ou Excel par blocs dans un thread de travail.
+
+    Chaque bloc est transmis par le signal `chunkLoaded` ; `progress` donne
+    l'avancement en pourcentage. `cancel` interrompt la lecture au prochain bloc.
+    Les fichiers Excel ne pouvant être lus par morceaux, ils sont lus en entier
+    puis transmis par blocs.
+    """
+
+    chunkLoaded = pyqtSignal(object)
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, format=None, chunk_rows=50000, parent=None, **read_options):
+        super(ChunkedLoader, self).__init__(parent)
+        self.path = path
+        self.format = format or guess_format(path)
+        self.chunk_rows = chunk_rows
+        self.read_options = read_options
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        try:
+            for chunk, done in self.iter_chunks():
+                if self._cancelled:
+                    return
+                self.chunkLoaded.emit(chunk)
+                self.progress.emit(int(done * 100))
+        except Exception as error:  # Erreur de lecture remontée au thread graphique
+            self.failed.emit(str(error))
+
+    def iter_chunks(self):
+        """Parcourt les blocs du fichier : (DataFrame, fraction lue)."""
+        if self.format in ('csv', 'tsv'):
+            return self._iter_csv()
+        if self.format == 'parquet':
+            return self._iter_parquet()
+        if self.format == 'excel':
+            return self._iter_excel()
+        raise ValueError("Format de fichier non géré : %s" % self.format)
+
+    def _iter_csv(self):
+        options = dict(self.read_options)
+        if self.format == 'tsv':
+            options.setdefault('sep', '\t')
+        size = max(os.path.getsize(self.path), 1)
+        with open(self.path, 'rb') as f:
+            for chunk in pd.read_csv(f, chunksize=self.chunk_rows, **options):
+                yield chunk, min(f.tell() / size, 1.0)
+
+    def _iter_parquet(self):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(self.path)
+        total = max(parquet_file.metadata.num_rows, 1)
+        done = 0
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_rows):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / total
+
+    def _iter_excel(self):
+        dataframe = pd.read_excel(self.path, **self.read_options)
+        total = max(len(dataframe), 1)
+        for start in range(0, len(dataframe), self.chunk_rows):
+            yield dataframe.iloc[start:start + self.chunk_rows], min((start + self.chunk_rows) / total, 1.0)
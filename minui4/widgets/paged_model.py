@@ -0,0 +1,318 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt, QAbstractTableModel, QModelIndex
+from .converters import default_registry
+from .dataframe_view import InvalidValuesError
+from .roles import RawValueRole, edit_value, python_value
+
+
+class CsvSource(object):
+    """Source CSV paginée grâce à un index des positions (octets) des lignes.
+
+    L'index est construit en une passe sur le fichier, par blocs, sans charger
+    les données. Les champs contenant des retours à la ligne ne sont pas gérés.
+    """
+
+    def __init__(self, path, page_size=50000, block_bytes=16 * 1024 * 1024, **read_options):
+        self.path = path
+        self.page_size = page_size
+        self.block_bytes = block_bytes
+        self.read_options = read_options
+        self._build_index()
+
+    def _build_index(self):
+        offsets = []
+        nrows = 0
+        with open(self.path, 'rb') as f:
+            f.readline()  # En-tête
+            position = f.tell()
+            next_start = position  # Début de la prochaine ligne de données
+            while True:
+                block = f.read(self.block_bytes)
+                if not block:
+                    break
+                starts = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord('\n')) + position + 1
+                line_starts = np.concatenate([[next_start], starts[:-1]]) if len(starts) else starts
+                selected = (np.arange(len(line_starts)) + nrows) % self.page_size == 0
+                offsets.extend(line_starts[selected].tolist())
+                nrows += len(line_starts)
+                if len(starts):
+                    next_start = starts[-1]
+                position += len(block)
+            if next_start < position:  # Dernière ligne sans retour à la ligne
+                if nrows % self.page_size == 0:
+                    offsets.append(next_start)
+                nrows += 1
+
+        self.nrows = nrows
+        self._offsets = offsets
+        self.page_bounds = np.append(np.arange(0, nrows, self.page_size), nrows)
+        head = pd.read_csv(self.path, nrows=min(self.page_size, max(nrows, 1)), **self.read_options)
+        self.columns = head.columns
+        self.dtypes = head.dtypes
+        # Colonnes de texte (`str` sous pandas 3, `object` avant) : même type sur toutes les pages
+        self._text_columns = {col: dtype for col, dtype in head.dtypes.items()
+                              if pd.api.types.is_string_dtype(dtype) or dtype == object}
+
+    def read_page(self, page):
+        with open(self.path, 'rb') as f:
+            f.seek(self._offsets[page])
+            count = self.page_bounds[page + 1] - self.page_bounds[page]
+            frame = pd.read_csv(f, header=None, names=list(self.columns), nrows=count,
+                                dtype=self._text_columns, **self.read_options)
+        frame.index = pd.RangeIndex(self.page_bounds[page], self.page_bounds[page + 1])
+        return frame
+
+    def write(self, path, pages):
+        for i, frame in enumerate(pages):
+            frame.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+    def reload(self):
+        self._build_index()
+
+
+class ParquetSource(object):
+    """Source Parquet dont chaque groupe de lignes (row group) forme une page."""
+
+    def __init__(self, path):
+        self.path = path
+        self.reload()
+
+    def reload(self):
+        import pyarrow.parquet as pq
+
+        self._file = pq.ParquetFile(self.path)
+        sizes = [self._file.metadata.row_group(i).num_rows for i in range(self._file.num_row_groups)]
+        self.page_bounds = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        self.nrows = int(self.page_bounds[-1])
+        schema = self._file.schema_arrow.empty_table().to_pandas()
+        self.columns = schema.columns
+        self.dtypes = schema.dtypes
+
+    def read_page(self, page):
+        frame = self._file.read_row_group(page).to_pandas()
+        frame.index = pd.RangeIndex(self.page_bounds[page], self.page_bounds[page + 1])
+        return frame
+
+    def write(self, path, pages):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for frame in pages:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class HDFSource(object):
+    """Source HDF5 (format `table`) lue par tranches de `page_size` lignes."""
+
+    def __init__(self, path, key, page_size=50000):
+        self.path = path
+        self.key = key
+        self.page_size = page_size
+        self.reload()
+
+    def reload(self):
+        with pd.HDFStore(self.path, mode='r') as store:
+            self.nrows = store.get_storer(self.key).nrows
+            head = store.select(self.key, start=0, stop=1)
+        self.page_bounds = np.append(np.arange(0, self.nrows, self.page_size), self.nrows)
+        self.columns = head.columns
+        self.dtypes = head.dtypes
+
+    def read_page(self, page):
+        start, stop = self.page_bounds[page], self.page_bounds[page + 1]
+        with pd.HDFStore(self.path, mode='r') as store:
+            frame = store.select(self.key, start=start, stop=stop)
+        frame.index = pd.RangeIndex(start, stop)
+        return frame
+
+    def write(self, path, pages):
+        with pd.HDFStore(path, mode='w') as store:
+            for frame in pages:
+                store.append(self.key, frame, index=False)
+
+
+class PagedDataFrameModel(QAbstractTableModel):
+    """Modèle de table lisant les lignes à la demande depuis une source paginée.
+
+    Seules `max_pages` pages sont gardées en mémoire (LRU). Les lignes sont
+    exposées progressivement à la vue via `canFetchMore`/`fetchMore`. Les
+    modifications sont conservées dans un calque (overlay) jusqu'à `flush`.
+    """
+
+    def __init__(self, source, parent=None, max_pages=8):
+        super().__init__(parent)
+        self._source = source
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._overlay = {}  # (ligne, colonne) -> valeur modifiée
+        self._converters = [default_registry.converter_for(dtype) for dtype in source.dtypes]
+        self._fetched_rows = self._page_rows(0)
+
+    def _page_rows(self, page):
+        bounds = self._source.page_bounds
+        return int(bounds[min(page + 1, len(bounds) - 1)])
+
+    def _page_of(self, row):
+        return int(np.searchsorted(self._source.page_bounds, row, side='right')) - 1
+
+    def page(self, page):
+        """Retourne la page `page` (chargée au besoin)."""
+        frame = self._pages.get(page)
+        if frame is None:
+            frame = self._source.read_page(page)
+            self._pages[page] = frame
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page)
+        return frame
+
+    def sample_frame(self):
+        """DataFrame utilisé pour détecter le type des colonnes."""
+        return self.page(0) if self._source.nrows else pd.DataFrame(columns=self._source.columns)
+
+    def value(self, row, col):
+        if (row, col) in self._overlay:
+            return self._overlay[(row, col)]
+        frame = self.page(self._page_of(row))
+        return frame.iat[row - frame.index[0], col]
+
+    def rowCount(self, parent=None):
+        return self._fetched_rows
+
+    def columnCount(self, parent=None):
+        return len(self._source.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return self._fetched_rows < self._source.nrows
+
+    def fetchMore(self, parent=QModelIndex()):
+        first = self._fetched_rows
+        last = self._page_rows(self._page_of(first))
+        self.beginInsertRows(QModelIndex(), first, last - 1)
+        self._fetched_rows = last
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return
+
+        if role == Qt.DisplayRole:
+            return str(self.value(index.row(), index.column()))
+        if role == Qt.EditRole:
+            return edit_value(self.value(index.row(), index.column()))
+        if role == RawValueRole:
+            return self.value(index.row(), index.column())
+        return
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+
+        converted_value, valid = self._converters[index.column()].convert(python_value(value))
+        if not valid:
+            return False
+        self._overlay[(index.row(), index.column())] = converted_value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def get_block(self, top, left, bottom, right):
+        """Retourne les valeurs du rectangle de cellules (bornes incluses), modifications du calque comprises."""
+        parts = []
+        for page in range(self._page_of(top), self._page_of(bottom) + 1):
+            frame = self.page(page)
+            first = frame.index[0]
+            parts.append(frame.iloc[max(top - first, 0):bottom + 1 - first, left:right + 1])
+        block = pd.concat(parts) if len(parts) > 1 else parts[0].copy()
+        for (row, col), value in self._overlay.items():
+            if top <= row <= bottom and left <= col <= right:
+                block.iat[row - top, col - left] = value
+        return block
+
+    def set_block(self, row, column, values):
+        """Écrit un bloc rectangulaire de textes à partir de la cellule (`row`, `column`) dans le calque.
+
+        Comme `DataFrameModel.set_block` : conversion vectorisée par colonne et
+        `InvalidValuesError` si des valeurs sont invalides (rien n'est écrit).
+        Le fichier n'est pas agrandi : les lignes et colonnes au-delà des
+        dernières sont ignorées.
+        """
+        block = values if isinstance(values, pd.DataFrame) else pd.DataFrame(values)
+        nrows = min(block.shape[0], self._source.nrows - row)
+        ncols = min(block.shape[1], self.columnCount() - column)
+        if nrows <= 0 or ncols <= 0:
+            return False
+
+        converted, invalid = [], []
+        for j in range(ncols):
+            column_values, bad = self._converters[column + j].convert_array(block.iloc[:nrows, j])
+            converted.append(column_values)
+            invalid.extend((row + i, column + j, block.iat[i, j]) for i in np.flatnonzero(bad))
+        if invalid:
+            raise InvalidValuesError(invalid)
+
+        for j, column_values in enumerate(converted):
+            for i, value in enumerate(column_values):
+                self._overlay[(row + i, column + j)] = value
+        self.dataChanged.emit(self.index(row, column), self.index(row + nrows - 1, column + ncols - 1))
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return
+
+        if orientation == Qt.Horizontal:
+            return self._source.columns[section]
+        elif orientation == Qt.Vertical:
+            return str(section)
+        return
+
+    def flags(self, index):
+        """Permet l'édition des cellules."""
+        if not index.isValid():
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def is_dirty(self):
+        return bool(self._overlay)
+
+    def iter_pages(self):
+        """Parcourt toutes les pages avec les modifications du calque appliquées."""
+        edits_by_page = {}
+        for (row, col), value in self._overlay.items():
+            edits_by_page.setdefault(self._page_of(row), []).append((row, col, value))
+
+        for page in range(len(self._source.page_bounds) - 1):
+            frame = self._source.read_page(page)
+            if page in edits_by_page:
+                frame = frame.copy()
+                for row, col, value in edits_by_page[page]:
+                    frame.iat[row - frame.index[0], col] = value
+            yield frame
+
+    def flush(self, path=None):
+        """Écrit les modifications, dans `path` ou à la place du fichier source."""
+        target = path or self._source.path
+        temporary = target + '.tmp'
+        self._source.write(temporary, self.iter_pages())
+        os.replace(temporary, target)
+        if path is None:
+            self.beginResetModel()
+            self._overlay.clear()
+            self._pages.clear()
+            self._source.reload()
+            self._converters = [default_registry.converter_for(dtype) for dtype in self._source.dtypes]
+            self._fetched_rows = min(max(self._fetched_rows, self._page_rows(0)), self._source.nrows)
+            self.endResetModel()
@@ -0,0 +1,191 @@
+import logging
+import time
+from collections import Counter, defaultdict, deque
+
+import numpy as np
+from PyQt4.QtCore import Qt, QObject, QEvent, QTimer
+
+logger = logging.getLogger(__name__)
+
+# Noms lisibles des rôles les plus courants
+ROLE_NAMES = {
+    Qt.DisplayRole: 'DisplayRole',
+    Qt.DecorationRole: 'DecorationRole',
+    Qt.EditRole: 'EditRole',
+    Qt.ToolTipRole: 'ToolTipRole',
+    Qt.StatusTipRole: 'StatusTipRole',
+    Qt.WhatsThisRole: 'WhatsThisRole',
+    Qt.SizeHintRole: 'SizeHintRole',
+    Qt.FontRole: 'FontRole',
+    Qt.TextAlignmentRole: 'TextAlignmentRole',
+    Qt.BackgroundRole: 'BackgroundRole',
+    Qt.ForegroundRole: 'ForegroundRole',
+    Qt.CheckStateRole: 'CheckStateRole',
+    Qt.UserRole: 'UserRole',
+}
+
+# Méthodes instrumentées : nom -> position de l'argument `role` (None si absent) et rôle par défaut
+MODEL_METHODS = {
+    'data': (1, Qt.DisplayRole),
+    'headerData': (2, Qt.DisplayRole),
+    'setData': (2, Qt.EditRole),
+    'flags': (None, None),
+    'rowCount': (None, None),
+    'columnCount': (None, None),
+}
+DELEGATE_METHODS = {
+    'paint': (None, None),
+    'sizeHint': (None, None),
+    'createEditor': (None, None),
+    'setEditorData': (None, None),
+    'setModelData': (None, None),
+}
+
+
+class CallStats(object):
+    """Statistiques d'appels : nombres par méthode et par rôle, durées cumulées et percentiles.
+
+    Seules les `max_samples` dernières durées de chaque méthode sont gardées
+    pour les percentiles. Le nombre de cellules lues (DisplayRole) entre deux
+    rafraîchissements de la vue donne les cellules par rafraîchissement.
+    """
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.reset()
+
+    def reset(self):
+        self.counts = Counter()  # méthode -> appels
+        self.role_counts = Counter()  # (méthode, rôle) -> appels
+        self.total_time = defaultdict(float)  # méthode -> secondes
+        self._samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self.repaint_cells = deque(maxlen=self.max_samples)
+        self._cells = None  # Cellules lues depuis le dernier rafraîchissement (None : aucun en cours)
+
+    def record(self, method, role, seconds):
+        self.counts[method] += 1
+        self.total_time[method] += seconds
+        self._samples[method].append(seconds)
+        if role is not None:
+            self.role_counts[(method, role)] += 1
+            if method == 'data' and role == Qt.DisplayRole and self._cells is not None:
+                self._cells += 1
+
+    def repaint_started(self):
+        """Clôt le rafraîchissement précédent et en commence un nouveau."""
+        if self._cells is not None:
+            self.repaint_cells.append(self._cells)
+        self._cells = 0
+
+    def percentile(self, method, q):
+        samples = self._samples.get(method)
+        return float(np.percentile(samples, q)) if samples else 0.0
+
+    def summary(self):
+        """Dictionnaire des statistiques par méthode, plus les cellules par rafraîchissement."""
+        methods = {}
+        for method, calls in self.counts.items():
+            methods[method] = {
+                'calls': calls,
+                'total': self.total_time[method],
+                'mean': self.total_time[method] / calls,
+                'p50': self.percentile(method, 50),
+                'p95': self.percentile(method, 95),
+                'p99': self.percentile(method, 99),
+                'roles': {ROLE_NAMES.get(role, role): count
+                          for (name, role), count in self.role_counts.items() if name == method},
+            }
+        cells = np.array(self.repaint_cells)
+        repaints = {'count': len(cells), 'mean': float(cells.mean()) if len(cells) else 0.0,
+                    'max': int(cells.max()) if len(cells) else 0}
+        return {'methods': methods, 'cells_per_repaint': repaints}
+
+    def format(self):
+        """Rapport texte, méthodes les plus coûteuses en premier."""
+        summary = self.summary()
+        lines = ["%-28s %9s %10s %10s %10s" % ("méthode", "appels", "total (s)", "p50 (µs)", "p99 (µs)")]
+        for method, stats in sorted(summary['methods'].items(), key=lambda item: -item[1]['total']):
+            lines.append("%-28s %9d %10.4f %10.1f %10.1f" % (method, stats['calls'], stats['total'],
+                                                           stats['p50'] * 1e6, stats['p99'] * 1e6))
+            for role, count in sorted(stats['roles'].items(), key=lambda item: -item[1]):
+                lines.append("    %-24s %9d" % (role, count))
+        repaints = summary['cells_per_repaint']
+        lines.append("cellules par rafraîchissement : %.1f en moyenne, %d au plus (%d rafraîchissements)"
+                     % (repaints['mean'], repaints['max'], repaints['count']))
+        return "\n".join(lines)
+
+
+def _timed(stats, name, method, role_position, default_role):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            role = None
+            if role_position is not None:
+                role = args[role_position] if len(args) > role_position else kwargs.get('role', default_role)
+            stats.record(name, role, time.perf_counter() - start)
+    return wrapper
+
+
+class Profiler(QObject):
+    """Instrumente un modèle et, si une vue est fournie, ses délégués et ses rafraîchissements.
+
+    Les méthodes sont remplacées sur les instances seulement pendant la mesure
+    (`start`/`stop`) : sans profilage, aucun coût n'est ajouté. Avec `interval`
+    (ms), `callback(stats)` est appelé périodiquement ; par défaut le rapport
+    est écrit dans le journal `logging` du module.
+    """
+
+    def __init__(self, model, view=None, stats=None, interval=None, callback=None, parent=None):
+        super(Profiler, self).__init__(parent)
+        self.model = model
+        self.view = view
+        self.stats = stats if stats is not None else CallStats()
+        self.callback = callback or (lambda stats: logger.info("\n%s", stats.format()))
+        self._patched = []  # Objets dont des méthodes ont été remplacées
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.report)
+        if interval:
+            self._timer.setInterval(interval)
+
+    def is_active(self):
+        return bool(self._patched)
+
+    def start(self):
+        if self.is_active():
+            return
+        self._patch(self.model, MODEL_METHODS, '')
+        if self.view is not None:
+            delegates = {self.view.itemDelegate()}
+            delegates.update(self.view.itemDelegateForColumn(col) for col in range(self.model.columnCount()))
+            for delegate in delegates - {None}:
+                self._patch(delegate, DELEGATE_METHODS, type(delegate).__name__ + '.')
+            self.view.viewport().installEventFilter(self)
+        if self._timer.interval():
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        if self.view is not None:
+            self.view.viewport().removeEventFilter(self)
+        for target, names in self._patched:
+            for name in names:
+                delattr(target, name)  # Retour à la méthode de la classe
+        self._patched = []
+
+    def report(self):
+        self.callback(self.stats)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            self.stats.repaint_started()
+        return False
+
+    def _patch(self, target, methods, prefix):
+        names = []
+        for name, (role_position, default_role) in methods.items():
+            method = getattr(target, name)
+            setattr(target, name, _timed(self.stats, prefix + name, method, role_position, default_role))
+            names.append(name)
+        self._patched.append((target, names))
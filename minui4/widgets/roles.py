@@ -0,0 +1,62 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt, QDate, QTime, QDateTime
+
+# Rôles propres aux modèles de table : valeur brute (telle que stockée), clé de tri entière
+# et choix proposés à la saisie (libellés des catégories d'une colonne catégorielle)
+RawValueRole = Qt.UserRole
+SortKeyRole = Qt.UserRole + 1
+ChoicesRole = Qt.UserRole + 2
+
+
+def to_qdate(value):
+    return QDate(value.year, value.month, value.day)
+
+
+def to_qtime(value):
+    return QTime(value.hour, value.minute, value.second, value.microsecond // 1000)
+
+
+def to_qdatetime(value):
+    return QDateTime(to_qdate(value), to_qtime(value))
+
+
+def edit_value(value):
+    """Valeur typée servie pour `EditRole` : nombre Python, QDate/QTime/QDateTime, texte ou `None`.
+
+    Les dates sont construites à partir de leurs champs, sans passer par du texte.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else float(value)
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+        if value is pd.NaT:
+            return None
+    if isinstance(value, datetime.datetime):  # Y compris pd.Timestamp
+        return to_qdatetime(value)
+    if isinstance(value, datetime.date):
+        return to_qdate(value)
+    if isinstance(value, datetime.time):
+        return to_qtime(value)
+    return str(value)  # Durées, catégories, objets
+
+
+def python_value(value):
+    """Convertit une valeur Qt reçue par `setData` (QDate, QTime, QDateTime) en valeur Python."""
+    if isinstance(value, QDateTime):
+        return value.toPyDateTime()
+    if isinstance(value, QDate):
+        return value.toPyDate()
+    if isinstance(value, QTime):
+        return value.toPyTime()
+    return value
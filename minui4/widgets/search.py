@@ -0,0 +1,237 @@
+import re
+
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import QObject, QTimer, pyqtSignal
+from PyQt4.QtGui import QColor
+
+from .display_cache import format_values
+
+
+class CellSearch(QObject):
+    """Recherche incrémentale des cellules d'un `DataFrameModel`.
+
+    Chaque colonne est examinée par opérations vectorisées sur le texte affiché
+    ('text' : sous-chaîne sans casse, 'regex') ou sur les valeurs ('number' :
+    égalité numérique). Le résultat est un masque booléen par colonne (lignes de
+    la table) ; lorsqu'une saisie prolonge la précédente, seules les cellules
+    déjà trouvées sont réexaminées. Au-delà de `chunk_rows` cellules, l'examen
+    se fait par tranches entre deux événements Qt et peut être interrompu
+    (`cancel`). Le modèle tient les masques à jour lors des modifications,
+    insertions et suppressions de lignes.
+    """
+
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(int)  # Nombre de cellules trouvées
+
+    modes = ('text', 'regex', 'number')
+
+    def __init__(self, model, chunk_rows=200000, parent=None):
+        super(CellSearch, self).__init__(parent)
+        self.model = model
+        self.chunk_rows = chunk_rows
+        self.highlight = QColor('#fff59d')
+        self.text = ''
+        self.mode = 'text'
+        self.columns = None  # Positions des colonnes examinées (toutes par défaut)
+        self._masks = {}  # position de colonne -> cellules trouvées (lignes de la table)
+        self._steps = None  # Examen en cours (générateur), voir `_scan`
+        self._complete = False  # Le dernier examen est allé à son terme
+        self._keys = None  # Cellules trouvées dans l'ordre de la vue (ligne * colonnes + colonne)
+        self._keys_rows = None  # Permutation de la vue pour laquelle `_keys` a été calculé
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def find(self, text, mode='text', columns=None):
+        """Lance la recherche de `text` ; retourne `True` si le résultat est déjà complet."""
+        if mode not in self.modes:
+            raise ValueError("Mode de recherche inconnu : %r" % (mode,))
+        narrow = (mode == 'text' and self.mode == 'text' and columns == self.columns and self.text
+                  and self._complete and text.lower().find(self.text.lower()) >= 0)
+        self.cancel()
+        self._complete = False
+        self.text, self.mode, self.columns = text, mode, columns
+        self._keys = None
+        if not text:
+            self._masks = {}
+            self._complete = True
+            self.finished.emit(0)
+            return True
+
+        dataframe = self.model._dataframe
+        if narrow:
+            candidates = {col: np.flatnonzero(mask) for col, mask in self._masks.items()}
+        else:
+            cols = range(dataframe.shape[1]) if columns is None else columns
+            candidates = {col: None for col in cols}
+        self._masks = {col: np.zeros(len(dataframe), dtype=bool) for col in candidates}
+        self._steps = self._scan(candidates)
+        total = sum(len(dataframe) if rows is None else len(rows) for rows in candidates.values())
+        if total <= self.chunk_rows:
+            self.wait()
+            return True
+        self._timer.start()
+        return False
+
+    def cancel(self):
+        """Interrompt l'examen en cours ; les cellules déjà trouvées restent signalées."""
+        self._timer.stop()
+        self._steps = None
+
+    def is_scanning(self):
+        return self._steps is not None
+
+    def wait(self):
+        """Termine l'examen en cours sans rendre la main à la boucle d'événements."""
+        while self._steps is not None:
+            self._step()
+
+    def count(self):
+        return len(self._sorted_keys())
+
+    def is_match(self, dataframe, col, row):
+        mask = self._masks.get(col)
+        if mask is None:
+            return False
+        if len(mask) < len(dataframe):
+            mask = self._extend(dataframe, col)
+        return bool(mask[row])
+
+    def matches(self):
+        """Cellules trouvées (ligne de la vue, colonne), dans l'ordre de lecture."""
+        keys = self._sorted_keys()
+        ncols = max(self.model.columnCount(), 1)
+        return list(zip((keys // ncols).tolist(), (keys % ncols).tolist()))
+
+    def next_match(self, row, col):
+        """Cellule trouvée suivant (`row`, `col`) dans la vue, en revenant au début ; `None` si aucune."""
+        keys = self._sorted_keys()
+        if not len(keys):
+            return None
+        ncols = max(self.model.columnCount(), 1)
+        i = np.searchsorted(keys, row * ncols + col, side='right') % len(keys)
+        return divmod(int(keys[i]), ncols)
+
+    def previous_match(self, row, col):
+        keys = self._sorted_keys()
+        if not len(keys):
+            return None
+        ncols = max(self.model.columnCount(), 1)
+        i = (np.searchsorted(keys, row * ncols + col, side='left') - 1) % len(keys)
+        return divmod(int(keys[i]), ncols)
+
+    # Mise à jour par le modèle (mêmes notifications que `ConditionalFormats`)
+
+    def invalidate(self):
+        """Reprend la recherche sur toute la table."""
+        text, self.text = self.text, ''
+        if text:
+            self.find(text, self.mode, self.columns)
+
+    def cells_changed(self, dataframe, col, frame_rows):
+        mask = self._masks.get(col)
+        if mask is not None:
+            frame_rows = frame_rows[frame_rows < len(mask)]
+            mask[frame_rows] = self._evaluate(dataframe.iloc[frame_rows, col])
+            self._keys = None
+
+    def rows_inserted(self, dataframe, frame_row, count):
+        if self.is_scanning():
+            return self.invalidate()  # Positions de l'examen en cours décalées : reprise
+        rows = np.arange(frame_row, frame_row + count)
+        for col, mask in self._masks.items():
+            if frame_row < len(mask):
+                self._masks[col] = np.insert(mask, frame_row, self._evaluate(dataframe.iloc[rows, col]))
+        self._keys = None
+
+    def rows_removed(self, frame_keep):
+        if self.is_scanning():
+            return self.invalidate()
+        for col, mask in self._masks.items():
+            self._masks[col] = mask[frame_keep[:len(mask)]]
+        self._keys = None
+
+    def head_removed(self, count):
+        if self.is_scanning():
+            return self.invalidate()
+        for col, mask in self._masks.items():
+            self._masks[col] = mask[count:]
+        self._keys = None
+
+    def _scan(self, candidates):
+        """Examine les colonnes par tranches de `chunk_rows` lignes (une tranche par étape)."""
+        dataframe = self.model._dataframe
+        total = max(sum(len(dataframe) if rows is None else len(rows) for rows in candidates.values()), 1)
+        done = 0
+        for col, rows in candidates.items():
+            count = len(dataframe) if rows is None else len(rows)
+            for start in range(0, count, self.chunk_rows):
+                chunk = (np.arange(start, min(start + self.chunk_rows, count)) if rows is None
+                         else rows[start:start + self.chunk_rows])
+                values = self.model._dataframe.iloc[chunk, col]  # Table courante (modifiée entre deux étapes)
+                self._masks[col][chunk] = self._evaluate(values)
+                done += len(chunk)
+                self._keys = None
+                yield int(done * 100 / total)
+
+    def _step(self):
+        try:
+            self.progress.emit(next(self._steps))
+        except StopIteration:
+            self.cancel()
+            self._complete = True
+            self.finished.emit(self.count())
+
+    def _extend(self, dataframe, col):
+        """Examine les lignes ajoutées en fin de table depuis le dernier examen."""
+        mask = self._masks[col]
+        tail = self._evaluate(dataframe.iloc[len(mask):, col])
+        self._masks[col] = mask = np.concatenate([mask, tail])
+        self._keys = None
+        return mask
+
+    def _evaluate(self, values):
+        """Masque des valeurs de `values` (Series) correspondant à la recherche."""
+        if not len(values):
+            return np.zeros(0, dtype=bool)
+        if self.mode == 'number':
+            try:
+                number = float(self.text)
+            except ValueError:
+                return np.zeros(len(values), dtype=bool)
+            return (pd.to_numeric(values, errors='coerce') == number).to_numpy(dtype=bool)
+
+        texts = format_values(values)
+        if self.mode == 'regex':
+            try:
+                pattern = re.compile(self.text, re.IGNORECASE)
+            except re.error:
+                return np.zeros(len(values), dtype=bool)  # Expression en cours de saisie
+            return pd.Series(texts).str.contains(pattern, na=False).to_numpy(dtype=bool)
+        return np.char.find(np.char.lower(texts), self.text.lower()) >= 0
+
+    def _sorted_keys(self):
+        """Clés triées des cellules trouvées, recalculées si les masques ou l'ordre de la vue ont changé."""
+        dataframe = self.model._dataframe
+        for col, mask in list(self._masks.items()):
+            if len(mask) < len(dataframe):
+                self._extend(dataframe, col)
+        view_rows = self.model._row_order.rows
+        if self._keys is not None and self._keys_rows is view_rows:
+            return self._keys
+
+        ncols = max(dataframe.shape[1], 1)
+        if view_rows is not None:
+            positions = np.full(len(dataframe), -1, dtype=np.int64)
+            positions[view_rows] = np.arange(len(view_rows))
+        keys = []
+        for col, mask in self._masks.items():
+            rows = np.flatnonzero(mask)
+            if view_rows is not None:
+                rows = positions[rows]
+                rows = rows[rows >= 0]  # Lignes masquées par le filtre
+            keys.append(rows * ncols + col)
+        self._keys = np.sort(np.concatenate(keys)) if keys else np.zeros(0, dtype=np.int64)
+        self._keys_rows = view_rows
+        return self._keys
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+
+def sort_codes(series, ascending=True):
+    """Retourne des codes entiers dont l'ordre est celui du tri de `series` (valeurs manquantes en dernier)."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Seules les catégories sont classées (ordre déclaré, sinon celui des valeurs) ;
+        # chaque cellule reçoit le rang de sa catégorie, le code -1 (manquant) le dernier rang
+        count = len(dtype.categories)
+        ranks = np.arange(count) if dtype.ordered else sort_codes(pd.Series(dtype.categories))
+        if not ascending:
+            ranks = count - 1 - ranks
+        return np.append(ranks, count)[series.cat.codes.to_numpy()]
+    try:
+        codes, uniques = pd.factorize(series, sort=True)
+    except TypeError:  # Objets non comparables entre eux : tri sur le texte
+        codes, uniques = pd.factorize(series.astype(str), sort=True)
+    missing = codes < 0
+    if not ascending:
+        codes = len(uniques) - 1 - codes
+    codes[missing] = len(uniques)
+    return codes
+
+
+class RowOrder(object):
+    """Permutation des lignes affichées (vue -> table) issue du filtre et du tri.
+
+    Le filtre et le tri sont calculés sur des colonnes entières (masques booléens,
+    `np.lexsort` stable multi-clés) ; seule la permutation `rows` est conservée,
+    la table n'est jamais copiée ni réordonnée. `rows` vaut `None` tant qu'aucun
+    tri ni filtre n'est actif.
+    """
+
+    def __init__(self):
+        self.sort_keys = []  # [(position de colonne, croissant)], clé principale en premier
+        self.filter_text = ''
+        self.filter_columns = None
+        self.rows = None
+        self._codes = {}  # (colonne, croissant) -> codes de tri
+
+    def is_active(self):
+        return bool(self.sort_keys or self.filter_text)
+
+    def compute(self, dataframe):
+        """Recalcule la permutation ; seul l'index est reconstruit."""
+        if not self.is_active():
+            self.rows = None
+            return
+
+        mask = self._filter_mask(dataframe)
+        rows = np.arange(len(dataframe)) if mask is None else np.flatnonzero(mask)
+        if self.sort_keys:
+            keys = [self.column_codes(dataframe, col, ascending)[rows] for col, ascending in reversed(self.sort_keys)]
+            rows = rows[np.lexsort(keys)]
+        self.rows = rows
+
+    def _filter_mask(self, dataframe):
+        if not self.filter_text:
+            return None
+        columns = range(dataframe.shape[1]) if self.filter_columns is None else self.filter_columns
+        mask = np.zeros(len(dataframe), dtype=bool)
+        for col in columns:
+            texts = dataframe.iloc[:, col].astype(str)
+            mask |= texts.str.contains(self.filter_text, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        return mask
+
+    def column_codes(self, dataframe, col, ascending=True):
+        """Codes de tri (mis en cache) de la colonne `col`."""
+        key = (col, ascending)
+        if key not in self._codes:
+            self._codes[key] = sort_codes(dataframe.iloc[:, col], ascending)
+        return self._codes[key]
+
+    def invalidate(self):
+        """Oublie les codes de tri de toutes les colonnes."""
+        self._codes.clear()
+
+    def invalidate_column(self, col):
+        """Oublie les codes de tri d'une colonne modifiée."""
+        self._codes.pop((col, True), None)
+        self._codes.pop((col, False), None)
+
+    def rows_inserted(self, view_row, frame_row, count):
+        """Insère dans la permutation `count` nouvelles lignes de la table à la position `view_row`."""
+        self._codes.clear()
+        if self.rows is not None:
+            rows = np.where(self.rows >= frame_row, self.rows + count, self.rows)  # Lignes suivantes décalées
+            self.rows = np.insert(rows, view_row, np.arange(frame_row, frame_row + count))
+
+    def rows_removed(self, view_keep, frame_keep):
+        """Met à jour la permutation après suppression (masques des lignes conservées)."""
+        self._codes.clear()
+        if self.rows is not None:
+            new_positions = np.cumsum(frame_keep) - 1
+            self.rows = new_positions[self.rows[view_keep]]
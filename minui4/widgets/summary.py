@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt, QAbstractTableModel
+
+AGGREGATES = ('sum', 'mean', 'min', 'max', 'count', 'nulls')
+
+
+def _scalar(value):
+    """Valeur Python d'un scalaire numpy/pandas ; `None` pour une valeur manquante."""
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ColumnSummary(object):
+    """Agrégats d'une colonne tenus à jour par ajout et retrait de valeurs.
+
+    La somme, le nombre de valeurs et de valeurs manquantes (donc la moyenne)
+    s'obtiennent directement des deltas. Le minimum et le maximum ne sont
+    recalculés sur la colonne entière que lorsqu'une valeur retirée pouvait
+    être l'un d'eux.
+    """
+
+    def __init__(self, dtype):
+        kind = dtype.kind if isinstance(dtype, np.dtype) else getattr(dtype, 'kind', 'O')
+        self.numeric = kind in 'biuf'
+        self.ordered = kind in 'biufmM'
+        self.total = 0
+        self.count = 0
+        self.nulls = 0
+        self._min = self._max = None
+        self._bounds_valid = True
+
+    def add(self, values):
+        nulls = int(values.isna().sum())
+        self.nulls += nulls
+        self.count += len(values) - nulls
+        if self.numeric:
+            self.total += _scalar(values.sum()) or 0
+        if self.ordered and self._bounds_valid and len(values) > nulls:
+            low, high = _scalar(values.min()), _scalar(values.max())
+            self._min = low if self._min is None else min(self._min, low)
+            self._max = high if self._max is None else max(self._max, high)
+
+    def remove(self, values):
+        nulls = int(values.isna().sum())
+        self.nulls -= nulls
+        self.count -= len(values) - nulls
+        if self.numeric:
+            self.total -= _scalar(values.sum()) or 0
+        if self.ordered and self._bounds_valid and len(values) > nulls:
+            if _scalar(values.min()) <= self._min or _scalar(values.max()) >= self._max:
+                self._bounds_valid = False  # Recalcul à la prochaine lecture
+
+    def value(self, name, column):
+        """Agrégat `name` ; `column()` retourne la colonne entière si un recalcul est nécessaire."""
+        if name == 'count':
+            return self.count
+        if name == 'nulls':
+            return self.nulls
+        if name == 'sum':
+            return self.total if self.numeric else None
+        if name == 'mean':
+            return self.total / self.count if self.numeric and self.count else None
+        if not self.ordered:
+            return None
+        if not self._bounds_valid:
+            values = column()
+            self._min, self._max = _scalar(values.min()), _scalar(values.max())
+            self._bounds_valid = True
+        return self._min if name == 'min' else self._max
+
+
+class SummaryModel(QAbstractTableModel):
+    """Lignes de synthèse (somme, moyenne, min, max, nombre, vides) des colonnes d'un `DataFrameModel`.
+
+    Les agrégats sont tenus à jour à partir des cellules modifiées et des
+    blocs de lignes insérés ou supprimés, signalés par le modèle source ; les
+    lignes ajoutées en fin de table sont prises en compte à la lecture.
+    """
+
+    labels = {
+        'sum': "Somme",
+        'mean': "Moyenne",
+        'min': "Min",
+        'max': "Max",
+        'count': "Nombre",
+        'nulls': "Vides",
+    }
+
+    def __init__(self, model, aggregates=AGGREGATES, parent=None):
+        super(SummaryModel, self).__init__(parent)
+        self.model = model
+        self.aggregates = list(aggregates)
+        self._columns = None  # ColumnSummary par colonne, construits à la première lecture
+        self._length = 0  # Lignes de la table prises en compte
+        model.add_frame_observer(self)
+        for signal in (model.dataChanged, model.rowsInserted, model.rowsRemoved, model.modelReset):
+            signal.connect(self._source_changed)
+
+    def close(self):
+        """Détache le modèle de synthèse du modèle source."""
+        self.model.remove_frame_observer(self)
+        for signal in (self.model.dataChanged, self.model.rowsInserted, self.model.rowsRemoved,
+                       self.model.modelReset):
+            signal.disconnect(self._source_changed)
+
+    def rowCount(self, parent=None):
+        return len(self.aggregates)
+
+    def columnCount(self, parent=None):
+        return self.model.columnCount()
+
+    def value(self, name, col):
+        dataframe = self._sync()
+        return self._columns[col].value(name, lambda: dataframe.iloc[:, col])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return
+        value = self.value(self.aggregates[index.row()], index.column())
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return
+        if orientation == Qt.Vertical:
+            return self.labels.get(self.aggregates[section], self.aggregates[section])
+        return self.model.headerData(section, orientation, role)
+
+    def _source_changed(self, *args):
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def _sync(self):
+        """Construit les agrégats au besoin et prend en compte les lignes ajoutées en fin de table."""
+        dataframe = self.model._dataframe
+        if self._columns is None or len(self._columns) != dataframe.shape[1]:
+            self._columns = [ColumnSummary(dtype) for dtype in dataframe.dtypes]
+            self._length = 0
+        if self._length < len(dataframe):
+            tail = dataframe.iloc[self._length:]
+            for col, summary in enumerate(self._columns):
+                summary.add(tail.iloc[:, col])
+            self._length = len(dataframe)
+        return dataframe
+
+    # Notifications du modèle source (avant et après modification de la table)
+
+    def invalidate(self):
+        self._columns = None
+
+    def cells_changing(self, dataframe, col, frame_rows):
+        if self._columns is not None:
+            self._columns[col].remove(dataframe.iloc[frame_rows[frame_rows < self._length], col])
+
+    def cells_changed(self, dataframe, col, frame_rows):
+        if self._columns is not None:
+            self._columns[col].add(dataframe.iloc[frame_rows[frame_rows < self._length], col])
+
+    def rows_inserted(self, dataframe, frame_row, count):
+        if self._columns is not None and frame_row < self._length:
+            block = dataframe.iloc[frame_row:frame_row + count]
+            for col, summary in enumerate(self._columns):
+                summary.add(block.iloc[:, col])
+            self._length += count
+
+    def rows_removing(self, dataframe, frame_keep):
+        if self._columns is not None:
+            removed = np.flatnonzero(~frame_keep[:self._length])
+            block = dataframe.iloc[removed]
+            for col, summary in enumerate(self._columns):
+                summary.remove(block.iloc[:, col])
+            self._length -= len(removed)
+
+    def head_removing(self, dataframe, count):
+        if self._columns is not None:
+            count = min(count, self._length)
+            block = dataframe.iloc[:count]
+            for col, summary in enumerate(self._columns):
+                summary.remove(block.iloc[:, col])
+            self._length -= count
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import QThread, pyqtSignal
+
+
+class ColumnTypeDetector(object):
+    """Détecte le type des colonnes d'un DataFrame : temporel (datetime, date, time), catégoriel
+    (category) ou décimal (float).
+
+    Les colonnes texte sont classées en une seule passe grâce à une expression
+    régulière à groupes nommés, d'abord sur un échantillon borné (tête + tirage
+    aléatoire). Le balayage complet n'est fait que si `full_scan` est demandé.
+    Les résultats sont mis en cache par nom de colonne.
+    """
+
+    # Ordre de priorité des types reconnus : (nom, motif)
+    patterns = [
+        ('datetime', r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'),
+        ('date', r'\d{4}-\d{2}-\d{2}'),
+        ('time', r'\d{2}:\d{2}:\d{2}'),
+    ]
+
+    def __init__(self, sample_size=1000, full_scan=False, random_state=0):
+        self.sample_size = sample_size
+        self.full_scan = full_scan
+        self.random_state = random_state
+        self._cache = {}
+        self._regex = '^(?:%s)$' % '|'.join('(?P<%s>%s)' % (kind, pattern) for kind, pattern in self.patterns)
+
+    def detect(self, dataframe, column):
+        """Retourne le type détecté pour `column` ou `None`."""
+        if column not in self._cache:
+            self._cache[column] = self._detect(dataframe[column])
+        return self._cache[column]
+
+    def detect_all(self, dataframe):
+        """Retourne {position de colonne: type} pour les colonnes reconnues."""
+        kinds = {}
+        for col_idx, column in enumerate(dataframe.columns):
+            kind = self.detect(dataframe, column)
+            if kind is not None:
+                kinds[col_idx] = kind
+        return kinds
+
+    def invalidate(self, column=None):
+        """Oublie le type d'une colonne (ou de toutes)."""
+        if column is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(column, None)
+
+    def _detect(self, series):
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            return 'category'
+        if dtype.kind == 'M':
+            return 'datetime'
+        if dtype.kind == 'f':
+            return 'float'
+        if not (dtype == object or isinstance(dtype, pd.StringDtype)) or series.empty:
+            return None
+        kind = self._classify(self._sample(series))
+        if kind is not None and self.full_scan and self.sample_size < len(series):
+            kind = self._classify(series)
+        return kind
+
+    def _sample(self, series):
+        if len(series) <= self.sample_size:
+            return series
+        head_size = self.sample_size // 2
+        rng = np.random.RandomState(self.random_state)
+        picked = rng.choice(np.arange(head_size, len(series)), self.sample_size - head_size, replace=False)
+        return series.iloc[np.concatenate([np.arange(head_size), np.sort(picked)])]
+
+    def _classify(self, series):
+        """Classe les valeurs en une passe : le type retenu doit couvrir toutes les valeurs."""
+        matches = series.astype(str).str.extract(self._regex)
+        for kind, _ in self.patterns:
+            if matches[kind].notna().all():
+                return kind
+        return None
+
+
+class TypeDetectionThread(QThread):
+    """Exécute la détection des types hors du thread graphique."""
+
+    detected = pyqtSignal(object)
+
+    def __init__(self, detector, dataframe, parent=None):
+        super(TypeDetectionThread, self).__init__(parent)
+        self.detector = detector
+        self.dataframe = dataframe
+
+    def run(self):
+        self.detected.emit(self.detector.detect_all(self.dataframe))
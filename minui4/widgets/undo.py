@@ -0,0 +1,147 @@
+import numpy as np
+from PyQt4.QtGui import QUndoCommand
+
+
+class CellDelta(object):
+    """Modification de cellules d'une colonne : lignes de la table, anciennes et nouvelles valeurs typées."""
+
+    def __init__(self, column, frame_rows, old_values, new_values):
+        self.column = column
+        self.frame_rows = frame_rows
+        self.old_values = old_values
+        self.new_values = new_values
+
+    @property
+    def nbytes(self):
+        return self.frame_rows.nbytes + self.old_values.nbytes + self.new_values.nbytes
+
+    def undo(self, model):
+        model._write_frame_cells(self.column, self.frame_rows, self.old_values)
+
+    def redo(self, model):
+        model._write_frame_cells(self.column, self.frame_rows, self.new_values)
+
+
+# Les deltas de lignes sont exprimés en positions de la table, et non de la vue :
+# un tri ou un filtre appliqué entre-temps ne change pas les lignes rejouées.
+
+class InsertDelta(object):
+    """Insertion de `count` lignes vides à la ligne `frame_row` de la table."""
+
+    nbytes = 0
+
+    def __init__(self, frame_row, count):
+        self.frame_row = frame_row
+        self.count = count
+
+    def undo(self, model):
+        model._remove_frame_rows(np.arange(self.frame_row, self.frame_row + self.count))
+
+    def redo(self, model):
+        model._insert_frame_rows(self.frame_row, self.count)
+
+
+class RemoveDelta(object):
+    """Suppression de lignes : positions dans la table et bloc des lignes supprimées."""
+
+    def __init__(self, frame_positions, block):
+        self.frame_positions = frame_positions
+        self.block = block
+        # Taille réelle, texte compris (deep) ; mesurée une fois, le bloc ne change plus
+        self.nbytes = frame_positions.nbytes + int(block.memory_usage(index=False, deep=True).sum())
+
+    def undo(self, model):
+        model._restore_rows(self.frame_positions, self.block)
+
+    def redo(self, model):
+        model._remove_frame_rows(self.frame_positions)
+
+
+class DeltaCommand(QUndoCommand):
+    """Commande annulable regroupant les deltas d'une modification ou d'une transaction."""
+
+    def __init__(self, history, deltas, text="Modification", done=True):
+        super(DeltaCommand, self).__init__(text)
+        self.history = history
+        self.deltas = deltas
+        self._done = done  # L'action a déjà été appliquée : le premier redo() est ignoré
+
+    def undo(self):
+        self.history.replay(reversed(self.deltas), 'undo')
+
+    def redo(self):
+        if self._done:
+            self._done = False
+            return
+        self.history.replay(self.deltas, 'redo')
+
+
+class UndoHistory(object):
+    """Historique des modifications d'un `DataFrameModel`, branché sur un `QUndoStack`.
+
+    Seuls des deltas compacts sont conservés (jamais de copie de la table). Les
+    deltas d'une transaction forment une seule commande. Lorsque l'historique
+    dépasse `max_bytes`, les commandes les plus anciennes sont abandonnées.
+    """
+
+    def __init__(self, model, stack, max_bytes=256 * 1024 * 1024):
+        self.model = model
+        self.stack = stack
+        self.max_bytes = max_bytes
+        self.replaying = False
+        self._group = None
+        self._group_depth = 0
+        self._commands = []  # [(deltas, texte)] dans l'ordre de la pile
+
+    def begin_group(self):
+        self._group_depth += 1
+        if self._group is None:
+            self._group = []
+
+    def end_group(self, text="Modification groupée"):
+        self._group_depth -= 1
+        if self._group_depth == 0:
+            deltas, self._group = self._group, None
+            if deltas:
+                self._push(deltas, text)
+
+    def record(self, delta, text="Modification"):
+        if self.replaying:
+            return
+        if self._group is not None:
+            self._group.append(delta)
+        else:
+            self._push([delta], text)
+
+    def replay(self, deltas, action):
+        self.replaying = True
+        try:
+            with self.model.update():
+                for delta in deltas:
+                    getattr(delta, action)(self.model)
+        finally:
+            self.replaying = False
+
+    def clear(self):
+        self._commands = []
+        self.stack.clear()
+
+    def nbytes(self):
+        return sum(delta.nbytes for deltas, _ in self._commands for delta in deltas)
+
+    def _push(self, deltas, text):
+        del self._commands[self.stack.index():]  # Les commandes annulées sont abandonnées
+        self._commands.append((deltas, text))
+        self.stack.push(DeltaCommand(self, deltas, text))
+        if self.nbytes() > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Abandonne les commandes les plus anciennes jusqu'à 3/4 du budget, puis reconstruit la pile."""
+        sizes = np.array([sum(delta.nbytes for delta in deltas) for deltas, _ in self._commands])
+        kept_from_end = np.cumsum(sizes[::-1]) <= self.max_bytes * 3 // 4
+        keep = max(int(kept_from_end.sum()), 1)
+        self._commands = self._commands[-keep:]
+        self.stack.clear()
+        for deltas, text in self._commands:
+            self.stack.push(DeltaCommand(self, deltas, text))
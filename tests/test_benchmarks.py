@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+from benchmarks import bench_dataframe, bench_startup
+from benchmarks.bench_dataframe import compare, run_benchmarks
+
+
+def test_compare_flags_regressions():
+    """Vérifie que seules les dégradations au-delà de la tolérance sont signalées."""
+    baseline = {'results': {'set_data[10]': {'seconds': 1.0, 'peak_bytes': 1000},
+                            'paste[10]': {'seconds': 1.0, 'peak_bytes': 1000}}}
+    current = {'results': {'set_data[10]': {'seconds': 1.1, 'peak_bytes': 1000},
+                           'paste[10]': {'seconds': 2.0, 'peak_bytes': 3000}}}
+    regressions = compare(baseline, current, tolerance=0.25)
+    assert [(key, metric) for key, metric, *_ in regressions] == [('paste[10]', 'seconds'),
+                                                                   ('paste[10]', 'peak_bytes')]
+
+def test_run_benchmarks_small(qtbot, monkeypatch):
+    """Exécute les cas du modèle sur une petite table."""
+    monkeypatch.setattr(bench_dataframe, 'SCROLL_PAGES', 2)
+    report = run_benchmarks([100], ['data_scroll', 'set_data', 'insert_rows', 'remove_rows', 'paste'], repeat=1)
+    assert set(report['results']) == {'data_scroll[100]', 'set_data[100]', 'insert_rows[100]',
+                                      'remove_rows[100]', 'paste[100]'}
+
+def test_large_preset(monkeypatch, tmp_path):
+    """Vérifie que `--large` ajoute la table de 10 millions de lignes aux tailles demandées."""
+    calls = []
+    monkeypatch.setattr(bench_dataframe, 'run_benchmarks', lambda sizes, cases, repeat: calls.append(sizes) or {})
+    output = str(tmp_path / 'resultats.json')
+    bench_dataframe.main(['run', '--sizes', '1000', '--large', '--output', output])
+    bench_dataframe.main(['run', '--output', output])
+    assert calls == [[1000, bench_dataframe.LARGE_SIZE], bench_dataframe.DEFAULT_SIZES]
+
+def test_package_import_is_lazy():
+    """Vérifie qu'importer le paquet ne charge pas pandas, et que les classes restent accessibles."""
+    script = ("import sys, minui4.widgets as widgets; loaded = 'pandas' in sys.modules; "
+              "widgets.FrameStore; print(loaded, 'pandas' in sys.modules)")
+    output = subprocess.check_output([sys.executable, '-c', script], cwd=bench_startup.ROOT)
+    assert output.split() == [b'False', b'True']
+
+def test_view_import_defers_features():
+    """Vérifie qu'importer `dataframe_view` ne charge pas les modules des fonctions annexes."""
+    features = ['loaders', 'exporters', 'summary', 'group_model', 'search', 'profiling']
+    script = ("import sys, minui4.widgets.dataframe_view; "
+              "print(*[name for name in %r if 'minui4.widgets.' + name in sys.modules])" % features)
+    output = subprocess.check_output([sys.executable, '-c', script], cwd=bench_startup.ROOT)
+    assert output.split() == []
+
+def test_run_startup_small(qtbot):
+    """Exécute les mesures de démarrage sur un widget et une petite table, avec l'écart à la référence."""
+    imports = {'baseline': ['json'], 'widgets': ['minui4.widgets']}
+    report = bench_startup.run_benchmarks([1], nrows=100, repeat=1, imports=imports)
+    assert set(report['results']) == {'import[baseline]', 'import[widgets]', 'import_overhead[widgets]',
+                                      'first_paint[1]', 'first_paint_deferred[1]'}
+    assert all(result['seconds'] > 0 for key, result in report['results'].items() if 'overhead' not in key)
@@ -0,0 +1,73 @@
+import pytest
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.categories import category_candidates, memory_savings
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.roles import ChoicesRole
+from minui4.widgets.type_detection import ColumnTypeDetector
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Ville': ['Paris', 'Lyon', 'Paris', 'Nice'] * 25,
+        'Code': ['c%d' % i for i in range(100)],
+        'Ventes': list(range(100)),
+    })
+
+@pytest.fixture
+def model(sample_df, qtbot):
+    model = DataFrameModel(sample_df)
+    model.encode_categories()
+    return model
+
+def column(model, col):
+    return [model.data(model.index(row, col), Qt.DisplayRole) for row in range(model.rowCount())]
+
+def test_candidates_and_savings(sample_df, qtbot):
+    """Teste le choix des colonnes peu variées et le gain de mémoire signalé par colonne."""
+    assert category_candidates(sample_df) == [0]
+    text_bytes = sample_df['Ville'].memory_usage(index=False, deep=True)  # Quel que soit le stockage du texte
+    model = DataFrameModel(sample_df)
+    savings = model.encode_categories()
+    assert list(savings) == ['Ville']
+    before, after = savings['Ville']
+    assert before == text_bytes
+    assert after < before
+    assert isinstance(model._dataframe['Ville'].dtype, pd.CategoricalDtype)
+    assert model._dataframe['Code'].dtype != 'category'
+    assert memory_savings(model._dataframe['Ville'])[0] == before
+
+def test_display_through_codes(model):
+    """Teste l'affichage, la valeur éditée et la liste des choix d'une colonne catégorielle."""
+    assert column(model, 0)[:4] == ['Paris', 'Lyon', 'Paris', 'Nice']
+    assert model.data(model.index(1, 0), Qt.EditRole) == 'Lyon'
+    assert model.data(model.index(0, 0), ChoicesRole) == ['Lyon', 'Nice', 'Paris']
+    assert model.data(model.index(0, 2), ChoicesRole) is None
+
+def test_new_value_extends_categories(model):
+    """Teste qu'une valeur inconnue ajoute une catégorie au lieu de changer le type de la colonne."""
+    assert model.setData(model.index(0, 0), "Brest", Qt.EditRole)
+    assert model.setData(model.index(1, 0), "", Qt.EditRole)
+    assert isinstance(model._dataframe['Ville'].dtype, pd.CategoricalDtype)
+    assert column(model, 0)[:3] == ['Brest', 'nan', 'Paris']
+    assert model.data(model.index(0, 0), ChoicesRole) == ['Lyon', 'Nice', 'Paris', 'Brest']
+
+def test_appended_rows_extend_categories(model):
+    """Teste que les lignes lues en fin de table gardent leurs valeurs nouvelles."""
+    model.append_rows(pd.DataFrame({'Ville': ['Brest'], 'Code': ['x'], 'Ventes': [0]}))
+    model.append_rows(pd.DataFrame({'Ville': ['Aix'], 'Code': ['y'], 'Ventes': [1]}))
+    assert column(model, 0)[-2:] == ['Brest', 'Aix']
+    assert isinstance(model._dataframe['Ville'].dtype, pd.CategoricalDtype)
+
+def test_sort_by_category_values(model):
+    """Teste le tri selon les valeurs, même après ajout de catégories en fin de liste."""
+    model.setData(model.index(0, 0), "Aix", Qt.EditRole)
+    model.sort(0, Qt.AscendingOrder)
+    assert column(model, 0)[:2] == ['Aix', 'Lyon']
+    model.sort(0, Qt.DescendingOrder)
+    assert column(model, 0)[0] == 'Paris'
+
+def test_detected_as_category(model):
+    """Teste que les colonnes catégorielles reçoivent leur propre type (liste déroulante)."""
+    assert ColumnTypeDetector().detect_all(model._dataframe) == {0: 'category'}
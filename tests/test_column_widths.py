@@ -0,0 +1,39 @@
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.column_widths import ColumnWidthEstimator
+
+
+@pytest.fixture
+def sample_df():
+    """Crée un DataFrame de test avec des textes de longueurs variées."""
+    return pd.DataFrame({
+        'Nom': ['Alice', 'Bob', 'Charlie'],
+        'Âge': [25, 30, 35],
+        'Date': [pd.Timestamp('2025-02-25 12:30:45'), pd.NaT, pd.Timestamp('2025-03-01')]
+    })
+
+def test_estimate_small_frame(sample_df, qtbot):
+    """Vérifie que toutes les lignes d'une petite table sont mesurées (en-tête compris)."""
+    model = DataFrameModel(sample_df)
+    assert model.column_width(0) == len('Charlie')
+    assert model.column_width(1) == len('Âge')
+    assert model.column_width(2) == len('2025-02-25 12:30:45')
+
+def test_sample_is_bounded():
+    """Vérifie que l'échantillon reste borné et contient le début, la fin et les lignes visibles."""
+    estimator = ColumnWidthEstimator(sample_size=100, edge_rows=10)
+    rows = estimator.sample_rows(10 ** 7, visible=np.arange(5000, 5030))
+    assert len(rows) <= 130
+    assert {0, 9, 10 ** 7 - 1, 5000, 5029} <= set(rows.tolist())
+
+def test_estimate_follows_edits_and_appends(sample_df, qtbot):
+    """Vérifie la mise à jour incrémentale lors des modifications et des ajouts."""
+    model = DataFrameModel(sample_df)
+    model.column_width(0)
+    model.setData(model.index(1, 0), "Bartholomew", Qt.EditRole)
+    assert model.column_width(0) == len('Bartholomew')
+    model.append_rows(pd.DataFrame({'Nom': ['Maximilienne-Charlotte'], 'Âge': [5], 'Date': [pd.NaT]}))
+    assert model.column_width(0) == len('Maximilienne-Charlotte')
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from PyQt4.QtCore import Qt
+from minui4.widgets.converters import ColumnConverter, ConverterRegistry, default_registry
+from minui4.widgets.dataframe_view import DataFrameModel
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Entier': [1, 2, 3],
+        'Réel': [1.5, 2.5, 3.5],
+        'Date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']),
+        'Nullable': pd.array([1, None, 3], dtype='Int64'),
+    })
+
+@pytest.mark.parametrize("dtype, values", [
+    (np.dtype('int64'), ['1', '', 'x', '2.5']),
+    (np.dtype('float64'), ['1.5', '', 'x']),
+    (np.dtype('bool'), ['true', 'no', '']),
+    (np.dtype('datetime64[ns]'), ['2024-01-01', '', 'x']),
+    (pd.Int64Dtype(), ['1', '', 'x']),
+    (pd.CategoricalDtype(['a', 'b']), ['a', '', 'c']),
+])
+def test_scalar_and_array_agree(dtype, values):
+    """Teste que les conversions unitaire et vectorisée donnent les mêmes résultats."""
+    converter = default_registry.converter_for(dtype)
+    converted, invalid = converter.convert_array(values)
+    for value, expected, bad in zip(values, converted, invalid):
+        result, valid = converter.convert(value)
+        assert valid != bad
+        if valid:
+            assert (pd.isna(result) and pd.isna(expected)) or result == expected
+
+def test_na_policy():
+    """Teste le remplacement des valeurs invalides par une valeur manquante."""
+    converter = default_registry.converter_for(np.dtype('float64'), policy='na')
+    assert np.isnan(converter.convert('x')[0])
+    converted, invalid = converter.convert_array(['1', 'x'])
+    assert not invalid.any() and np.isnan(converted[1])
+
+def test_custom_registration():
+    """Teste l'enregistrement d'un analyseur pour un type donné."""
+    registry = ConverterRegistry()
+    registry.register('int64', lambda dtype: (
+        lambda values: (np.array([len(v) for v in values]), np.zeros(len(values), dtype=bool)),
+        None))
+    converter = registry.converter_for(np.dtype('int64'))
+    assert converter.convert('abc') == (3, True)
+
+def test_set_data_rejects_invalid(sample_df, qtbot):
+    """Teste qu'une saisie invalide est refusée sans lever d'exception."""
+    model = DataFrameModel(sample_df)
+    assert not model.setData(model.index(0, 0), "x", Qt.EditRole)
+    assert model._dataframe['Entier'].iloc[0] == 1
+    assert model.setData(model.index(0, 2), "2030-05-06", Qt.EditRole)
+    assert model._dataframe['Date'].iloc[0] == pd.Timestamp('2030-05-06')
+
+def test_set_data_invalid_policy(sample_df, qtbot):
+    """Teste la politique 'na' d'une colonne et le convertisseur imposé."""
+    model = DataFrameModel(sample_df)
+    model.set_invalid_policy('Nullable', 'na')
+    assert model.setData(model.index(0, 3), "x", Qt.EditRole)
+    assert model._dataframe['Nullable'].iloc[0] is pd.NA
+    model.set_converter('Réel', ColumnConverter(np.dtype('float64'), None, lambda value: float(value) * 2))
+    model.setData(model.index(0, 1), "4", Qt.EditRole)
+    assert model._dataframe['Réel'].iloc[0] == 8.0
+
+def test_large_integers_are_exact(qtbot):
+    """Teste que les entiers au-delà de 2**53 sont écrits sans passer par les réels."""
+    model = DataFrameModel(pd.DataFrame({'Entier': [1, 2, 3]}))
+    assert model.setData(model.index(0, 0), "9007199254740993", Qt.EditRole)
+    model.set_block(1, 0, [['123456789012345678'], ['2.0']])
+    assert model._dataframe['Entier'].tolist() == [9007199254740993, 123456789012345678, 2]
+    converted, invalid = default_registry.converter_for(np.dtype('int64')).convert_array(['1.5', '99999999999999999999', '7'])
+    assert invalid.tolist() == [True, True, False] and converted[2] == 7
+
+def test_na_policy_on_integer_column(qtbot):
+    """Teste qu'une valeur manquante fait passer une colonne d'entiers au type nullable, par cellule ou par colonne."""
+    model = DataFrameModel(pd.DataFrame({'Entier': [1, 2, 3], 'Autre': [4, 5, 6]}))
+    model.set_invalid_policy('Entier', 'na')
+    model.set_invalid_policy('Autre', 'na')
+    assert model.setData(model.index(0, 0), "x", Qt.EditRole)
+    assert model._dataframe['Entier'].dtype == 'Int64'
+    assert model._dataframe['Entier'].tolist()[1:] == [2, 3] and model._dataframe['Entier'].iloc[0] is pd.NA
+    model.set_column_values(1, ['x', '9007199254740993', '6'])
+    assert model._dataframe['Autre'].dtype == 'Int64'
+    assert model._dataframe['Autre'].tolist()[1:] == [9007199254740993, 6]
@@ -2,8 +2,8 @@ from unittest import mock
 import pytest
 import pandas as pd
 from PyQt4.QtCore import Qt, QDate, QTime, QDateTime
-from PyQt4.QtGui import QApplication
-from minui4.widgets.dataframe_view import DataFrameView, DataFrameModel
+from PyQt4.QtGui import QApplication, QItemSelection, QItemSelectionModel
+from minui4.widgets.dataframe_view import DataFrameView, DataFrameModel, InvalidValuesError
 
 
 @pytest.fixture
@@ -68,7 +68,8 @@ def test_insert_row(df_model2, qtbot):
         df_model2.insertRows(nrow, 1)
 
     assert df_model2.rowCount() == nrow + 1
-    assert all(df_model2._dataframe.iloc[-1] == "")  # Vérifie que la nouvelle ligne est vide
+    assert df_model2._dataframe['Nom'].iloc[-1] == ""  # Vérifie que la nouvelle ligne est vide
+    assert df_model2._dataframe['Âge'].iloc[-1] == 0
 
 def test_remove_row(df_model2, qtbot):
     """Teste la suppression d'une ligne."""
@@ -86,7 +87,29 @@ def test_insert_multiple_rows(df_model2, qtbot):
         df_model2.insertRows(nrow, 3)
 
     assert df_model2.rowCount() == nrow + 3
-    assert all(df_model2._dataframe.iloc[-1] == "")  # Vérifie que les nouvelles lignes sont vides
+    assert all(df_model2._dataframe['Nom'].iloc[-3:] == "")  # Vérifie que les nouvelles lignes sont vides
+    assert all(df_model2._dataframe['Âge'].iloc[-3:] == 0)
+
+def test_insert_rows_keeps_dtypes(df_model2, sample_df2):
+    """Vérifie que l'insertion au milieu conserve le type des colonnes."""
+    assert df_model2.insertRows(1, 2)
+    assert df_model2.rowCount() == 4
+    assert (df_model2._dataframe.dtypes == sample_df2.dtypes).all()
+    assert list(df_model2._dataframe['Nom']) == ['Alice', '', '', 'Bob']
+
+def test_repeated_appends_are_buffered(df_model2, sample_df2):
+    """Vérifie que les ajouts successifs en fin de table sont écrits dans la réserve, sans recopier la table."""
+    store = df_model2.frame_store()
+    df_model2.insertRows(df_model2.rowCount(), 1)
+    capacity = store.capacity()
+    for _ in range(4):
+        df_model2.insertRows(df_model2.rowCount(), 1)
+        assert df_model2.data(df_model2.index(df_model2.rowCount() - 1, 0), Qt.DisplayRole) == ""  # Lecture à chaque ajout
+    assert store.capacity() == capacity >= 7
+    assert df_model2.rowCount() == 7
+    assert list(df_model2._dataframe.index) == list(range(7))
+    assert (df_model2._dataframe.dtypes == sample_df2.dtypes).all()
+    assert list(df_model2._dataframe['Nom']) == ['Alice', 'Bob'] + [''] * 5
 
 def test_remove_multiple_rows(df_model2, qtbot):
     """Teste la suppression de plusieurs lignes."""
@@ -241,6 +264,36 @@ def test_edit_value_with_datetime_delegate(df_view3, sample_df3, colname):
     delegate.setModelData(editor, table.model(), index)
     assert table.model().data(index, Qt.DisplayRole) == "2030-12-31 23:59:59"
 
+def test_edit_float_without_rounding(qtbot):
+    """Teste que l'éditeur d'une colonne décimale garde toutes les décimales (pas d'arrondi de QDoubleSpinBox)."""
+    view = DataFrameView(pd.DataFrame({'Prix': [0.123456789, 2.5]}))
+    qtbot.addWidget(view)
+    table = view.table_view
+    delegate = table.itemDelegateForColumn(0)
+    index = table.model().index(0, 0)
+    editor = delegate.createEditor(table, None, index)
+    delegate.setEditorData(editor, index)
+    assert editor.text() == "0.123456789"
+    editor.setText("1.0000000001")
+    delegate.setModelData(editor, table.model(), index)
+    assert table.model().data(index, Qt.EditRole) == 1.0000000001
+
+def test_typed_edit_role(df_model3, sample_df3):
+    """Teste les valeurs natives servies pour EditRole, sans passer par du texte."""
+    model = df_model3
+    assert model.data(model.index(0, 0), Qt.EditRole) == "2025-02-25"
+    assert model.data(model.index(0, 3), Qt.EditRole) == QDate(2025, 2, 25)
+    assert model.data(model.index(0, 4), Qt.EditRole) == QTime(12, 30, 45)
+    assert model.data(model.index(0, 5), Qt.EditRole) == QDateTime(QDate(2025, 2, 25), QTime(12, 30, 45))
+
+def test_raw_and_sort_key_roles(df_model2):
+    """Teste les rôles valeur brute et clé de tri, et les rôles non servis."""
+    model = df_model2
+    assert model.data(model.index(1, 1), Qt.EditRole) == 30
+    assert model.data(model.index(1, 1), Qt.UserRole) == 30
+    assert [model.data(model.index(row, 0), Qt.UserRole + 1) for row in range(2)] == [0, 1]
+    assert model.data(model.index(0, 0), Qt.ToolTipRole) is None
+
 
 @pytest.fixture
 def sample_df4():
@@ -315,3 +368,296 @@ def test_paste_selection(df_view4, sample_df4):
 
     # Vérifier que la valeur a bien été collée
     assert model.data(index, Qt.DisplayRole) == "Lyon"    
+
+
+@pytest.fixture
+def sample_df5():
+    """Crée un DataFrame de test de 10 lignes."""
+    return pd.DataFrame({
+        'Id': list(range(10)),
+        'Nom': ['Nom%d' % i for i in range(10)]
+    })
+
+@pytest.fixture
+def df_model5(sample_df5, qtbot):
+    return DataFrameModel(sample_df5)
+
+def test_remove_scattered_rows(df_model5, qtbot):
+    """Teste la suppression d'un ensemble dispersé de lignes."""
+    removed = []
+    df_model5.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    assert df_model5.remove_rows([8, 1, 2, 3, 5, 9])
+    assert removed == [(8, 9), (5, 5), (1, 3)]  # Plages fusionnées, de la dernière à la première
+    assert df_model5.rowCount() == 4
+    assert list(df_model5._dataframe['Id']) == [0, 4, 6, 7]
+    assert list(df_model5._dataframe.index) == list(range(4))
+
+@pytest.mark.parametrize("sorted_view", [False, True])
+def test_remove_ranges_consistent_between_signals(df_model5, qtmodeltester, sorted_view):
+    """Teste que la vue lit les bonnes lignes après chaque plage signalée (plusieurs plages non adjacentes)."""
+    qtmodeltester.check(df_model5)
+    if sorted_view:
+        df_model5.sort(0, Qt.DescendingOrder)
+    seen = []
+    df_model5.rowsRemoved.connect(lambda parent, first, last: seen.append(
+        [df_model5.data(df_model5.index(row, 0), Qt.DisplayRole) for row in range(df_model5.rowCount())]))
+    before = [df_model5.data(df_model5.index(row, 0), Qt.DisplayRole) for row in range(10)]
+    assert df_model5.remove_rows([1, 3, 4, 6, 8])
+    expected = []
+    for first, last in [(8, 8), (6, 6), (3, 4), (1, 1)]:  # Plages signalées de la dernière à la première
+        del before[first:last + 1]
+        expected.append(list(before))
+    assert seen == expected
+    qtmodeltester.check(df_model5)
+
+def test_remove_row_ranges_merges_adjacent(df_model5):
+    """Teste la fusion des plages adjacentes ou chevauchantes."""
+    removed = []
+    df_model5.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    assert df_model5.remove_row_ranges([(4, 5), (0, 1), (2, 3), (5, 6)])
+    assert removed == [(0, 6)]
+    assert list(df_model5._dataframe['Id']) == [7, 8, 9]
+
+def test_remove_row_ranges_out_of_bounds(df_model5):
+    """Teste le refus d'une plage hors limites."""
+    assert not df_model5.remove_row_ranges([(8, 10)])
+    assert df_model5.rowCount() == 10
+
+
+@pytest.fixture
+def sample_df6():
+    """Crée un DataFrame de test pour le tri et le filtre."""
+    return pd.DataFrame({
+        'Nom': ['Charlie', 'Alice', 'Bob', 'Alice'],
+        'Âge': [35, 30, 25, 20]
+    })
+
+@pytest.fixture
+def df_model6(sample_df6, qtbot):
+    return DataFrameModel(sample_df6)
+
+def column_values(model, col):
+    return [model.data(model.index(row, col), Qt.DisplayRole) for row in range(model.rowCount())]
+
+def test_sort_by_column(df_model6, sample_df6):
+    """Teste le tri par colonne sans réordonner le DataFrame."""
+    df_model6.sort(1, Qt.AscendingOrder)
+    assert column_values(df_model6, 1) == ['20', '25', '30', '35']
+    assert list(df_model6._dataframe['Âge']) == [35, 30, 25, 20]
+    df_model6.sort(-1)
+    assert column_values(df_model6, 1) == ['35', '30', '25', '20']
+
+def test_sort_multiple_keys(df_model6):
+    """Teste le tri multi-clés stable."""
+    df_model6.sort_by([(0, True), (1, False)])
+    assert column_values(df_model6, 0) == ['Alice', 'Alice', 'Bob', 'Charlie']
+    assert column_values(df_model6, 1) == ['30', '20', '25', '35']
+
+def test_filter_rows(df_model6):
+    """Teste le filtre textuel."""
+    df_model6.set_filter('ali')
+    assert df_model6.rowCount() == 2
+    assert column_values(df_model6, 1) == ['30', '20']
+    df_model6.set_filter('')
+    assert df_model6.rowCount() == 4
+
+def test_edit_sorted_and_filtered_rows(df_model6):
+    """Teste l'édition, l'insertion et la suppression à travers la permutation."""
+    df_model6.set_filter('ali')
+    df_model6.sort(1, Qt.AscendingOrder)
+    assert df_model6.setData(df_model6.index(0, 0), "Alicia", Qt.EditRole)
+    assert df_model6._dataframe['Nom'].iloc[3] == "Alicia"
+
+    assert df_model6.insertRows(1, 1)
+    assert column_values(df_model6, 1) == ['20', '0', '30']
+
+    assert df_model6.removeRows(0, 1)
+    assert column_values(df_model6, 1) == ['0', '30']
+    assert list(df_model6._dataframe['Âge']) == [35, 30, 25, 0]
+
+
+def test_copy_rectangle(df_view4):
+    """Teste la copie d'un rectangle de cellules au format TSV."""
+    table = df_view4.table_view
+    model = df_view4.model()
+    selection = QItemSelection(model.index(0, 0), model.index(1, 1))
+    table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+
+    df_view4.copy_selection()
+    assert QApplication.clipboard().text() == "Alice\t25\nBob\t30"
+
+def test_paste_rectangle_grows_frame(df_view4):
+    """Teste le collage d'un bloc qui dépasse la dernière ligne."""
+    table = df_view4.table_view
+    model = df_view4.model()
+    QApplication.clipboard().setText("40\tNice\n45\tLille\n50\tBrest\n")
+    table.setCurrentIndex(model.index(1, 1))
+
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right: changed.append((top_left.row(), bottom_right.row())))
+    df_view4.paste_selection()
+    assert changed == [(1, 3)]  # Un seul signal pour tout le rectangle
+
+    assert model.rowCount() == 4
+    assert list(model._dataframe['Âge']) == [25, 40, 45, 50]
+    assert model._dataframe['Âge'].dtype == 'int64'
+    assert list(model._dataframe['Ville']) == ['Paris', 'Nice', 'Lille', 'Brest']
+
+def test_set_block_reports_all_invalid_cells(df_view4):
+    """Teste que toutes les cellules invalides sont signalées et que rien n'est écrit."""
+    model = df_view4.model()
+    with pytest.raises(InvalidValuesError) as error:
+        model.set_block(0, 1, [["x"], ["31"], ["y"]])
+    assert error.value.cells == [(0, 1, "x"), (2, 1, "y")]
+    assert list(model._dataframe['Âge']) == [25, 30, 35]
+
+
+def changed_rectangles(model):
+    """Enregistre les rectangles (haut, gauche, bas, droite) signalés par dataChanged."""
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right: changed.append(
+        (top_left.row(), top_left.column(), bottom_right.row(), bottom_right.column())))
+    return changed
+
+def test_transaction_coalesces_signals(df_model5):
+    """Teste le regroupement des dataChanged à la fin d'une transaction."""
+    changed = changed_rectangles(df_model5)
+    with df_model5.update():
+        for row in range(5):
+            df_model5.setData(df_model5.index(row, 0), str(row * 10), Qt.EditRole)
+            df_model5.setData(df_model5.index(row, 1), "X", Qt.EditRole)
+        df_model5.setData(df_model5.index(8, 1), "Y", Qt.EditRole)
+        assert changed == []
+    assert changed == [(0, 0, 4, 1), (8, 1, 8, 1)]
+    assert list(df_model5._dataframe['Id'].iloc[:5]) == [0, 10, 20, 30, 40]
+
+def test_nested_transactions(df_model5):
+    """Teste que seules les transactions les plus externes émettent les signaux."""
+    changed = changed_rectangles(df_model5)
+    df_model5.begin_update()
+    with df_model5.update():
+        df_model5.setData(df_model5.index(0, 0), "1", Qt.EditRole)
+    assert changed == []
+    df_model5.end_update()
+    assert changed == [(0, 0, 0, 0)]
+
+def test_set_column_values(df_model5):
+    """Teste l'écriture d'un tableau de valeurs dans une colonne."""
+    changed = changed_rectangles(df_model5)
+    df_model5.set_column_values(0, [100, 200, 500], rows=[1, 2, 5])
+    assert list(df_model5._dataframe['Id']) == [0, 100, 200, 3, 4, 500, 6, 7, 8, 9]
+    assert changed == [(1, 0, 2, 0), (5, 0, 5, 0)]
+
+def test_set_block_with_typed_values(df_model5):
+    """Teste l'écriture d'un bloc déjà typé, sans conversion."""
+    changed = changed_rectangles(df_model5)
+    block = pd.DataFrame({'Id': [7, 8], 'Nom': ['A', 'B']})
+    df_model5.set_block(3, 0, block)
+    assert list(df_model5._dataframe['Id'].iloc[3:5]) == [7, 8]
+    assert changed == [(3, 0, 4, 1)]
+
+
+@pytest.fixture
+def stream_model(qtbot):
+    """Crée un modèle vide pour le mode flux."""
+    return DataFrameModel(pd.DataFrame({'Id': pd.Series([], dtype='int64'),
+                                        'Prix': pd.Series([], dtype='float64')}))
+
+def test_stream_flush_single_insert(stream_model):
+    """Teste que les blocs en attente sont insérés en une seule fois."""
+    inserted = []
+    stream_model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    stream_model.push([(1, 1.5), (2, 2.5)])
+    stream_model.push(pd.DataFrame({'Id': [3], 'Prix': [3.5]}))
+    assert stream_model.rowCount() == 0
+
+    stream_model.flush_stream()
+    assert inserted == [(0, 2)]
+    assert list(stream_model._dataframe['Id']) == [1, 2, 3]
+    assert stream_model._dataframe['Id'].dtype == 'int64'
+
+def test_stream_ring_buffer(stream_model):
+    """Teste l'éviction des lignes les plus anciennes au-delà de `max_rows`."""
+    stream_model.max_rows = 3
+    for i in range(5):
+        stream_model.push([(i, float(i))])
+        stream_model.flush_stream()
+    assert stream_model.rowCount() == 3
+    assert list(stream_model._dataframe['Id']) == [2, 3, 4]
+    assert list(stream_model._dataframe.index) == [0, 1, 2]
+
+def test_stream_timer(qtbot, stream_model):
+    """Teste l'affichage périodique des blocs poussés."""
+    stream_model.start_streaming(interval=10)
+    stream_model.push([(1, 1.0)])
+    with qtbot.waitSignal(stream_model.rowsInserted, timeout=1000):
+        pass
+    stream_model.stop_streaming()
+    assert stream_model.rowCount() == 1
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Écrit un fichier CSV de test de 250 lignes."""
+    path = str(tmp_path / 'data.csv')
+    pd.DataFrame({
+        'Id': list(range(250)),
+        'Date': ['2025-02-25'] * 250
+    }).to_csv(path, index=False)
+    return path
+
+def test_load_in_background(qtbot, csv_file):
+    """Teste le chargement par blocs et la détection des types à la fin."""
+    widget = DataFrameView(pd.DataFrame())
+    qtbot.addWidget(widget)
+    widget.load(csv_file, chunk_rows=100)
+    qtbot.waitUntil(lambda: widget.model().rowCount() == 250 and widget.progress_bar.isHidden(), timeout=5000)
+
+    assert list(widget.model()._dataframe['Id']) == list(range(250))
+    assert widget.table_view.itemDelegateForColumn(1) is not None
+
+@pytest.fixture
+def wide_df():
+    return pd.DataFrame({'C%d' % i: ['2024-01-0%d' % (i % 9 + 1)] * 3 for i in range(1000)})
+
+@pytest.fixture
+def wide_view(qtbot, wide_df):
+    widget = DataFrameView(wide_df)
+    qtbot.addWidget(widget)
+    widget.show()
+    return widget
+
+def test_wide_frame_prepares_visible_columns_only(wide_view):
+    """Teste que types et largeurs ne sont traités que pour les colonnes visibles d'une table large."""
+    assert wide_view.is_wide()
+    visible = wide_view.visible_columns()
+    assert 0 < len(visible) < 1000
+    assert wide_view.table_view.itemDelegateForColumn(visible[0]) is not None
+    assert wide_view.table_view.itemDelegateForColumn(999) is None
+    wide_view.table_view.scrollTo(wide_view.model().index(0, 999))
+    assert wide_view.table_view.itemDelegateForColumn(999) is not None
+
+def test_column_order_and_hidden_columns(wide_view, wide_df):
+    """Teste l'ordre d'affichage et le masquage des colonnes sans modifier la table."""
+    model = wide_view.model()
+    wide_view.set_column_order([5, 2, 7])
+    assert wide_view.column_order() == [5, 2, 7]
+    assert wide_view.visible_columns() == [5, 2, 7]
+    wide_view.set_columns_hidden([2])
+    assert wide_view.column_order() == [5, 7]
+    assert model._dataframe is wide_df
+    assert model.headerData(5, Qt.Horizontal) == 'C5'
+
+def test_deferred_view_fills_on_next_event_loop_turn(qtbot, sample_df3):
+    """Teste l'affichage d'une table vide puis son remplissage au tour suivant de la boucle d'événements."""
+    widget = DataFrameView(sample_df3, deferred=True)
+    qtbot.addWidget(widget)
+    assert widget.model().rowCount() == 0
+    qtbot.waitUntil(lambda: widget.model().rowCount() == len(sample_df3))
+    assert widget.table_view.itemDelegateForColumn(0) is not None
+
+def test_delegates_shared_by_kind(df_view3, sample_df3):
+    """Teste qu'un seul délégué est créé par type de colonne."""
+    view = df_view3.table_view
+    columns = [sample_df3.columns.get_loc(name) for name in ('DateX', 'DateY')]
+    assert view.itemDelegateForColumn(columns[0]) is view.itemDelegateForColumn(columns[1])
@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.display_cache import DisplayCache, format_values
+
+
+@pytest.fixture
+def sample_df():
+    """Crée un DataFrame de test avec des types variés."""
+    return pd.DataFrame({
+        'Nom': ['Alice', 'Bob', 'Charlie', 'David', 'Eve'],
+        'Âge': [25, 30, 35, 40, 45],
+        'Taille': [1.6, 1.75, np.nan, 1.8, 1.55],
+        'Date': [pd.Timestamp('2025-02-25 12:30:45'), pd.Timestamp('2025-03-01'), pd.NaT,
+                 pd.Timestamp('2025-03-02 08:15:00'), pd.Timestamp('2025-03-03 00:00:01')]
+    })
+
+@pytest.fixture
+def cached_model(sample_df, qtbot):
+    """Crée un modèle avec un cache d'affichage à petits blocs."""
+    return DataFrameModel(sample_df, display_cache=DisplayCache(block_size=2))
+
+@pytest.mark.parametrize("colname", ['Nom', 'Âge', 'Taille', 'Date'])
+def test_format_values_matches_str(sample_df, colname):
+    """Vérifie que le formatage vectorisé produit le même texte que `str(value)`."""
+    expected = [str(value) for value in sample_df[colname]]
+    assert list(format_values(sample_df[colname])) == expected
+
+def test_cached_data_matches_dataframe(cached_model, sample_df):
+    """Vérifie que les valeurs servies par le cache correspondent au DataFrame."""
+    for row in range(cached_model.rowCount()):
+        for col in range(cached_model.columnCount()):
+            index = cached_model.index(row, col)
+            assert cached_model.data(index, Qt.DisplayRole) == str(sample_df.iloc[row, col])
+
+def test_cache_fills_only_visited_blocks(cached_model):
+    """Vérifie que seuls les blocs lus sont formatés."""
+    cached_model.data(cached_model.index(3, 0), Qt.DisplayRole)
+    assert len(cached_model.display_cache()) == 1
+
+def test_cache_evicts_least_recently_used(sample_df):
+    """Vérifie l'éviction LRU lorsque le budget mémoire est dépassé."""
+    cache = DisplayCache(block_size=1, max_bytes=1)
+    cache.get(sample_df, 0, 0)
+    cache.get(sample_df, 1, 0)
+    assert len(cache) == 1
+    assert cache.get(sample_df, 0, 0) == 'Alice'
+
+def test_set_data_invalidates_cell_block(cached_model):
+    """Vérifie qu'une modification n'invalide que le bloc concerné."""
+    cached_model.data(cached_model.index(0, 0), Qt.DisplayRole)
+    cached_model.data(cached_model.index(4, 0), Qt.DisplayRole)
+    index = cached_model.index(1, 0)
+    assert cached_model.setData(index, "Bobby", Qt.EditRole)
+    assert len(cached_model.display_cache()) == 1
+    assert cached_model.data(index, Qt.DisplayRole) == "Bobby"
+
+def test_remove_rows_invalidates_following_blocks(cached_model):
+    """Vérifie que la suppression invalide les blocs décalés."""
+    for row in range(cached_model.rowCount()):
+        cached_model.data(cached_model.index(row, 0), Qt.DisplayRole)
+    cached_model.removeRows(2, 1)
+    assert len(cached_model.display_cache()) == 1
+    assert cached_model.data(cached_model.index(2, 0), Qt.DisplayRole) == "David"
+
+def test_prefetch_fills_blocks_of_view_rows(cached_model):
+    """Vérifie que le préchargement formate les blocs des lignes affichées, dans l'ordre de la vue."""
+    cached_model.sort(1, Qt.DescendingOrder)  # Vue : lignes 4, 3, 2, 1, 0 de la table
+    cached_model.prefetch_display(0, 0, [0])
+    assert len(cached_model.display_cache()) == 1
+    cached_model.prefetch_display(-5, 1, [0])
+    assert len(cached_model.display_cache()) == 2
+    assert cached_model.data(cached_model.index(1, 0), Qt.DisplayRole) == "David"
+    assert len(cached_model.display_cache()) == 2
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from PyQt4.QtGui import QApplication
+from minui4.widgets.dataframe_view import DataFrameModel, DataFrameView
+from minui4.widgets.exporters import ChunkedExporter
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Id': list(range(250)),
+        'Nom': ['n%d' % i for i in range(250)],
+    })
+
+def run(exporter):
+    exporter.start()
+    exporter.wait()
+    QApplication.processEvents()  # Signaux du thread de travail mis en file d'attente
+    return exporter
+
+def test_export_csv_in_chunks(sample_df, tmp_path, qtbot):
+    """Teste l'écriture par blocs (un seul en-tête) et la progression."""
+    path = str(tmp_path / 'out.csv')
+    exporter = ChunkedExporter(sample_df, path, chunk_rows=100)
+    progress = []
+    exporter.progress.connect(progress.append)
+    run(exporter)
+    pd.testing.assert_frame_equal(pd.read_csv(path), sample_df)
+    assert progress == [40, 80, 100]
+    assert not os.path.exists(path + '.part')
+
+def test_export_tsv_empty_frame(tmp_path, qtbot):
+    """Teste l'en-tête seul pour une table vide et le séparateur TSV."""
+    path = str(tmp_path / 'out.tsv')
+    run(ChunkedExporter(pd.DataFrame({'A': [], 'B': []}), path))
+    with open(path) as f:
+        assert f.read() == "A\tB\n"
+
+def test_export_cancel_removes_partial_file(sample_df, tmp_path, qtbot):
+    """Teste que l'annulation ne laisse aucun fichier."""
+    path = str(tmp_path / 'out.csv')
+    exporter = ChunkedExporter(sample_df, path, chunk_rows=100)
+    written = []
+
+    def cancel(value):  # Appelé dans le thread de travail, entre deux blocs
+        written.append(value)
+        assert os.path.exists(path + '.part')
+        exporter.cancel()
+
+    exporter.progress.connect(cancel, Qt.DirectConnection)
+    exported = []
+    exporter.exported.connect(exported.append)
+    run(exporter)
+    assert written == [40]
+    assert exported == []
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + '.part')
+
+def test_export_unknown_format(sample_df, tmp_path, qtbot):
+    """Teste le signalement d'un format non géré."""
+    exporter = ChunkedExporter(sample_df, str(tmp_path / 'out.xlsx'))
+    errors = []
+    exporter.failed.connect(errors.append)
+    run(exporter)
+    assert errors and "excel" in errors[0]
+
+def test_snapshot_is_independent(sample_df, qtbot):
+    """Teste que la copie exportée ne suit pas les modifications ultérieures."""
+    model = DataFrameModel(sample_df)
+    snapshot = model.snapshot(np.array([2, 0]), [1])
+    model.setData(model.index(0, 1), "modifié", Qt.EditRole)
+    assert snapshot.to_frame()['Nom'].tolist() == ['n2', 'n0']
+
+def test_changed_rows(sample_df, qtbot):
+    """Teste le suivi des lignes modifiées, insérées et supprimées depuis le chargement."""
+    model = DataFrameModel(sample_df.iloc[:5].copy())
+    model.append_rows(pd.DataFrame({'Id': [5], 'Nom': ['n5']}))  # Lignes lues : non marquées
+    model.setData(model.index(1, 1), "x", Qt.EditRole)
+    model.insertRows(3, 1)
+    model.insertRows(model.rowCount(), 1)
+    assert model.changed_rows().tolist() == [1, 3, 7]
+    model.removeRows(0, 2)
+    assert model.changed_rows().tolist() == [1, 5]
+    model.set_dataframe(sample_df)
+    assert model.changed_rows().tolist() == []
+
+def test_view_export_changed_rows_in_view_order(sample_df, tmp_path, qtbot):
+    """Teste l'export des lignes modifiées dans l'ordre de la vue triée."""
+    widget = DataFrameView(sample_df)
+    qtbot.addWidget(widget)
+    model = widget.model()
+    model.setData(model.index(3, 1), "a", Qt.EditRole)
+    model.setData(model.index(7, 1), "b", Qt.EditRole)
+    model.sort(0, Qt.DescendingOrder)
+    path = str(tmp_path / 'out.csv')
+    widget.export(path, scope='view', changed_only=True).wait()
+    assert pd.read_csv(path)['Id'].tolist() == [7, 3]
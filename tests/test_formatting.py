@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from PyQt4.QtGui import QColor
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.formatting import FormatRule, greater_than, is_null
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Nom': ['Alice', 'Bob', None, 'David'],
+        'Score': [12.5, 80.25, 45.0, np.nan],
+    })
+
+@pytest.fixture
+def styled_model(sample_df, qtbot):
+    """Crée un modèle avec un seuil sur 'Score' et un surlignage des valeurs manquantes."""
+    model = DataFrameModel(sample_df)
+    model.add_format_rule(FormatRule(greater_than(40), ['Score'], background='red'))
+    model.add_format_rule(FormatRule(is_null(), background='yellow'))
+    return model
+
+def backgrounds(model, col):
+    return [model.data(model.index(row, col), Qt.BackgroundRole) for row in range(model.rowCount())]
+
+def test_rules_are_evaluated_per_column(styled_model):
+    """Vérifie la première règle vérifiée de chaque cellule."""
+    red, yellow = QColor('red'), QColor('yellow')
+    assert backgrounds(styled_model, 1) == [None, red, red, yellow]
+    assert backgrounds(styled_model, 0) == [None, None, yellow, None]
+    assert styled_model.data(styled_model.index(1, 1), Qt.FontRole) is None
+
+def test_styles_follow_edits_inserts_and_removals(styled_model):
+    """Vérifie la mise à jour incrémentale des codes de style."""
+    red, yellow = QColor('red'), QColor('yellow')
+    styled_model.setData(styled_model.index(0, 1), "99", Qt.EditRole)
+    assert backgrounds(styled_model, 1) == [red, red, red, yellow]
+    styled_model.insertRows(1, 1)
+    assert backgrounds(styled_model, 1) == [red, yellow, red, red, yellow]
+    styled_model.remove_rows([0, 2])
+    assert backgrounds(styled_model, 1) == [yellow, red, yellow]
+    styled_model.append_rows(pd.DataFrame({'Nom': ['Eve'], 'Score': [50.0]}))
+    assert backgrounds(styled_model, 1) == [yellow, red, yellow, red]
+
+def test_number_format(styled_model):
+    """Vérifie le format d'affichage d'une colonne."""
+    styled_model.set_number_format('Score', '{:.1f}')
+    assert styled_model.data(styled_model.index(1, 1), Qt.DisplayRole) == "80.2"
+    assert styled_model.data(styled_model.index(1, 1), Qt.EditRole) == 80.25
@@ -0,0 +1,123 @@
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from PyQt4.QtGui import QUndoStack
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.frame_store import FrameStore
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Id': [0, 1, 2, 3, 4],
+        'Nom': ['a', 'b', 'c', 'd', 'e'],
+        'Prix': [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+
+@pytest.fixture
+def shared(sample_df, qtbot):
+    first = DataFrameModel(sample_df)
+    second = DataFrameModel(first.frame_store())
+    return first, second
+
+def column(model, col):
+    return [model.data(model.index(row, col), Qt.DisplayRole) for row in range(model.rowCount())]
+
+def test_models_share_frame_without_copy(sample_df, shared):
+    """Teste que les modèles lisent la même table, sans copie."""
+    first, second = shared
+    assert first._dataframe is sample_df
+    assert second._dataframe is sample_df
+    assert isinstance(first.frame_store(), FrameStore)
+
+def test_edit_broadcast(shared):
+    """Teste qu'une modification est signalée à tous les modèles attachés."""
+    first, second = shared
+    changed = []
+    second.dataChanged.connect(lambda top, bottom: changed.append((top.row(), top.column())))
+    first.setData(first.index(1, 1), "x", Qt.EditRole)
+    assert column(second, 1) == ['a', 'x', 'c', 'd', 'e']
+    assert changed == [(1, 1)]
+
+def test_insert_and_remove_broadcast(shared):
+    """Teste les insertions et suppressions vues par un modèle trié."""
+    first, second = shared
+    second.sort(0, Qt.DescendingOrder)
+    inserted, removed = [], []
+    second.rowsInserted.connect(lambda parent, start, end: inserted.append((start, end)))
+    second.rowsRemoved.connect(lambda parent, start, end: removed.append((start, end)))
+
+    first.insertRows(1, 2)  # Au milieu de la table : en fin de vue triée
+    assert inserted == [(5, 6)]
+    assert column(second, 0)[:5] == ['4', '3', '2', '1', '0']
+    first.removeRows(3, 2)  # Id 1 et 2
+    assert removed == [(2, 3)]
+    assert column(second, 0)[:3] == ['4', '3', '0']
+    assert first.rowCount() == second.rowCount() == 5
+
+def test_append_and_reset_broadcast(shared, sample_df):
+    """Teste les ajouts en fin de table et le remplacement de la table."""
+    first, second = shared
+    first.append_rows(pd.DataFrame({'Id': [5], 'Nom': ['f'], 'Prix': [6.0]}))
+    assert second.rowCount() == 6
+    second.set_dataframe(sample_df.iloc[:2].copy())
+    assert first.rowCount() == 2
+
+def test_other_model_structural_change_clears_history(shared):
+    """Teste que les positions enregistrées pour l'annulation sont oubliées après une insertion ailleurs."""
+    first, second = shared
+    stack = QUndoStack()
+    first.set_undo_stack(stack)
+    first.setData(first.index(0, 1), "x", Qt.EditRole)
+    assert stack.count() == 1
+    second.insertRows(0, 1)
+    assert stack.count() == 0
+
+def test_stream_eviction_with_sorted_model(qtbot):
+    """Teste l'éviction des premières lignes vue par un modèle trié."""
+    first = DataFrameModel(pd.DataFrame({'Id': [0, 1, 2]}))
+    second = DataFrameModel(first.frame_store())
+    second.sort(0, Qt.DescendingOrder)
+    first.max_rows = 3
+    first.push([(3,), (4,)])
+    first.flush_stream()
+    assert column(first, 0) == ['2', '3', '4']
+    assert column(second, 0) == ['2', '3', '4']  # Lignes lues ajoutées en fin de vue triée
+
+def test_stream_eviction_reuses_reserve(qtbot):
+    """Teste que l'éviction en tête avance dans la réserve au lieu de recopier les lignes conservées."""
+    model = DataFrameModel(pd.DataFrame({'Id': list(range(10)), 'Nom': ['n%d' % i for i in range(10)]}))
+    model.max_rows = 10
+    store = model.frame_store()
+    model.push([(10, 'n10')])
+    model.flush_stream()
+    buffers = store._buffers
+    for i in range(11, 20):
+        model.push([(i, 'n%d' % i)])
+        model.flush_stream()
+    assert buffers is not None and store._buffers is buffers
+    assert model._dataframe['Id'].tolist() == list(range(10, 20))
+    assert model._dataframe['Nom'].tolist()[-1] == 'n19'
+    assert list(model._dataframe.index) == list(range(10))
+
+def test_snapshot_copies_only_edited_columns(shared):
+    """Teste la copie sur écriture colonne par colonne des clichés."""
+    first, second = shared
+    snapshot = first.snapshot()
+    first.setData(first.index(0, 2), "9.5", Qt.EditRole)
+    first.setData(first.index(1, 2), "7", Qt.EditRole)
+    assert snapshot.copied_columns() == [2]
+    frame = snapshot.to_frame()
+    assert frame['Prix'].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert frame['Nom'].tolist() == ['a', 'b', 'c', 'd', 'e']
+    assert snapshot.chunk(3, 10)['Id'].tolist() == [3, 4]
+
+def test_snapshot_released_after_structural_change(shared):
+    """Teste qu'un cliché n'est plus copié une fois la table remplacée par une copie."""
+    first, second = shared
+    snapshot = first.snapshot(np.array([4, 0]), [1])
+    first.insertRows(1, 1)
+    first.setData(first.index(0, 1), "x", Qt.EditRole)
+    assert snapshot.copied_columns() == []
+    assert snapshot.to_frame()['Nom'].tolist() == ['e', 'a']
@@ -0,0 +1,88 @@
+from unittest import mock
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt, QModelIndex
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.group_model import GroupedDataFrameModel
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Pays': ['FR', 'BE', 'FR', 'FR', 'BE'],
+        'Ville': ['Paris', 'Liège', 'Lyon', 'Paris', 'Liège'],
+        'Ventes': [10, 20, 30, 40, 50],
+    })
+
+@pytest.fixture
+def grouped(sample_df, qtbot):
+    model = DataFrameModel(sample_df)
+    return model, GroupedDataFrameModel(model, ['Pays', 'Ville'])
+
+def labels(model, parent=QModelIndex()):
+    return [model.data(model.index(row, 0, parent), Qt.DisplayRole) for row in range(model.rowCount(parent))]
+
+def test_group_tree(grouped):
+    """Teste les niveaux de groupes, leurs effectifs et les lignes feuilles."""
+    model, tree = grouped
+    assert labels(tree) == ["BE (2)", "FR (3)"]
+    france = tree.index(1, 0)
+    assert labels(tree, france) == ["Lyon (1)", "Paris (2)"]
+    paris = tree.index(1, 0, france)
+    assert tree.rowCount(paris) == 2
+    assert not tree.hasChildren(tree.index(0, 0, paris))
+    assert [tree.data(tree.index(row, 3, paris), Qt.DisplayRole) for row in range(2)] == ["10", "40"]
+    assert tree.parent(paris).row() == 1
+
+def test_children_built_on_expand(grouped):
+    """Teste que les groupes ne sont construits qu'à l'ouverture."""
+    model, tree = grouped
+    tree.rowCount()
+    assert tree.hasChildren(tree.index(0, 0))
+    assert all(node.children is None for node in tree._root.children)
+
+def test_group_aggregates(grouped):
+    """Teste les sommes par défaut des colonnes numériques."""
+    model, tree = grouped
+    assert tree.data(tree.index(1, 3), Qt.DisplayRole) == "80"
+    assert tree.data(tree.index(1, 1), Qt.DisplayRole) == ""
+
+def test_edit_leaf_updates_aggregates(grouped):
+    """Teste l'écriture d'une ligne dans la table et la mise à jour des seuls agrégats concernés."""
+    model, tree = grouped
+    paris = tree.index(1, 0, tree.index(1, 0))
+    tree.rowCount(paris)
+    assert tree.setData(tree.index(1, 3, paris), "45", Qt.EditRole)
+    assert model._dataframe['Ventes'].tolist() == [10, 20, 30, 45, 50]
+    assert tree.data(tree.index(1, 3), Qt.DisplayRole) == "85"
+    assert tree.data(tree.index(1, 3, tree.index(1, 0)), Qt.DisplayRole) == "55"
+    assert tree.data(tree.index(0, 3), Qt.DisplayRole) == "70"
+    assert not tree.setData(tree.index(1, 3, paris), "abc", Qt.EditRole)
+    assert not tree.flags(tree.index(1, 3)) & Qt.ItemIsEditable
+
+def test_edit_group_key_regroups(grouped):
+    """Teste qu'une modification de clé déplace la ligne dans son nouveau groupe."""
+    model, tree = grouped
+    model.setData(model.index(1, 0), "FR", Qt.EditRole)
+    assert labels(tree) == ["BE (1)", "FR (4)"]
+
+def test_missing_keys_grouped(qtbot):
+    """Teste que les clés manquantes forment un groupe."""
+    model = DataFrameModel(pd.DataFrame({'Pays': ['FR', None, 'FR'], 'Ventes': [1.0, 2.0, np.nan]}))
+    tree = GroupedDataFrameModel(model, ['Pays'])
+    assert labels(tree) == ["FR (2)", "nan (1)"]
+    assert tree.data(tree.index(0, 2), Qt.DisplayRole) == "1.0"
+
+def test_rebuilt_once_per_operation(grouped):
+    """Teste qu'une suppression en plusieurs plages, un ajout ou un bloc lu reconstruisent les groupes une fois."""
+    model, tree = grouped
+    with mock.patch.object(tree, 'rebuild', wraps=tree.rebuild) as rebuild:
+        model.remove_row_ranges([(0, 0), (2, 3)])
+        assert rebuild.call_count == 1
+        assert labels(tree) == ["BE (2)"]
+        model.insertRows(model.rowCount(), 1)
+        model.append_rows(pd.DataFrame({'Pays': ['FR'], 'Ville': ['Nice'], 'Ventes': [5]}))
+        model.sort(2, Qt.DescendingOrder)
+        assert rebuild.call_count == 3
+    assert labels(tree) == [" (1)", "BE (2)", "FR (1)"]  # Ligne vide : clé ""
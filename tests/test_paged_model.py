@@ -0,0 +1,85 @@
+import pytest
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.dataframe_view import DataFrameView, InvalidValuesError
+from minui4.widgets.paged_model import CsvSource, PagedDataFrameModel
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Écrit un fichier CSV de test de 250 lignes."""
+    path = str(tmp_path / 'data.csv')
+    pd.DataFrame({
+        'Id': list(range(250)),
+        'Nom': ['Nom%d' % i for i in range(250)],
+        'Date': ['2025-02-25'] * 250
+    }).to_csv(path, index=False)
+    return path
+
+@pytest.fixture
+def paged_model(csv_path, qtbot):
+    return PagedDataFrameModel(CsvSource(csv_path, page_size=100), max_pages=2)
+
+def test_fetch_more(paged_model):
+    """Vérifie que les lignes sont exposées page par page."""
+    assert paged_model.rowCount() == 100
+    while paged_model.canFetchMore():
+        paged_model.fetchMore()
+    assert paged_model.rowCount() == 250
+
+def test_pages_are_bounded(paged_model):
+    """Vérifie la lecture à la demande et l'éviction LRU des pages."""
+    assert paged_model.value(150, 1) == 'Nom150'
+    assert paged_model.value(249, 0) == 249
+    assert paged_model.value(5, 0) == 5
+    assert len(paged_model._pages) == 2
+
+def test_edit_and_flush(paged_model, csv_path):
+    """Vérifie que les modifications passent par le calque puis sont réécrites."""
+    index = paged_model.index(3, 1)
+    assert paged_model.setData(index, "Modifié", Qt.EditRole)
+    assert paged_model.data(index, Qt.DisplayRole) == "Modifié"
+    assert paged_model.is_dirty()
+
+    paged_model.flush()
+    assert not paged_model.is_dirty()
+    assert pd.read_csv(csv_path)['Nom'].iloc[3] == "Modifié"
+
+def test_view_with_paged_model(qtbot, paged_model):
+    """Vérifie que la vue et les délégués fonctionnent avec le modèle paginé."""
+    widget = DataFrameView(model=paged_model)
+    qtbot.addWidget(widget)
+    assert widget.table_view.itemDelegateForColumn(2) is not None
+
+def test_copy_and_paste_block(paged_model):
+    """Vérifie la lecture d'un bloc à cheval sur deux pages et le collage dans le calque."""
+    assert paged_model.setData(paged_model.index(99, 1), "Modifié", Qt.EditRole)
+    block = paged_model.get_block(98, 0, 101, 1)
+    assert block['Id'].tolist() == [98, 99, 100, 101]
+    assert block['Nom'].tolist() == ['Nom98', 'Modifié', 'Nom100', 'Nom101']
+
+    assert paged_model.set_block(248, 0, [["7", "A"], ["8", "B"], ["9", "C"]])
+    assert [paged_model.value(248, 0), paged_model.value(249, 1)] == [7, "B"]
+    with pytest.raises(InvalidValuesError):
+        paged_model.set_block(0, 0, [["x"]])
+    assert paged_model.value(0, 0) == 0
+
+def test_view_hides_row_removal(qtbot, paged_model, tmp_path):
+    """Vérifie que la vue masque l'ajout, la suppression, l'export et le flux, non gérés par le modèle paginé."""
+    widget = DataFrameView(model=paged_model)
+    qtbot.addWidget(widget)
+    assert widget.add_button.isHidden()
+    assert widget.delete_button.isHidden()
+    widget.add_row()
+    widget.delete_row()
+    assert paged_model.rowCount() == 100
+    assert widget.export(str(tmp_path / 'out.csv')) is None
+    widget.start_streaming()
+
+def test_text_columns_keep_their_type(tmp_path):
+    """Vérifie qu'une colonne de texte reste du texte sur les pages suivantes, même si elle y paraît numérique."""
+    path = str(tmp_path / 'codes.csv')
+    pd.DataFrame({'Code': ['A1'] + ['%03d' % i for i in range(1, 150)]}).to_csv(path, index=False)
+    source = CsvSource(path, page_size=100)
+    assert source.read_page(1)['Code'].tolist()[:2] == ['100', '101']
+    assert source.read_page(1)['Code'].dtype == source.dtypes['Code']
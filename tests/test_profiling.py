@@ -0,0 +1,47 @@
+import pytest
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.profiling import CallStats, Profiler
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Nom': ['Alice', 'Bob', 'Charlie'],
+        'Âge': [25, 30, 35],
+    })
+
+def test_profiler_counts_calls_by_role(sample_df, qtbot):
+    """Vérifie le décompte des appels par méthode et par rôle."""
+    model = DataFrameModel(sample_df)
+    profiler = Profiler(model)
+    profiler.start()
+    model.data(model.index(0, 0))
+    model.data(model.index(1, 0), Qt.EditRole)
+    model.data(model.index(1, 1), role=Qt.ToolTipRole)
+    model.setData(model.index(0, 1), "40", Qt.EditRole)
+    summary = profiler.stats.summary()['methods']
+    assert summary['data']['calls'] == 3
+    assert summary['data']['roles'] == {'DisplayRole': 1, 'EditRole': 1, 'ToolTipRole': 1}
+    assert summary['setData']['calls'] == 1
+
+def test_profiler_stop_restores_methods(sample_df, qtbot):
+    """Vérifie qu'après `stop` plus aucun appel n'est mesuré."""
+    model = DataFrameModel(sample_df)
+    profiler = Profiler(model)
+    profiler.start()
+    profiler.stop()
+    model.data(model.index(0, 0))
+    assert 'data' not in model.__dict__
+    assert profiler.stats.counts['data'] == 0
+
+def test_cells_per_repaint():
+    """Vérifie le nombre de cellules lues entre deux rafraîchissements."""
+    stats = CallStats()
+    stats.repaint_started()
+    for _ in range(12):
+        stats.record('data', Qt.DisplayRole, 0.0)
+    stats.record('data', Qt.EditRole, 0.0)
+    stats.repaint_started()
+    assert list(stats.repaint_cells) == [12]
@@ -0,0 +1,73 @@
+import pytest
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.dataframe_view import DataFrameModel
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Nom': ['Alice', 'Bob', 'Charlie', 'Alicia', 'David'],
+        'Ville': ['Paris', 'Lyon', 'Alice Springs', 'Nice', 'Lille'],
+        'Âge': [25, 30, 35, 30, 45],
+    })
+
+@pytest.fixture
+def search_model(sample_df, qtbot):
+    model = DataFrameModel(sample_df)
+    return model, model.search()
+
+def test_find_text_and_navigate(search_model):
+    """Teste la recherche de texte et la navigation dans l'ordre de la vue."""
+    model, search = search_model
+    assert search.find("ali")
+    assert search.matches() == [(0, 0), (2, 1), (3, 0)]
+    assert search.next_match(2, 1) == (3, 0)
+    assert search.next_match(3, 0) == (0, 0)
+    assert search.previous_match(0, 0) == (3, 0)
+    assert model.data(model.index(2, 1), Qt.BackgroundRole) == search.highlight
+    assert model.data(model.index(1, 1), Qt.BackgroundRole) is None
+
+def test_find_narrows_previous_matches(search_model):
+    """Teste qu'une saisie prolongée ne réexamine que les cellules déjà trouvées."""
+    model, search = search_model
+    search.find("li")
+    model._dataframe.iat[1, 0] = "Alice"  # Modification hors du modèle : ignorée par le rétrécissement
+    search.find("lic")
+    assert search.matches() == [(0, 0), (2, 1), (3, 0)]
+
+def test_find_number_and_regex(search_model):
+    """Teste les modes numérique et expression régulière."""
+    model, search = search_model
+    search.find("30", mode='number')
+    assert search.matches() == [(1, 2), (3, 2)]
+    search.find("^l", mode='regex')
+    assert search.matches() == [(1, 1), (4, 1)]
+    search.find("(", mode='regex')
+    assert search.matches() == []
+
+def test_matches_follow_edits_inserts_and_removals(search_model):
+    """Teste la mise à jour des résultats lors des modifications de la table."""
+    model, search = search_model
+    search.find("ali")
+    model.setData(model.index(1, 0), "Alistair", Qt.EditRole)
+    assert (1, 0) in search.matches()
+    model.insertRows(0, 1)
+    assert search.matches() == [(1, 0), (2, 0), (3, 1), (4, 0)]
+    model.remove_rows([1])
+    assert search.matches() == [(1, 0), (2, 1), (3, 0)]
+    model.append_rows(pd.DataFrame({'Nom': ['Malik'], 'Ville': ['Caen'], 'Âge': [20]}))
+    assert search.matches()[-1] == (5, 0)
+
+def test_chunked_scan_can_be_cancelled(sample_df, qtbot):
+    """Teste l'examen par tranches et son interruption."""
+    model = DataFrameModel(sample_df)
+    search = model.search()
+    search.chunk_rows = 2
+    assert not search.find("a")
+    assert search.is_scanning()
+    search.cancel()
+    assert not search.is_scanning()
+    search.find("a")
+    search.wait()
+    assert search.count() == 6
@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+import pandas as pd
+from PyQt4.QtCore import Qt
+from minui4.widgets.dataframe_view import DataFrameModel
+from minui4.widgets.summary import SummaryModel
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Nom': ['Alice', 'Bob', None, 'David'],
+        'Score': [10.0, 40.0, np.nan, 30.0],
+    })
+
+@pytest.fixture
+def summary(sample_df, qtbot):
+    model = DataFrameModel(sample_df)
+    return model, SummaryModel(model)
+
+def aggregates(summary_model, col):
+    return {name: summary_model.value(name, col) for name in summary_model.aggregates}
+
+def test_initial_aggregates(summary):
+    """Teste les agrégats calculés sur la table entière."""
+    model, summary_model = summary
+    assert aggregates(summary_model, 1) == {'sum': 80.0, 'mean': 80.0 / 3, 'min': 10.0, 'max': 40.0,
+                                            'count': 3, 'nulls': 1}
+    assert aggregates(summary_model, 0)['sum'] is None
+    assert summary_model.data(summary_model.index(4, 0), Qt.DisplayRole) == "3"
+
+def test_aggregates_follow_edits(summary):
+    """Teste la mise à jour par deltas lors des modifications de cellules."""
+    model, summary_model = summary
+    summary_model.value('sum', 1)
+    model.setData(model.index(2, 1), "5", Qt.EditRole)
+    assert aggregates(summary_model, 1) == {'sum': 85.0, 'mean': 85.0 / 4, 'min': 5.0, 'max': 40.0,
+                                            'count': 4, 'nulls': 0}
+    model.setData(model.index(1, 1), "20", Qt.EditRole)  # L'ancien maximum disparaît
+    assert summary_model.value('max', 1) == 30.0
+    assert summary_model.value('sum', 1) == 65.0
+
+def test_aggregates_follow_inserts_and_removals(summary):
+    """Teste la prise en compte des blocs de lignes insérés, ajoutés et supprimés."""
+    model, summary_model = summary
+    summary_model.value('sum', 1)
+    model.insertRows(1, 2)
+    assert summary_model.value('nulls', 1) == 3
+    model.remove_rows([0, 1])
+    assert aggregates(summary_model, 1) == {'sum': 70.0, 'mean': 35.0, 'min': 30.0, 'max': 40.0,
+                                            'count': 2, 'nulls': 2}
+    model.append_rows(pd.DataFrame({'Nom': ['Eve'], 'Score': [100.0]}))
+    assert summary_model.value('max', 1) == 100.0
+    assert summary_model.value('count', 1) == 3
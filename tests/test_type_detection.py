@@ -0,0 +1,36 @@
+import pytest
+import pandas as pd
+from minui4.widgets.type_detection import ColumnTypeDetector
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'DateX': ['2025-02-25', '2025-03-01'],
+        'TimeX': ['12:30:45', '08:15:00'],
+        'DateTimeX': ['2025-02-25 12:30:45', '2025-03-01 08:15:00'],
+        'DateTimeY': [pd.Timestamp('2025-02-25 12:30:45'), pd.Timestamp('2025-03-01 08:15:00')],
+        'Nom': ['Alice', 'Bob'],
+        'Âge': [25, 30]
+    })
+
+def test_detect_all(sample_df):
+    """Vérifie la classification des colonnes en une passe."""
+    detector = ColumnTypeDetector()
+    assert detector.detect_all(sample_df) == {0: 'date', 1: 'time', 2: 'datetime', 3: 'datetime'}
+    assert detector.detect_all(sample_df.assign(Taille=[1.62, 1.80]))[6] == 'float'
+
+def test_detection_is_cached(sample_df):
+    """Vérifie que le résultat est mis en cache par colonne."""
+    detector = ColumnTypeDetector()
+    assert detector.detect(sample_df, 'DateX') == 'date'
+    sample_df['DateX'] = ['x', 'y']
+    assert detector.detect(sample_df, 'DateX') == 'date'
+    detector.invalidate('DateX')
+    assert detector.detect(sample_df, 'DateX') is None
+
+def test_sample_then_full_scan():
+    """Vérifie que le balayage complet n'a lieu que sur demande."""
+    dataframe = pd.DataFrame({'DateX': ['2025-02-25'] * 5000 + ['invalide']})
+    assert ColumnTypeDetector(sample_size=100).detect(dataframe, 'DateX') == 'date'
+    assert ColumnTypeDetector(sample_size=100, full_scan=True).detect(dataframe, 'DateX') is None
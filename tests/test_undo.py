@@ -0,0 +1,88 @@
+import pytest
+import pandas as pd
+from PyQt4.QtCore import Qt
+from PyQt4.QtGui import QUndoStack
+from minui4.widgets.dataframe_view import DataFrameModel
+
+
+@pytest.fixture
+def sample_df():
+    return pd.DataFrame({
+        'Id': list(range(6)),
+        'Nom': ['a', 'b', 'c', 'd', 'e', 'f']
+    })
+
+@pytest.fixture
+def undo_model(sample_df, qtbot):
+    """Crée un modèle relié à une pile d'annulation."""
+    model = DataFrameModel(sample_df)
+    stack = QUndoStack(model)
+    model.set_undo_stack(stack)
+    return model, stack
+
+def test_undo_redo_cell_edit(undo_model):
+    """Teste l'annulation et le rétablissement d'une modification de cellule."""
+    model, stack = undo_model
+    model.setData(model.index(1, 1), "Z", Qt.EditRole)
+    stack.undo()
+    assert model._dataframe['Nom'].iloc[1] == 'b'
+    stack.redo()
+    assert model._dataframe['Nom'].iloc[1] == 'Z'
+
+def test_paste_is_one_command(undo_model):
+    """Teste qu'un collage (avec agrandissement de la table) forme une seule commande."""
+    model, stack = undo_model
+    model.set_block(4, 0, [['40', 'x'], ['50', 'y'], ['60', 'w']])
+    assert stack.count() == 1
+    stack.undo()
+    assert model._dataframe.values.tolist() == [[0, 'a'], [1, 'b'], [2, 'c'], [3, 'd'], [4, 'e'], [5, 'f']]
+
+def test_undo_scattered_removal(undo_model, sample_df):
+    """Teste la réinsertion des lignes supprimées à leurs positions d'origine."""
+    model, stack = undo_model
+    expected = sample_df.values.tolist()
+    model.remove_rows([0, 2, 3])
+    assert list(model._dataframe['Id']) == [1, 4, 5]
+    stack.undo()
+    assert model._dataframe.values.tolist() == expected
+    stack.redo()
+    assert list(model._dataframe['Id']) == [1, 4, 5]
+
+def test_history_memory_cap(undo_model):
+    """Teste l'abandon des commandes les plus anciennes au-delà du budget mémoire."""
+    model, stack = undo_model
+    model.undo_history().max_bytes = 1
+    for row in range(3):
+        model.setData(model.index(row, 1), "Z", Qt.EditRole)
+    assert stack.count() == 1
+    stack.undo()
+    assert list(model._dataframe['Nom'].iloc[:3]) == ['Z', 'Z', 'c']
+
+def test_removal_size_counts_text(undo_model):
+    """Teste que la taille d'une suppression compte le texte des lignes supprimées, pas seulement les pointeurs."""
+    model, stack = undo_model
+    model.setData(model.index(0, 1), "x" * 10000, Qt.EditRole)
+    history = model.undo_history()
+    before = history.nbytes()
+    model.removeRows(0, 1)
+    assert history.nbytes() - before > 10000
+
+def test_undo_insert_after_sort(undo_model, sample_df):
+    """Teste que l'annulation d'une insertion retire la ligne insérée même après un tri."""
+    model, stack = undo_model
+    model.insertRows(0, 1)
+    model.sort(0, Qt.DescendingOrder)
+    stack.undo()
+    assert model._dataframe.values.tolist() == sample_df.values.tolist()
+    stack.redo()
+    assert model.rowCount() == 7
+
+def test_undo_removal_after_filter(undo_model, sample_df):
+    """Teste l'annulation et le rétablissement d'une suppression après un filtre."""
+    model, stack = undo_model
+    model.removeRows(1, 2)
+    model.set_filter("e")
+    stack.undo()
+    assert model._dataframe['Nom'].tolist() == ['a', 'b', 'c', 'd', 'e', 'f']
+    stack.redo()
+    assert model._dataframe['Nom'].tolist() == ['a', 'd', 'e', 'f']